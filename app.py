@@ -3,11 +3,15 @@ from ui.home import render_home
 from ui.module_a import render_module_a
 from ui.module_b import render_module_b
 from ui.module_c import render_module_c
+from ui.module_d import render_module_d
 from ui.module_chat import render_module_chat
 import json
 import os
 from datetime import datetime
 from src.exporters import export_to_pdf
+from src.profiling import start_profiler, stop_profiler
+from ui.debug_panel import is_debug_enabled, render_debug_panel
+from ui.session import get_session_store
 
 # ==== Configuración inicial de la página ====
 st.set_page_config(
@@ -54,9 +58,14 @@ except FileNotFoundError:
 st.sidebar.title("📚 Navegación")
 menu = st.sidebar.radio(
     "Selecciona un módulo:",
-    ["🏠 Inicio", "📈 Módulo A", "💰 Módulo B", "📊 Módulo C", "🤖 Chatbot IA"]
+    ["🏠 Inicio", "📈 Módulo A", "💰 Módulo B", "📊 Módulo C", "🏢 Módulo D", "🤖 Chatbot IA"]
 )
 
+# ==== Instrumentación opcional (?debug=1) ====
+debug_enabled = is_debug_enabled()
+if debug_enabled:
+    start_profiler(label=menu, track_memory=True)
+
 # ==== Mostrar módulo seleccionado ====
 if menu == "🏠 Inicio":
     render_home()
@@ -66,6 +75,8 @@ elif menu == "💰 Módulo B":
     render_module_b(help_texts)
 elif menu == "📊 Módulo C":
     render_module_c(help_texts)
+elif menu == "🏢 Módulo D":
+    render_module_d(help_texts)
 elif menu == "🤖 Chatbot IA":
     render_module_chat()
 
@@ -74,10 +85,11 @@ st.sidebar.markdown("---")
 st.sidebar.markdown("### 📄 Exportar Resultados")
 
 # Verificar si hay resultados en sesión
+store = get_session_store()
 has_results = any([
-    'module_a_result' in st.session_state,
-    'module_b_result' in st.session_state,
-    'module_c_result' in st.session_state
+    'module_a_result' in store,
+    'module_b_result' in store,
+    'module_c_result' in store
 ])
 
 if has_results:
@@ -85,12 +97,9 @@ if has_results:
         try:
             results = {}
 
-            if 'module_a_result' in st.session_state:
-                results['module_a_result'] = st.session_state['module_a_result']
-            if 'module_b_result' in st.session_state:
-                results['module_b_result'] = st.session_state['module_b_result']
-            if 'module_c_result' in st.session_state:
-                results['module_c_result'] = st.session_state['module_c_result']
+            for key in ('module_a_result', 'module_b_result', 'module_c_result'):
+                if key in store:
+                    results[key] = store[key]
 
             # Nombre del archivo
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -122,3 +131,7 @@ st.sidebar.markdown("""
         <p>© 2025 Proyecto Académico</p>
     </div>
 """, unsafe_allow_html=True)
+
+# ==== Panel de diagnóstico ====
+if debug_enabled:
+    render_debug_panel(stop_profiler())
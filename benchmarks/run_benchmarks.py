@@ -0,0 +1,277 @@
+"""
+Suite de benchmarks del motor financiero con control de regresiones.
+
+Mide el rendimiento (operaciones/segundo) y el pico de memoria de las
+funciones principales del motor en tamaños pequeño, mediano y extremo,
+guarda cada ejecución en un historial JSON y termina con código 1 si algún
+caso empeora más allá del umbral configurado respecto a la referencia.
+
+Uso:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --only bond --threshold 0.15
+    python -m benchmarks.run_benchmarks --no-record --history /tmp/hist.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from src.finance_engine import (
+    calculate_portfolio_growth,
+    simulate_portfolio_growth,
+    calculate_monthly_pension,
+    bond_present_value
+)
+from src.tax_engine import apply_tax
+from src.exporters import export_to_pdf
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(__file__), "history.json")
+SIZES = ("small", "medium", "extreme")
+# Aumento absoluto mínimo de memoria (bytes) que la CLI exige para reportar regresión
+MIN_MEMORY_DELTA = 64 * 1024
+
+
+# 🔹 Casos de benchmark: cada uno devuelve una función sin argumentos
+
+def _portfolio_case(size):
+    years, freq = {"small": (1, "Anual"), "medium": (30, "Mensual"), "extreme": (500, "Mensual")}[size]
+    return lambda: calculate_portfolio_growth(1000.0, 100.0, freq, years, 7.5)
+
+
+def _pension_case(size):
+    # Función escalar: el tamaño es el número de llamadas por operación
+    calls = {"small": 1, "medium": 1_000, "extreme": 100_000}[size]
+
+    def run():
+        for i in range(calls):
+            calculate_monthly_pension(100_000.0 + i, 25, 4.0)
+    return run
+
+
+def _bond_case(size):
+    freq, years = {"small": ("Anual", 1), "medium": ("Semestral", 30), "extreme": ("Mensual", 100)}[size]
+    return lambda: bond_present_value(1000.0, 5.0, freq, years, 6.0)
+
+
+def _tax_case(size):
+    calls = {"small": 1, "medium": 1_000, "extreme": 100_000}[size]
+
+    def run():
+        for i in range(calls):
+            apply_tax(1500.0 + i, 1000.0, 'Fuente extranjera (29.5%)')
+    return run
+
+
+def _pdf_case(size):
+    years = {"small": 1, "medium": 30, "extreme": 50}[size]
+    freq = "Anual" if size == "small" else "Mensual"
+    growth = simulate_portfolio_growth(1000.0, 100.0, freq, years, 7.5)
+    final = growth.final_balance
+    df_c, pv, summary = bond_present_value(1000.0, 5.0, freq, years, 6.0)
+    results = {
+        'module_a_result': {
+            'result': growth, 'final_balance': final, 'initial_amount': 1000.0,
+            'years': years, 'tea': 7.5
+        },
+        'module_c_result': {
+            'df_flows': df_c, 'pv_total': pv, 'summary': summary, 'face_value': 1000.0,
+            'coupon_rate': 5.0, 'years': years, 'yield': 6.0
+        }
+    }
+    if size != "small":
+        results['module_b_result'] = {
+            'tipo': 'pension_mensual', 'bruto_mensual': 500.0, 'neto_mensual': 450.0,
+            'impuesto': 100.0, 'capital_bruto': final, 'capital_neto': final - 100.0
+        }
+    directory = tempfile.mkdtemp(prefix="bench_pdf_")
+    path = os.path.join(directory, "reporte.pdf")
+    return lambda: export_to_pdf(results, path)
+
+
+CASES = {
+    "calculate_portfolio_growth": _portfolio_case,
+    "calculate_monthly_pension": _pension_case,
+    "bond_present_value": _bond_case,
+    "apply_tax": _tax_case,
+    "export_to_pdf": _pdf_case,
+}
+
+
+# 🔹 Medición
+
+def measure(func, min_time=0.2, max_repeats=50):
+    """
+    Mide una operación: tiempos por repetición y pico de memoria (tracemalloc).
+
+    El pico de memoria se mide en una pasada aparte para que tracemalloc no
+    distorsione los tiempos.
+    """
+    func()  # calentamiento (imports perezosos, cachés)
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_repeats and (len(timings) < 3 or time.perf_counter() - started < min_time):
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {
+        "repeats": len(timings),
+        "median_s": median,
+        "min_s": min(timings),
+        "ops_per_s": 1.0 / median if median > 0 else float("inf"),
+        "peak_bytes": peak
+    }
+
+
+def run_suite(only=None, sizes=SIZES, min_time=0.2):
+    """Ejecuta los casos seleccionados y devuelve {'func/size': métricas}."""
+    results = {}
+    for name, factory in CASES.items():
+        if only and not any(o in name for o in only):
+            continue
+        for size in sizes:
+            key = f"{name}/{size}"
+            results[key] = measure(factory(size), min_time=min_time)
+            r = results[key]
+            print(f"{key:45s} {r['ops_per_s']:>12.1f} ops/s  {r['peak_bytes'] / 1024:>10.1f} KiB")
+    return results
+
+
+# 🔹 Historial y control de regresiones
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_history(path, history):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+
+
+def baseline_from_history(history, window=5):
+    """Referencia por caso: mediana de las últimas `window` ejecuciones."""
+    baseline = {}
+    for run in history[-window:]:
+        for key, metrics in run["results"].items():
+            baseline.setdefault(key, []).append(metrics)
+    return {
+        key: {
+            "ops_per_s": statistics.median(m["ops_per_s"] for m in runs),
+            "peak_bytes": statistics.median(m["peak_bytes"] for m in runs)
+        }
+        for key, runs in baseline.items()
+    }
+
+
+def find_regressions(results, baseline, threshold=0.2, memory_threshold=0.2, min_memory_delta=0):
+    """
+    Compara resultados con la referencia.
+
+    Args:
+        results: Métricas actuales {'func/size': {...}}
+        baseline: Referencia {'func/size': {'ops_per_s', 'peak_bytes'}}
+        threshold: Caída relativa de ops/s tolerada (0.2 = 20%)
+        memory_threshold: Aumento relativo del pico de memoria tolerado
+        min_memory_delta: Aumento absoluto (bytes) que además debe superarse
+            para reportar memoria; filtra el ruido de asignación en casos chicos
+
+    Returns:
+        Lista de mensajes, uno por regresión detectada
+    """
+    regressions = []
+    for key, current in results.items():
+        ref = baseline.get(key)
+        if ref is None:
+            continue
+        if current["ops_per_s"] < ref["ops_per_s"] * (1 - threshold):
+            drop = 1 - current["ops_per_s"] / ref["ops_per_s"]
+            regressions.append(
+                f"{key}: rendimiento {current['ops_per_s']:.1f} ops/s "
+                f"({drop:.0%} menos que {ref['ops_per_s']:.1f})"
+            )
+        # Se ignoran picos diminutos, donde el ruido relativo domina
+        limit = max(ref["peak_bytes"] * (1 + memory_threshold), ref["peak_bytes"] + min_memory_delta)
+        if ref["peak_bytes"] > 4096 and current["peak_bytes"] > limit:
+            growth = current["peak_bytes"] / ref["peak_bytes"] - 1
+            regressions.append(
+                f"{key}: pico de memoria {current['peak_bytes'] / 1024:.1f} KiB "
+                f"({growth:.0%} más que {ref['peak_bytes'] / 1024:.1f} KiB)"
+            )
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del motor financiero")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="Archivo JSON de historial")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Caída de ops/s tolerada (fracción, por defecto 0.2)")
+    parser.add_argument("--memory-threshold", type=float, default=0.2,
+                        help="Aumento de pico de memoria tolerado (fracción, por defecto 0.2)")
+    parser.add_argument("--min-memory-delta", type=int, default=MIN_MEMORY_DELTA,
+                        help="Aumento absoluto de memoria (bytes) mínimo para reportarlo")
+    parser.add_argument("--window", type=int, default=5,
+                        help="Ejecuciones previas usadas como referencia")
+    parser.add_argument("--only", nargs="*", help="Filtra casos por nombre de función")
+    parser.add_argument("--sizes", nargs="*", default=list(SIZES), choices=SIZES)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Segundos mínimos de medición por caso")
+    parser.add_argument("--no-record", action="store_true", help="No guardar en el historial")
+    args = parser.parse_args(argv)
+
+    history = load_history(args.history)
+    results = run_suite(only=args.only, sizes=args.sizes, min_time=args.min_time)
+    regressions = find_regressions(
+        results, baseline_from_history(history, args.window),
+        threshold=args.threshold, memory_threshold=args.memory_threshold,
+        min_memory_delta=args.min_memory_delta
+    )
+
+    if not args.no_record:
+        history.append({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "regressions": regressions,
+            "results": results
+        })
+        save_history(args.history, history)
+
+    if regressions:
+        print("\n❌ Regresiones detectadas:")
+        for r in regressions:
+            print(f"  - {r}")
+        return 1
+    print("\n✅ Sin regresiones respecto a la referencia.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Micro-batching asíncrono: agrupa solicitudes concurrentes en lotes.
+
+Cada solicitud espera como máximo `max_wait` segundos a que lleguen otras;
+el lote resultante se resuelve con una sola llamada vectorizada ejecutada en
+el pool de workers, sin bloquear el bucle de eventos.
+"""
+
+import asyncio
+
+
+class MicroBatcher:
+    """
+    Cola de solicitudes de una operación con despacho por lotes.
+
+    Args:
+        func: Función lista_de_items -> lista_de_resultados (misma longitud)
+        executor: Pool (procesos o hilos) donde se ejecuta `func`
+        max_batch: Tamaño máximo de lote
+        max_wait: Segundos máximos que espera el primer item del lote
+        max_inflight: Lotes ejecutándose a la vez en el pool
+    """
+
+    def __init__(self, func, executor, max_batch=512, max_wait=0.005, max_inflight=4):
+        self.func = func
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_inflight = max_inflight
+        self.batches = 0
+        self.items = 0
+        self._queue = None
+        self._inflight = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._inflight = asyncio.Semaphore(self.max_inflight)
+        self._task = asyncio.get_running_loop().create_task(self._collect())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, item):
+        """Encola un item y espera su resultado."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                # Primero se vacía lo que ya está en cola, sin esperar
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._inflight.acquire()
+            loop.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            items = [item for item, _ in batch]
+            results = await loop.run_in_executor(self.executor, self.func, items)
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._inflight.release()
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0
+        }
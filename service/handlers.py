@@ -0,0 +1,171 @@
+"""
+Operaciones del servicio HTTP: validación por solicitud y ejecución por lotes.
+
+Las funciones `run_*` reciben una lista de solicitudes ya validadas y las
+resuelven con una sola llamada vectorizada al motor; son funciones de nivel
+de módulo para que puedan enviarse a un pool de procesos.
+"""
+
+import numpy as np
+
+from src.finance_engine import (
+    CONTRIBUTION_FREQUENCIES,
+    PAYMENT_FREQUENCIES,
+    portfolio_final_balance_batch,
+    monthly_pension_batch,
+    bond_price_batch
+)
+from src.tax_engine import apply_tax_batch, TAX_RATES
+from src.utils import validate_module_a, validate_module_b, validate_module_c
+
+
+def _number(item, key, errors, default=None):
+    value = item.get(key, default)
+    if value is None:
+        errors.append(f"Falta el campo '{key}'.")
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        errors.append(f"El campo '{key}' debe ser numérico.")
+        return None
+    return float(value)
+
+
+def _flag(item, key, errors, default=True):
+    """Booleano; acepta también los textos 'true'/'false', '1'/'0', 'si'/'no'."""
+    value = item.get(key, default)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ("true", "1", "si", "sí", "yes", "t"):
+            return True
+        if text in ("false", "0", "no", "f"):
+            return False
+    errors.append(f"El campo '{key}' debe ser booleano.")
+    return None
+
+
+def parse_portfolio(item):
+    """Valida una solicitud del Módulo A; devuelve (params, errores)."""
+    errors = []
+    params = {
+        "initial_amount": _number(item, "initial_amount", errors),
+        "periodic_contribution": _number(item, "periodic_contribution", errors, 0.0),
+        "years": _number(item, "years", errors),
+        "tea": _number(item, "tea", errors),
+    }
+    freq = item.get("contribution_freq", "Mensual")
+    if freq not in CONTRIBUTION_FREQUENCIES:
+        errors.append(f"Frecuencia no válida. Opciones: {list(CONTRIBUTION_FREQUENCIES)}")
+    if errors:
+        return None, errors
+    errors = validate_module_a(**params)
+    params["periods_per_year"] = CONTRIBUTION_FREQUENCIES[freq]
+    return params, errors
+
+
+def parse_pension(item):
+    errors = []
+    params = {
+        "capital": _number(item, "capital", errors),
+        "retirement_years": _number(item, "retirement_years", errors),
+        "tea_retirement": _number(item, "tea_retirement", errors),
+    }
+    if errors:
+        return None, errors
+    errors = validate_module_b(
+        tea_retirement=params["tea_retirement"],
+        retirement_years=params["retirement_years"]
+    )
+    return params, errors
+
+
+def parse_bond(item):
+    errors = []
+    params = {
+        "face_value": _number(item, "face_value", errors),
+        "coupon_rate": _number(item, "coupon_rate", errors),
+        "years_to_maturity": _number(item, "years_to_maturity", errors),
+        "required_yield": _number(item, "required_yield", errors),
+        "use_tea": _flag(item, "use_tea", errors),
+    }
+    freq = item.get("payment_freq", "Semestral")
+    if freq not in PAYMENT_FREQUENCIES:
+        errors.append(f"Frecuencia no válida. Opciones: {list(PAYMENT_FREQUENCIES)}")
+    if errors:
+        return None, errors
+    errors = validate_module_c(**{k: v for k, v in params.items() if k != "use_tea"})
+    params["periods_per_year"] = PAYMENT_FREQUENCIES[freq]
+    if not errors and int(params["years_to_maturity"] * params["periods_per_year"]) == 0:
+        errors.append("El plazo debe generar al menos un periodo de pago")
+    return params, errors
+
+
+def parse_tax(item):
+    errors = []
+    params = {
+        "gross_amount": _number(item, "gross_amount", errors),
+        "initial_amount": _number(item, "initial_amount", errors),
+        "tax_type": item.get("tax_type", "Ninguno"),
+    }
+    if params["tax_type"] not in TAX_RATES and params["tax_type"] != "Ninguno":
+        errors.append(f"Tipo de impuesto no válido. Opciones: {['Ninguno', *TAX_RATES]}")
+    return (None if errors else params), errors
+
+
+def _column(items, key):
+    return np.array([item[key] for item in items])
+
+
+def run_portfolio(items):
+    balances = portfolio_final_balance_batch(
+        _column(items, "initial_amount"),
+        _column(items, "periodic_contribution"),
+        _column(items, "periods_per_year"),
+        _column(items, "years"),
+        _column(items, "tea")
+    )
+    return [{"final_balance": float(b)} for b in balances]
+
+
+def run_pension(items):
+    pensions = monthly_pension_batch(
+        _column(items, "capital"),
+        _column(items, "retirement_years"),
+        _column(items, "tea_retirement")
+    )
+    return [{"monthly_pension": float(p)} for p in pensions]
+
+
+def run_bond(items):
+    prices = bond_price_batch(
+        _column(items, "face_value"),
+        _column(items, "coupon_rate"),
+        _column(items, "periods_per_year"),
+        _column(items, "years_to_maturity"),
+        _column(items, "required_yield"),
+        _column(items, "use_tea")
+    )
+    face = _column(items, "face_value")
+    return [
+        {"pv_total": float(pv), "premium_discount": float(pv - f)}
+        for pv, f in zip(prices, face)
+    ]
+
+
+def run_tax(items):
+    tax, net = apply_tax_batch(
+        _column(items, "gross_amount"),
+        _column(items, "initial_amount"),
+        _column(items, "tax_type")
+    )
+    return [{"tax": float(t), "net_amount": float(n)} for t, n in zip(tax, net)]
+
+
+# Ruta -> (validación por solicitud, ejecución por lote)
+OPERATIONS = {
+    "/portfolio": (parse_portfolio, run_portfolio),
+    "/pension": (parse_pension, run_pension),
+    "/bond": (parse_bond, run_bond),
+    "/tax": (parse_tax, run_tax),
+}
@@ -0,0 +1,120 @@
+"""
+Generador de carga para el servicio HTTP de simulación.
+
+Abre `--concurrency` conexiones keep-alive y envía `--requests` solicitudes
+en total; reporta throughput y latencias p50/p90/p99.
+
+Uso:
+    python -m service.load_test --endpoint /portfolio --concurrency 64 --requests 5000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+SAMPLE_PAYLOADS = {
+    "/portfolio": lambda rng: {
+        "initial_amount": rng.uniform(0, 50_000), "periodic_contribution": rng.uniform(0, 1_000),
+        "contribution_freq": rng.choice(["Mensual", "Trimestral", "Semestral", "Anual"]),
+        "years": rng.randint(1, 50), "tea": round(rng.uniform(0.5, 20), 2)
+    },
+    "/pension": lambda rng: {
+        "capital": rng.uniform(10_000, 1_000_000), "retirement_years": rng.randint(1, 40),
+        "tea_retirement": round(rng.uniform(0.5, 10), 2)
+    },
+    "/bond": lambda rng: {
+        "face_value": 1000, "coupon_rate": round(rng.uniform(0, 12), 2),
+        "payment_freq": rng.choice(["Mensual", "Trimestral", "Semestral", "Anual"]),
+        "years_to_maturity": rng.randint(1, 30), "required_yield": round(rng.uniform(0.5, 12), 2)
+    },
+    "/tax": lambda rng: {
+        "gross_amount": rng.uniform(1_000, 100_000), "initial_amount": 1_000,
+        "tax_type": rng.choice(["Ninguno", "Bolsa local (5%)", "Fuente extranjera (29.5%)"])
+    },
+}
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def _client(host, port, endpoint, counter, latencies, errors, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter[0] > 0:
+            counter[0] -= 1
+            body = json.dumps(SAMPLE_PAYLOADS[endpoint](rng)).encode("utf-8")
+            request = (
+                f"POST {endpoint} HTTP/1.1\r\nHost: {host}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1") + body
+            t0 = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - t0)
+            if b" 200 " not in status_line:
+                errors.append(status_line.decode("latin-1").strip())
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, endpoint, concurrency, requests):
+    counter = [requests]
+    latencies, errors = [], []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, endpoint, counter, latencies, errors, seed)
+        for seed in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    return {
+        "endpoint": endpoint,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else float("nan")
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio de simulación")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--endpoint", default="/portfolio", choices=sorted(SAMPLE_PAYLOADS))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load(args.host, args.port, args.endpoint, args.concurrency, args.requests))
+    print(f"Endpoint:    {report['endpoint']}")
+    print(f"Solicitudes: {report['requests']} ({report['errors']} errores)")
+    print(f"Throughput:  {report['throughput_rps']:,.0f} req/s")
+    print(f"Latencia:    p50 {report['p50_ms']:.2f} ms · p90 {report['p90_ms']:.2f} ms · "
+          f"p99 {report['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
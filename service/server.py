@@ -0,0 +1,196 @@
+"""
+Servicio HTTP (JSON) del motor financiero, sin la interfaz Streamlit.
+
+Servidor asíncrono (asyncio, solo biblioteca estándar) con micro-batching de
+solicitudes concurrentes y un pool de procesos para el cálculo.
+
+Uso:
+    python -m service.server --port 8080 --workers 4
+
+Endpoints:
+    POST /portfolio  {"initial_amount", "periodic_contribution", "contribution_freq", "years", "tea"}
+    POST /pension    {"capital", "retirement_years", "tea_retirement"}
+    POST /bond       {"face_value", "coupon_rate", "payment_freq", "years_to_maturity", "required_yield", "use_tea"}
+    POST /tax        {"gross_amount", "initial_amount", "tax_type"}
+    GET  /health, GET /metrics
+
+Cada POST acepta un objeto (respuesta: objeto) o una lista de objetos
+(respuesta: lista en el mismo orden).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .batching import MicroBatcher
+from .handlers import OPERATIONS
+
+MAX_BODY_BYTES = 1024 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class SimulationService:
+    """
+    Servidor JSON-over-HTTP con un MicroBatcher por operación.
+
+    Args:
+        workers: Procesos (o hilos) del pool de cálculo
+        use_threads: Si True usa hilos en lugar de procesos
+        max_batch: Tamaño máximo de lote por operación
+        max_wait_ms: Espera máxima para completar un lote (milisegundos)
+    """
+
+    def __init__(self, workers=None, use_threads=False, max_batch=512, max_wait_ms=5.0):
+        workers = workers or os.cpu_count() or 1
+        self.executor = (ThreadPoolExecutor(max_workers=workers) if use_threads
+                         else ProcessPoolExecutor(max_workers=workers))
+        self.batchers = {
+            path: MicroBatcher(run, self.executor, max_batch=max_batch,
+                               max_wait=max_wait_ms / 1000, max_inflight=workers * 2)
+            for path, (_, run) in OPERATIONS.items()
+        }
+        self.requests = 0
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        for batcher in self.batchers.values():
+            batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for batcher in self.batchers.values():
+            await batcher.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # 🔹 Protocolo HTTP/1.1 mínimo con keep-alive
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Solicitud HTTP inválida."}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Cuerpo demasiado grande."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self._dispatch(method, target.split("?")[0], body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def _dispatch(self, method, path, body):
+        self.requests += 1
+        try:
+            if method == "GET" and path == "/health":
+                return 200, {"status": "ok"}
+            if method == "GET" and path == "/metrics":
+                return 200, self.metrics()
+            if path not in OPERATIONS:
+                raise HTTPError(404, f"Ruta no encontrada: {path}")
+            if method != "POST":
+                raise HTTPError(405, "Use POST para las operaciones de cálculo.")
+            try:
+                data = json.loads(body or b"null")
+            except ValueError:
+                raise HTTPError(400, "El cuerpo debe ser JSON válido.")
+            if isinstance(data, dict):
+                return 200, await self._compute(path, data)
+            if isinstance(data, list) and all(isinstance(d, dict) for d in data):
+                return 200, list(await asyncio.gather(*(self._compute(path, d) for d in data)))
+            raise HTTPError(400, "El cuerpo debe ser un objeto JSON o una lista de objetos.")
+        except HTTPError as e:
+            return e.status, {"error": e.message}
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+    async def _compute(self, path, item):
+        parse, _ = OPERATIONS[path]
+        params, errors = parse(item)
+        if errors:
+            raise HTTPError(422, "; ".join(errors))
+        return await self.batchers[path].submit(params)
+
+    def metrics(self):
+        return {
+            "requests": self.requests,
+            "operations": {path: b.stats() for path, b in self.batchers.items()}
+        }
+
+
+async def serve(host, port, **kwargs):
+    service = SimulationService(**kwargs)
+    server = await service.start(host, port)
+    print(f"Servicio de simulación escuchando en http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP del motor financiero")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="Workers del pool de cálculo")
+    parser.add_argument("--threads", action="store_true", help="Usar hilos en lugar de procesos")
+    parser.add_argument("--max-batch", type=int, default=512)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(
+            args.host, args.port, workers=args.workers, use_threads=args.threads,
+            max_batch=args.max_batch, max_wait_ms=args.max_wait_ms
+        ))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Backtest del plan de aportes del Módulo A sobre retornos históricos mensuales.
+
+El histórico se guarda como array binario (.npy o binario crudo) y se abre con
+memory-map, sin cargarlo entero en memoria. Todas las ventanas móviles (una por
+fecha de inicio posible) se evalúan a la vez con log-retornos acumulados:
+
+    L[t] = sum_{k<=t} log(1 + r_k)
+    B(s) = exp(L[s+n]) * (B_0 exp(-L[s]) + c * (S[s+n] - S[s]))
+
+donde S es la suma prefija de exp(-L[k]) sobre los periodos con aporte. Los
+inicios se recorren por bloques con L re-anclado en cada bloque, lo que evita
+desbordes de exp(±L) en históricos largos y acota la memoria. Los
+indicadores que recorren cada ventana usan vistas con stride
+(sliding_window_view), sin copiar el histórico por ventana.
+
+Uso:
+    python -m src.backtest retornos.npy --initial 1000 --contribution 100 --years 20
+"""
+
+import argparse
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .finance_engine import CONTRIBUTION_FREQUENCIES
+from .profiling import timed
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def save_return_history(path, returns):
+    """Guarda retornos mensuales (decimal) como .npy para abrirlos con memory-map."""
+    np.save(path, np.ascontiguousarray(returns, dtype=np.float64))
+
+
+def load_return_history(path, dtype=np.float64):
+    """
+    Abre el histórico en modo memory-map de solo lectura.
+
+    Args:
+        path: Archivo .npy (con cabecera) o binario crudo de `dtype`
+        dtype: Tipo de los valores si el archivo es binario crudo
+    """
+    if str(path).endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+def _contribution_prefix(discount, step, offset=0):
+    """
+    Sumas prefijas de exp(-L[k]) por clase de residuo k mod step.
+
+    Una ventana que empieza en s recibe aportes en s+step, s+2·step, ...,
+    es decir en los k con k ≡ s (mod step). `offset` es la posición del
+    primer elemento de `discount` dentro del histórico.
+
+    Returns:
+        Array (step, N + 1)
+    """
+    n = discount.size
+    prefix = np.zeros((step, n + 1))
+    residues = np.arange(offset + 1, offset + n + 1) % step
+    for r in range(step):
+        np.cumsum(np.where(residues == r, discount, 0.0), out=prefix[r, 1:])
+    return prefix
+
+
+@timed("engine.backtest")
+def rolling_backtest(
+    returns,
+    initial_amount,
+    periodic_contribution,
+    years,
+    contribution_freq="Mensual",
+    periods_per_year=12,
+    block_size=None
+):
+    """
+    Evalúa el plan de aportes en todas las ventanas históricas posibles.
+
+    Args:
+        returns: Retornos periódicos históricos en decimal (array o memmap)
+        initial_amount: Monto inicial
+        periodic_contribution: Aporte en cada periodo de aporte
+        years: Plazo del plan en años
+        contribution_freq: Frecuencia de aportes ('Mensual', 'Trimestral', ...)
+        periods_per_year: Periodos por año del histórico (12 = mensual)
+        block_size: Inicios de ventana por bloque (por defecto max(window, 1024))
+
+    Returns:
+        Diccionario con:
+            start: índice de inicio de cada ventana
+            final_balance: saldo final por ventana
+            index_cagr: CAGR del activo (sin aportes) por ventana
+            worst_period: peor retorno periódico dentro de cada ventana
+            total_contributed: aportes totales del plan
+            percentiles: {p: saldo final} para PERCENTILES
+            shortfall_probability: fracción de ventanas que terminan por debajo
+                de lo aportado
+    """
+    m = CONTRIBUTION_FREQUENCIES[contribution_freq]
+    if periods_per_year % m != 0:
+        raise ValueError("La frecuencia de aportes debe dividir a la frecuencia del histórico.")
+    step = periods_per_year // m
+    window = int(round(years * periods_per_year))
+    n_history = returns.shape[0]
+    if window <= 0 or window > n_history:
+        raise ValueError(
+            f"El plazo ({window} periodos) debe estar entre 1 y el largo del histórico ({n_history})."
+        )
+
+    # Las ventanas se procesan por bloques de inicios; en cada bloque L se
+    # re-ancla en cero para que exp(±L) no se desborde en históricos largos
+    n_starts = n_history - window + 1
+    block = block_size or max(window, 1024)
+    final_balance = np.empty(n_starts)
+    index_cagr = np.empty(n_starts)
+    worst_period = np.empty(n_starts)
+    for first in range(0, n_starts, block):
+        last = min(first + block, n_starts)
+        segment = returns[first:last - 1 + window]
+        log_index = np.empty(segment.shape[0] + 1)
+        log_index[0] = 0.0
+        np.cumsum(np.log1p(segment), out=log_index[1:])
+        # Los residuos se cuentan desde el inicio del histórico
+        prefix = _contribution_prefix(np.exp(-log_index[1:]), step, offset=first)
+
+        starts = np.arange(last - first)
+        ends = starts + window
+        residue = (starts + first) % step
+        contributions = prefix[residue, ends] - prefix[residue, starts]
+        final_balance[first:last] = np.exp(log_index[ends]) * (
+            initial_amount * np.exp(-log_index[starts]) + periodic_contribution * contributions
+        )
+        index_cagr[first:last] = np.expm1((log_index[ends] - log_index[starts]) / years)
+        # Vista (ventanas, window) sobre el mismo buffer: no copia el histórico
+        worst_period[first:last] = sliding_window_view(segment, window).min(axis=1)
+
+    total_contributed = initial_amount + periodic_contribution * (window // step)
+    return {
+        "start": np.arange(n_starts),
+        "final_balance": final_balance,
+        "index_cagr": index_cagr,
+        "worst_period": worst_period,
+        "total_contributed": total_contributed,
+        "percentiles": dict(zip(PERCENTILES, np.percentile(final_balance, PERCENTILES))),
+        "shortfall_probability": float((final_balance < total_contributed).mean())
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest del plan de aportes sobre retornos históricos")
+    parser.add_argument("history", help="Retornos periódicos (.npy o binario float64)")
+    parser.add_argument("--initial", type=float, default=1000.0)
+    parser.add_argument("--contribution", type=float, default=100.0)
+    parser.add_argument("--years", type=float, default=20)
+    parser.add_argument("--freq", choices=list(CONTRIBUTION_FREQUENCIES), default="Mensual")
+    args = parser.parse_args(argv)
+
+    report = rolling_backtest(
+        load_return_history(args.history), args.initial, args.contribution, args.years, args.freq
+    )
+    balances = report["final_balance"]
+    print(f"Ventanas evaluadas: {balances.size:,}")
+    print(f"Aportes totales: ${report['total_contributed']:,.2f}")
+    for p, value in report["percentiles"].items():
+        print(f"  Percentil {p:>2}: ${value:,.2f}")
+    print(f"Peor ventana: inicio {int(report['start'][balances.argmin()])} · ${balances.min():,.2f}")
+    print(f"Probabilidad de terminar por debajo de lo aportado: {report['shortfall_probability']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
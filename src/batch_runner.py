@@ -0,0 +1,275 @@
+"""
+Ejecución masiva de escenarios de los Módulos A, B y C desde archivo.
+
+Lee el archivo de entrada (CSV o Parquet) por bloques, valida cada bloque con
+las validaciones vectorizadas, calcula con los kernels vectorizados del motor
+y escribe cada bloque al archivo de salida (Parquet o CSV) antes de leer el
+siguiente, de modo que la memoria no depende del tamaño del archivo.
+
+Uso:
+    python -m src.batch_runner escenarios.csv resultados.parquet --module a
+    python -m src.batch_runner bonos.parquet bonos_vp.parquet --module c --chunk-size 200000
+
+Columnas de entrada:
+    A: initial_amount, periodic_contribution, contribution_freq, years, tea
+    B: capital, initial_amount, retirement_years, tea_retirement, tax_type
+    C: face_value, coupon_rate, payment_freq, years_to_maturity, required_yield, use_tea
+       y opcionalmente bond_type ('Bullet', 'Amortizable', 'Flotante'), spread,
+       forward_rate (curva plana por fila) y amortizing_periods
+Cualquier otra columna (p. ej. un id de cliente) se copia a la salida. La
+columna `error_codes` guarda los bits de error de src.utils por fila.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from .finance_engine import (
+    CONTRIBUTION_FREQUENCIES,
+    PAYMENT_FREQUENCIES,
+    BOND_TYPES,
+    portfolio_final_balance_batch,
+    monthly_pension_batch,
+    bond_price_batch,
+    bond_book_value
+)
+from .tax_engine import apply_tax_batch
+from .utils import (
+    BOND_TYPE_INVALID,
+    CAPITAL_NEGATIVE,
+    FREQUENCY_INVALID,
+    NO_PAYMENT_PERIODS,
+    validate_module_a_batch,
+    validate_module_b_batch,
+    validate_module_c_batch
+)
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def _column(df, name, default=np.nan):
+    if name in df.columns:
+        return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float)
+    return np.full(len(df), default, dtype=float)
+
+
+def _flag(df, name):
+    """Columna booleana (True por defecto); acepta bool o textos 'false'/'0'/'no'."""
+    if name not in df.columns:
+        return np.ones(len(df), dtype=bool)
+    values = df[name]
+    if values.dtype == bool:
+        return values.to_numpy()
+    text = values.astype(str).str.strip().str.lower()
+    return ~text.isin(["false", "0", "0.0", "no", "f"]).to_numpy()
+
+
+def _frequency(df, name, mapping, default):
+    if name not in df.columns:
+        return np.full(len(df), float(mapping[default]))
+    return df[name].map(mapping).to_numpy(dtype=float)
+
+
+def run_module_a(df):
+    """Calcula un bloque del Módulo A; devuelve (columnas_resultado, BatchValidation)."""
+    initial = _column(df, "initial_amount")
+    contribution = _column(df, "periodic_contribution", 0.0)
+    years = _column(df, "years")
+    tea = _column(df, "tea")
+    m = _frequency(df, "contribution_freq", CONTRIBUTION_FREQUENCIES, "Mensual")
+
+    validation = validate_module_a_batch(initial, contribution, tea, years).add(FREQUENCY_INVALID, np.isnan(m))
+    valid = validation.valid
+    final_balance = np.where(
+        valid, portfolio_final_balance_batch(initial, contribution, np.where(valid, m, 1), years, tea), np.nan
+    )
+    total_contrib = np.where(valid, initial + contribution * np.floor(years * m), np.nan)
+    return {"final_balance": final_balance, "total_contrib": total_contrib}, validation
+
+
+def run_module_b(df):
+    capital = _column(df, "capital")
+    initial = _column(df, "initial_amount", 0.0)
+    years = _column(df, "retirement_years")
+    tea = _column(df, "tea_retirement")
+    tax_type = df["tax_type"].to_numpy() if "tax_type" in df.columns else "Ninguno"
+
+    validation = validate_module_b_batch(tea, years).add(CAPITAL_NEGATIVE, ~(capital >= 0))
+    valid = validation.valid
+    tax, net_capital = apply_tax_batch(capital, initial, tax_type)
+    gross = monthly_pension_batch(capital, years, tea)
+    net = monthly_pension_batch(net_capital, years, tea)
+    nan = np.nan
+    return {
+        "monthly_pension_gross": np.where(valid, gross, nan),
+        "tax": np.where(valid, tax, nan),
+        "net_capital": np.where(valid, net_capital, nan),
+        "monthly_pension_net": np.where(valid, net, nan)
+    }, validation
+
+
+def run_module_c(df):
+    face = _column(df, "face_value")
+    coupon = _column(df, "coupon_rate")
+    years = _column(df, "years_to_maturity")
+    yield_ = _column(df, "required_yield")
+    use_tea = _flag(df, "use_tea")
+    m = _frequency(df, "payment_freq", PAYMENT_FREQUENCIES, "Semestral")
+
+    validation = (
+        validate_module_c_batch(face, coupon, yield_, years)
+        .add(FREQUENCY_INVALID, np.isnan(m))
+        .add(NO_PAYMENT_PERIODS, ~(np.floor(years * np.nan_to_num(m)) > 0))
+    )
+    if "bond_type" not in df.columns:
+        valid = validation.valid
+        pv = bond_price_batch(face, coupon, np.where(valid, m, 1), years, yield_, use_tea)
+        pv = np.where(valid, pv, np.nan)
+        return {"pv_total": pv, "premium_discount": pv - face}, validation
+
+    # Cartera mixta: todos los tipos se valoran juntos sobre la matriz de flujos.
+    # Con curva plana por fila, la forward se suma al spread de los flotantes.
+    bond_type = df["bond_type"].to_numpy(dtype=object)
+    validation = validation.add(BOND_TYPE_INVALID, ~df["bond_type"].isin(list(BOND_TYPES)).to_numpy())
+    valid = validation.valid
+    spread = _column(df, "spread", 0.0) + _column(df, "forward_rate", 0.0)
+    amortizing = np.nan_to_num(_column(df, "amortizing_periods", 0.0))
+    book = bond_book_value(
+        np.where(valid, face, 0.0), np.where(valid, coupon, 0.0), np.where(valid, m, 1),
+        np.where(valid, years, 0.0), np.where(valid, yield_, 0.0), use_tea,
+        np.where(valid, bond_type, "Bullet"), np.nan_to_num(spread), None, amortizing
+    )
+    pv = np.where(valid, book["pv"], np.nan)
+    return {"pv_total": pv, "premium_discount": pv - face}, validation
+
+
+MODULES = {"a": run_module_a, "b": run_module_b, "c": run_module_c}
+
+
+# 🔹 Lectura y escritura por bloques
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Itera el archivo de entrada en DataFrames de hasta `chunk_size` filas."""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class ChunkWriter:
+    """Escribe bloques a Parquet (ParquetWriter) o CSV (modo append)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        self._writer = None
+        self._wrote_header = False
+
+    def write(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            df.to_csv(self.path, mode="a" if self._wrote_header else "w",
+                      header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run_batch(input_path, output_path, module, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Procesa el archivo completo bloque a bloque.
+
+    Args:
+        input_path: Archivo de escenarios (.csv o .parquet)
+        output_path: Archivo de resultados (.parquet o .csv)
+        module: 'a', 'b' o 'c'
+        chunk_size: Filas por bloque
+        progress: Callback opcional (filas_procesadas, segundos) por bloque
+
+    Returns:
+        Diccionario con filas totales, inválidas, bloques, segundos y filas/segundo
+    """
+    if module not in MODULES:
+        raise ValueError(f"Módulo no válido: {module}. Opciones: {list(MODULES)}")
+    compute = MODULES[module]
+    writer = ChunkWriter(output_path)
+    rows = invalid = chunks = 0
+    started = time.perf_counter()
+    try:
+        for df in iter_chunks(input_path, chunk_size):
+            # Las filas inválidas pueden producir NaN/inf: se descartan con la máscara
+            with np.errstate(all="ignore"):
+                results, validation = compute(df)
+            valid = validation.valid
+            df["valid"] = valid
+            df["error_codes"] = validation.codes
+            for name, values in results.items():
+                df[name] = values
+            writer.write(df)
+            rows += len(df)
+            invalid += int((~valid).sum())
+            chunks += 1
+            if progress is not None:
+                progress(rows, time.perf_counter() - started)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "invalid_rows": invalid,
+        "chunks": chunks,
+        "elapsed_s": elapsed,
+        "rows_per_s": rows / elapsed if elapsed > 0 else float("inf")
+    }
+
+
+def _peak_rss_mib():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reporta KiB; macOS reporta bytes
+        return peak / 1024 if sys.platform != "darwin" else peak / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación masiva de escenarios desde archivo")
+    parser.add_argument("input", help="Archivo de entrada (.csv o .parquet)")
+    parser.add_argument("output", help="Archivo de salida (.parquet o .csv)")
+    parser.add_argument("--module", choices=sorted(MODULES), required=True)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    if os.path.abspath(args.input) == os.path.abspath(args.output):
+        parser.error("El archivo de salida no puede ser el de entrada.")
+
+    def progress(rows, elapsed):
+        print(f"\r{rows:,} filas · {rows / max(elapsed, 1e-9):,.0f} filas/s", end="", flush=True)
+
+    report = run_batch(args.input, args.output, args.module, args.chunk_size, progress)
+    print()
+    print(f"Filas procesadas: {report['rows']:,} ({report['invalid_rows']:,} inválidas) "
+          f"en {report['chunks']} bloques")
+    print(f"Tiempo: {report['elapsed_s']:.2f} s · {report['rows_per_s']:,.0f} filas/s")
+    peak = _peak_rss_mib()
+    if peak is not None:
+        print(f"Memoria pico del proceso: {peak:,.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
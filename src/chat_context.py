@@ -0,0 +1,117 @@
+"""
+Gestión acotada del historial del chatbot.
+
+Mantiene en memoria un número máximo de mensajes, envía al modelo una ventana
+deslizante de los turnos recientes dentro de un presupuesto de tokens y
+resume de forma incremental los turnos que salen de la ventana.
+"""
+
+from datetime import datetime
+
+from .llm_backends import estimate_tokens
+
+
+def summarize_message(message, max_chars=160):
+    """Resumen extractivo de un mensaje: primera oración, truncada."""
+    text = " ".join(message["content"].split())
+    for sep in (". ", "\n", "? ", "! "):
+        cut = text.find(sep)
+        if 0 < cut < max_chars:
+            text = text[:cut + 1]
+            break
+    if len(text) > max_chars:
+        text = text[:max_chars - 1].rstrip() + "…"
+    speaker = "Usuario" if message["role"] == "user" else "Asistente"
+    return f"- {speaker}: {text}"
+
+
+class ChatContextManager:
+    """
+    Historial con memoria acotada y contexto para el LLM con presupuesto de tokens.
+
+    Args:
+        token_budget: Tokens máximos de la solicitud (sistema + resumen + turnos)
+        window_messages: Mensajes recientes que se envían literalmente
+        max_stored: Mensajes guardados en memoria para la sesión
+        summary_budget: Tokens máximos del resumen de turnos antiguos
+    """
+
+    def __init__(self, token_budget=3000, window_messages=8, max_stored=40, summary_budget=400):
+        if window_messages > max_stored:
+            raise ValueError("window_messages no puede superar max_stored.")
+        self.token_budget = token_budget
+        self.window_messages = window_messages
+        self.max_stored = max_stored
+        self.summary_budget = summary_budget
+        self.history = []
+        self.summary_lines = []
+        self.total_messages = 0
+        # Mensajes del historial ya incorporados al resumen
+        self._summarized = 0
+
+    def add(self, role, content, **extra):
+        """Agrega un mensaje, actualiza el resumen y recorta el historial."""
+        message = {
+            "role": role,
+            "content": content.strip(),
+            "timestamp": datetime.now().isoformat(),
+            **extra
+        }
+        self.history.append(message)
+        self.total_messages += 1
+        self._fold_into_summary()
+        overflow = len(self.history) - self.max_stored
+        if overflow > 0:
+            del self.history[:overflow]
+            self._summarized = max(0, self._summarized - overflow)
+        return message
+
+    def clear(self):
+        self.history = []
+        self.summary_lines = []
+        self.total_messages = 0
+        self._summarized = 0
+
+    @property
+    def summary(self):
+        return "\n".join(self.summary_lines)
+
+    def _fold_into_summary(self):
+        """Resume solo los mensajes que acaban de salir de la ventana."""
+        leaving = len(self.history) - self.window_messages
+        while self._summarized < leaving:
+            self.summary_lines.append(summarize_message(self.history[self._summarized]))
+            self._summarized += 1
+        while len(self.summary_lines) > 1 and estimate_tokens(self.summary) > self.summary_budget:
+            self.summary_lines.pop(0)
+
+    def build_messages(self, system_prompt, user_input):
+        """
+        Construye la solicitud para el LLM respetando el presupuesto de tokens.
+
+        Incluye el prompt de sistema (con el resumen de turnos antiguos), la
+        ventana de turnos recientes que quepa en el presupuesto y la pregunta.
+        Si `user_input` ya es el último mensaje del historial no se duplica.
+        """
+        if self.summary_lines:
+            system_prompt = f"{system_prompt}\nResumen de la conversación previa:\n{self.summary}"
+        system = {"role": "system", "content": system_prompt}
+        question = {"role": "user", "content": user_input}
+
+        window = self.history[-self.window_messages:]
+        if window and window[-1]["role"] == "user" and window[-1]["content"] == user_input.strip():
+            window = window[:-1]
+
+        used = estimate_tokens(system_prompt) + estimate_tokens(user_input)
+        selected = []
+        for message in reversed(window):
+            cost = estimate_tokens(message["content"])
+            if used + cost > self.token_budget:
+                break
+            selected.append({"role": message["role"], "content": message["content"]})
+            used += cost
+        selected.reverse()
+        # La ventana debe empezar con un turno del usuario
+        while selected and selected[0]["role"] != "user":
+            selected.pop(0)
+        return [system] + selected + [question]
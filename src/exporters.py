@@ -8,6 +8,7 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 import io
 import os
+from .profiling import timed
 
 def create_header_footer(canvas, doc):
     """Crea encabezado y pie de página para cada página del PDF"""
@@ -65,6 +66,7 @@ def format_currency(value):
     except:
         return str(value)
 
+@timed("export.pdf")
 def export_to_pdf(results, filename):
     """
     Exporta los resultados a un PDF profesional con gráficas, tablas y formato mejorado
@@ -184,7 +186,8 @@ def export_to_pdf(results, filename):
         elements.append(Paragraph("Módulo A: Crecimiento de Cartera", heading_style))
         
         res_a = results['module_a_result']
-        df = res_a.get('df')
+        growth = res_a.get('result')
+        df = growth.to_frame() if growth is not None else res_a.get('df')
         final_balance = res_a.get('final_balance', 0)
         initial_amount = res_a.get('initial_amount', 0)
         years = res_a.get('years', 0)
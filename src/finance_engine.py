@@ -1,47 +1,256 @@
 import numpy as np
 import pandas as pd
-from .utils import convert_tea_to_periodic
+from .money import allocate_cents, apply_rate, from_cents, round_decimal, to_cents
+from .utils import annuity_factor, category_codes, discount_factors, periodic_rate
+from .profiling import timed
+from .results import GrowthResult, PensionResult
 
-def calculate_portfolio_growth(
+CONTRIBUTION_FREQUENCIES = {'Mensual': 12, 'Trimestral': 4, 'Semestral': 2, 'Anual': 1}
+PAYMENT_FREQUENCIES = {
+    'Mensual': 12,
+    'Bimestral': 6,
+    'Trimestral': 4,
+    'Cuatrimestral': 3,
+    'Semestral': 2,
+    'Anual': 1
+}
+
+
+def build_schedule(definition, n_periods, periods_per_year):
+    """
+    Expande una definición de aportes o tasas a un valor por periodo (1..n).
+
+    Args:
+        definition: Escalar (constante), array de longitud n_periods (valor por
+            periodo) o definición por tramos: dict {año_inicio: valor} o lista
+            de tuplas (año_inicio, valor); cada tramo rige desde ese año
+            (contado desde 0) hasta el inicio del siguiente
+        n_periods: Número de periodos del horizonte
+        periods_per_year: Periodos por año
+
+    Returns:
+        Array float de longitud n_periods
+    """
+    if isinstance(definition, dict):
+        definition = sorted(definition.items())
+    if isinstance(definition, (list, tuple)) and definition and isinstance(definition[0], (list, tuple)):
+        starts = np.array([start for start, _ in definition], dtype=float)
+        values = np.array([value for _, value in definition], dtype=float)
+        order = np.argsort(starts, kind='stable')
+        starts, values = starts[order], values[order]
+        if starts[0] > 0:
+            raise ValueError("El primer tramo debe comenzar en el año 0.")
+        # El periodo t (1..n) pertenece al año (t - 1) // m
+        period_years = np.arange(n_periods) // periods_per_year
+        return values[np.searchsorted(starts, period_years, side='right') - 1]
+
+    values = np.asarray(definition, dtype=float)
+    if values.ndim == 0:
+        return np.full(n_periods, float(values))
+    if values.shape != (n_periods,):
+        raise ValueError(
+            f"El calendario debe tener {n_periods} valores (uno por periodo); se recibieron {values.size}."
+        )
+    return values
+
+
+def _growth_path(initial_amount, contributions, rates):
+    """
+    Saldos de la recurrencia B_t = B_{t-1}(1 + r_t) + c_t sin bucle en Python.
+
+    Con G_t = prod_{k<=t}(1 + r_k): B_t = G_t (B_0 + sum_{k<=t} c_k / G_k),
+    es decir, un producto acumulado y una suma prefija.
+
+    Returns:
+        Array de longitud n + 1 con B_0..B_n
+    """
+    growth = np.cumprod(1 + rates)
+    balances = np.empty(len(rates) + 1)
+    balances[0] = initial_amount
+    balances[1:] = growth * (initial_amount + np.cumsum(contributions / growth))
+    return balances
+
+
+@timed("engine.portfolio_growth")
+def simulate_portfolio_growth(
     initial_amount,
     periodic_contribution,
     contribution_freq,
     years,
-    tea
+    tea,
+    inflation=None
 ):
-    periods_per_year = {
-        'Mensual': 12,
-        'Trimestral': 4,
-        'Semestral': 2,
-        'Anual': 1
-    }[contribution_freq]
-    
-    r = convert_tea_to_periodic(tea / 100, periods_per_year)
+    """
+    Simula el crecimiento de la cartera y devuelve los arrays del motor.
+
+    Mismos argumentos que calculate_portfolio_growth.
+
+    Returns:
+        GrowthResult (to_frame() arma el DataFrame de calculate_portfolio_growth)
+    """
+    periods_per_year = CONTRIBUTION_FREQUENCIES[contribution_freq]
     n_periods = int(years * periods_per_year)
-    
-    periods = []
-    balance = initial_amount
-    total_contributions = initial_amount
-    for i in range(n_periods + 1):
-        if i == 0:
-            interest = 0.0
-        else:
-            interest = balance * r
-            balance += interest
-            if periodic_contribution > 0:
-                balance += periodic_contribution
-                total_contributions += periodic_contribution
-        
-        periods.append({
-            'Periodo': i,
-            'Aporte': periodic_contribution if i > 0 else initial_amount,
-            'Saldo_Inicial': balance - interest - (periodic_contribution if i > 0 else 0),
-            'Interes': interest,
-            'Saldo_Final': balance
-        })
-    
-    return pd.DataFrame(periods), balance
 
+    contributions = build_schedule(periodic_contribution, n_periods, periods_per_year)
+    teas = build_schedule(tea, n_periods, periods_per_year)
+    rates = periodic_rate(teas / 100, periods_per_year)
+
+    balances = _growth_path(initial_amount, np.where(contributions > 0, contributions, 0.0), rates)
+    deflator = None
+    if inflation is not None:
+        deflator = _deflator(build_schedule(inflation, n_periods, periods_per_year), periods_per_year)
+    return GrowthResult(initial_amount, years, contributions, rates, balances, deflator)
+
+
+def calculate_portfolio_growth(
+    initial_amount,
+    periodic_contribution,
+    contribution_freq,
+    years,
+    tea,
+    inflation=None
+):
+    """
+    Simula el crecimiento de la cartera periodo a periodo.
+
+    Args:
+        initial_amount: Monto inicial
+        periodic_contribution: Aporte por periodo; escalar, array por periodo o
+            definición por tramos (ver build_schedule). Los negativos no se aportan.
+        contribution_freq: 'Mensual', 'Trimestral', 'Semestral' o 'Anual'
+        years: Plazo en años
+        tea: Tasa efectiva anual (%); escalar, array por periodo o por tramos
+        inflation: Inflación anual (%) opcional; escalar, array por periodo o
+            por tramos. Si se indica, se agregan Aporte_Real, Saldo_Real y
+            Deflactor, y df.attrs['cagr'] / df.attrs['cagr_real']
+
+    Returns:
+        df: DataFrame con Periodo, Aporte, Saldo_Inicial, Interes, Saldo_Final
+        balance: Saldo final (nominal)
+    """
+    result = simulate_portfolio_growth(
+        initial_amount, periodic_contribution, contribution_freq, years, tea, inflation
+    )
+    return result.to_frame(), result.final_balance
+
+
+def _deflator(inflation, periods_per_year):
+    """Índice de precios por periodo D_0..D_n (D_0 = 1) desde inflación anual (%)."""
+    deflator = np.ones(len(inflation) + 1)
+    deflator[1:] = np.cumprod(1 + periodic_rate(inflation / 100, periods_per_year))
+    return deflator
+
+
+class IncrementalGrowth:
+    """
+    Calendario de crecimiento con recálculo incremental para análisis what-if.
+
+    Guarda los factores de crecimiento acumulados G_t y la suma prefija de
+    aportes descontados S_t = sum_{k<=t} c_k / G_k. Si una edición solo cambia
+    los aportes o tasas desde el periodo k, se reutiliza el prefijo 1..k-1 y
+    solo se recalcula el sufijo, partiendo de G_{k-1} y S_{k-1}.
+
+    Args:
+        initial_amount: Monto inicial
+        periodic_contribution: Aportes (escalar, array por periodo o por tramos)
+        contribution_freq: 'Mensual', 'Trimestral', 'Semestral' o 'Anual'
+        years: Plazo en años
+        tea: Tasa efectiva anual (%) (escalar, array por periodo o por tramos)
+    """
+
+    def __init__(self, initial_amount, periodic_contribution, contribution_freq, years, tea):
+        self.initial_amount = initial_amount
+        self.years = years
+        self.periods_per_year = CONTRIBUTION_FREQUENCIES[contribution_freq]
+        self.n_periods = int(years * self.periods_per_year)
+        self.contributions = build_schedule(periodic_contribution, self.n_periods, self.periods_per_year)
+        self.teas = build_schedule(tea, self.n_periods, self.periods_per_year)
+        self.rates = self._rates(self.teas)
+        self.growth = np.empty(self.n_periods)
+        self.prefix = np.empty(self.n_periods)
+        self.balances = np.empty(self.n_periods + 1)
+        self.balances[0] = initial_amount
+        self.last_recomputed = self.n_periods
+        self._recompute_from(0)
+
+    def _rates(self, teas):
+        return periodic_rate(teas / 100, self.periods_per_year)
+
+    def _recompute_from(self, k):
+        """Recalcula G, S y saldos para los periodos k+1..n (índices k..n-1)."""
+        if k >= self.n_periods:
+            self.last_recomputed = 0
+            return
+        c = np.where(self.contributions[k:] > 0, self.contributions[k:], 0.0)
+        g_prev = self.growth[k - 1] if k > 0 else 1.0
+        s_prev = self.prefix[k - 1] if k > 0 else 0.0
+        self.growth[k:] = g_prev * np.cumprod(1 + self.rates[k:])
+        self.prefix[k:] = s_prev + np.cumsum(c / self.growth[k:])
+        self.balances[k + 1:] = self.growth[k:] * (self.initial_amount + self.prefix[k:])
+        self.last_recomputed = self.n_periods - k
+
+    def update(self, periodic_contribution=None, tea=None):
+        """
+        Aplica una edición de aportes y/o tasas recalculando solo el sufijo afectado.
+
+        Returns:
+            Índice del primer periodo cambiado (0 = periodo 1), o None si no hubo cambios
+        """
+        changed = self.n_periods
+        if periodic_contribution is not None:
+            contributions = build_schedule(periodic_contribution, self.n_periods, self.periods_per_year)
+            diff = np.flatnonzero(contributions != self.contributions)
+            if diff.size:
+                changed = min(changed, int(diff[0]))
+                self.contributions = contributions
+        if tea is not None:
+            teas = build_schedule(tea, self.n_periods, self.periods_per_year)
+            diff = np.flatnonzero(teas != self.teas)
+            if diff.size:
+                k = int(diff[0])
+                changed = min(changed, k)
+                self.teas = teas
+                self.rates[k:] = self._rates(teas[k:])
+        if changed == self.n_periods:
+            self.last_recomputed = 0
+            return None
+        self._recompute_from(changed)
+        return changed
+
+    @property
+    def final_balance(self):
+        return float(self.balances[-1])
+
+    def result(self):
+        """
+        GrowthResult con una copia de los arrays actuales.
+
+        Se copia porque update() modifica los arrays en el lugar.
+        """
+        return GrowthResult(
+            self.initial_amount, self.years, self.contributions.copy(), self.rates.copy(), self.balances.copy()
+        )
+
+    def to_frame(self):
+        """Mismo DataFrame que calculate_portfolio_growth."""
+        return self.result().to_frame()
+
+def annuity_payment(principal, rate, n_periods):
+    """
+    Cuota constante que amortiza `principal` en `n_periods` a la tasa periódica `rate`.
+
+    Núcleo compartido por pensiones y préstamos; acepta escalares o arrays
+    (se aplica broadcasting) y devuelve 0 donde n_periods <= 0.
+    """
+    principal, rate, n = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (principal, rate, n_periods))
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment = np.where(rate != 0, principal * rate / (1 - (1 + rate) ** (-n)), principal / n)
+    return np.where(n > 0, payment, 0.0)
+
+
+@timed("engine.monthly_pension")
 def calculate_monthly_pension(
     capital,
     retirement_years,
@@ -49,20 +258,172 @@ def calculate_monthly_pension(
 ):
     if retirement_years <= 0 or tea_retirement <= 0:
         return 0.0
-    r_monthly = convert_tea_to_periodic(tea_retirement / 100, 12)
     n_months = int(retirement_years * 12)
-    if r_monthly == 0:
-        return capital / n_months if n_months > 0 else 0.0
-    pension = capital * (r_monthly / (1 - (1 + r_monthly) ** (-n_months)))
-    return pension
+    if n_months <= 0:
+        return 0.0
+    return capital / annuity_factor(tea_retirement / 100, 12, n_months)
+
+@timed("engine.pension_schedule")
+def simulate_pension(
+    capital,
+    retirement_years,
+    tea_retirement,
+    inflation=None
+):
+    """
+    Desacumulación mensual del capital; mismos argumentos que calculate_pension_schedule.
+
+    Returns:
+        PensionResult (to_frame() arma el DataFrame de calculate_pension_schedule)
+    """
+    pension = calculate_monthly_pension(capital, retirement_years, tea_retirement)
+    n_months = int(retirement_years * 12) if pension > 0 else 0
+    r = periodic_rate(tea_retirement / 100, 12) if n_months else 0.0
+
+    # B_t = B_0 (1+r)^t - P ((1+r)^t - 1) / r, en forma cerrada para todos los meses
+    growth = np.ones(n_months + 1)
+    if n_months:
+        growth[1:] = 1 / discount_factors(tea_retirement / 100, 12, n_months)
+    annuity = (growth - 1) / r if r != 0 else np.arange(n_months + 1, dtype=float)
+    balances = capital * growth - pension * annuity
+    balances[-1] = max(balances[-1], 0.0) if n_months else balances[-1]
+
+    deflator = None
+    if inflation is not None:
+        deflator = _deflator(build_schedule(inflation, n_months, 12), 12)[1:]
+    return PensionResult(pension, r, balances, deflator)
+
+
+def calculate_pension_schedule(
+    capital,
+    retirement_years,
+    tea_retirement,
+    inflation=None
+):
+    """
+    Calendario mensual de desacumulación para la pensión de calculate_monthly_pension.
+
+    Args:
+        capital: Capital al inicio del retiro
+        retirement_years: Años de retiro
+        tea_retirement: TEA durante el retiro (%)
+        inflation: Inflación anual (%) opcional (escalar, array mensual o por
+            tramos); agrega Pension_Real, Saldo_Real y Deflactor
+
+    Returns:
+        df: DataFrame con Mes, Saldo_Inicial, Interes, Pension, Saldo_Final
+        pension: Pensión mensual nominal
+    """
+    result = simulate_pension(capital, retirement_years, tea_retirement, inflation)
+    return result.to_frame(), result.pension
+
+# 🔹 Flujos de bonos: bullet, amortizables y de tasa flotante
+
+BOND_TYPES = {'Bullet': 0, 'Amortizable': 1, 'Flotante': 2}
+
+
+def _forward_schedule(forward_curve, n_periods, periods_per_year):
+    """
+    Tasas forward anuales (%) por periodo.
+
+    Acepta un escalar, una lista con una tasa por año (la última se mantiene
+    hasta el final) o tramos {año_inicio: tasa} como en build_schedule.
+    """
+    if forward_curve is None:
+        return np.zeros(n_periods)
+    if not isinstance(forward_curve, dict) and np.ndim(forward_curve) == 1:
+        forward_curve = list(enumerate(np.asarray(forward_curve, dtype=float)))
+    return build_schedule(forward_curve, n_periods, periods_per_year)
+
+
+@timed("engine.bond_cash_flows")
+def bond_cash_flows(
+    face_value,
+    coupon_rate,
+    periods_per_year,
+    years_to_maturity,
+    bond_type='Bullet',
+    spread=0.0,
+    forward_curve=None,
+    amortizing_periods=0
+):
+    """
+    Flujos por periodo de una cartera mixta de bonos como matrices bonos × periodos.
+
+    Todos los tipos comparten la misma representación: saldo vigente al
+    inicio de cada periodo, tasa cupón anual del periodo, cupón (saldo ×
+    tasa / m) y amortización de principal. Los periodos posteriores al
+    vencimiento de cada bono quedan en cero.
+
+    Args:
+        face_value: Valor nominal (escalar o uno por bono)
+        coupon_rate: Tasa cupón fija (% anual); se ignora en los flotantes
+        periods_per_year: Cupones por año (valores de PAYMENT_FREQUENCIES)
+        years_to_maturity: Años hasta el vencimiento
+        bond_type: 'Bullet' (principal al vencimiento), 'Amortizable'
+            (principal en cuotas iguales, cupón sobre el saldo) o 'Flotante'
+            (cupón = forward + spread, principal al vencimiento); escalar o
+            uno por bono
+        spread: Margen sobre la curva forward (% anual) de los flotantes
+        forward_curve: Curva forward (% anual), ver _forward_schedule
+        amortizing_periods: Número de cuotas de amortización de los
+            amortizables, pagadas al final del plazo (0 = todo el plazo)
+
+    Returns:
+        Diccionario con matrices balance, rate, coupon, principal y el
+        array n_periods por bono
+    """
+    face_value, coupon_rate, m, years, spread, amortizing = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in
+          (face_value, coupon_rate, periods_per_year, years_to_maturity, spread, amortizing_periods))
+    )
+    n_bonds = face_value.size
+    types = category_codes(bond_type, BOND_TYPES, "Tipo de bono", n_bonds)
+    n_periods = np.floor(years * m).astype(int)
+    horizon = max(int(n_periods.max()), 0)
+    t = np.arange(1, horizon + 1)
+    active = t <= n_periods[:, None]
+
+    # Tasa anual por periodo: fija o forward + spread (sin cupones negativos);
+    # la curva se expande una vez por frecuencia presente en la cartera
+    rate = np.repeat(coupon_rate[:, None], horizon, axis=1)
+    floating = types == BOND_TYPES['Flotante']
+    for freq in np.unique(m[floating]):
+        rows = floating & (m == freq)
+        forwards = _forward_schedule(forward_curve, horizon, int(freq))
+        rate[rows] = np.maximum(forwards[None, :] + spread[rows, None], 0.0)
+    rate = np.where(active, rate, 0.0)
 
+    # Cuotas de amortización: un bullet es un amortizable de una sola cuota
+    valid_k = (amortizing > 0) & (amortizing <= n_periods)
+    k = np.where(types == BOND_TYPES['Amortizable'], np.where(valid_k, amortizing, n_periods), 1)
+    k = np.maximum(k, 1)[:, None]
+    first = (n_periods[:, None] - k)
+    paid = np.clip(t - 1 - first, 0, None)
+    balance = np.where(active, face_value[:, None] * (1 - paid / k), 0.0)
+    principal = np.where(active & (t > first), face_value[:, None] / k, 0.0)
+    return {
+        'balance': balance,
+        'rate': rate,
+        'coupon': balance * (rate / 100 / m[:, None]),
+        'principal': principal,
+        'n_periods': n_periods
+    }
+
+
+@timed("engine.bond_present_value")
 def bond_present_value(
     face_value,
     coupon_rate,
     payment_freq,
     years_to_maturity,
     required_yield,
-    use_tea=True
+    use_tea=True,
+    bond_type='Bullet',
+    spread=0.0,
+    forward_curve=None,
+    amortizing_periods=0,
+    exact=False
 ):
     """
     Calcula el valor presente de un bono con detalle completo por periodo.
@@ -74,6 +435,11 @@ def bond_present_value(
         years_to_maturity: Años hasta el vencimiento
         required_yield: Tasa de retorno requerida (% anual)
         use_tea: Si True, usa TEA; si False, usa tasa nominal
+        bond_type: 'Bullet', 'Amortizable' o 'Flotante' (ver bond_cash_flows)
+        spread: Margen sobre la curva forward (% anual), bonos flotantes
+        forward_curve: Curva forward (% anual), bonos flotantes
+        amortizing_periods: Cuotas de amortización (0 = todo el plazo)
+        exact: Si True, contabiliza los flujos en centavos enteros (src.money)
     
     Returns:
         df: DataFrame con detalle de flujos por periodo
@@ -102,61 +468,64 @@ def bond_present_value(
     if total_periods == 0:
         raise ValueError("El plazo debe generar al menos un periodo de pago")
     
-    # Cálculo de la tasa periódica y cupón
-    if use_tea:
-        # Para el cupón: usar tasa nominal simple (estándar en bonos)
-        coupon_periodic_rate = (coupon_rate / 100) / periods_per_year
-        # Para descuento: convertir TEA a tasa periódica efectiva
-        discount_rate = convert_tea_to_periodic(required_yield / 100, periods_per_year)
-    else:
-        # Tasa nominal simple para ambos
-        coupon_periodic_rate = (coupon_rate / 100) / periods_per_year
-        discount_rate = (required_yield / 100) / periods_per_year
-    
-    coupon_payment = face_value * coupon_periodic_rate
+    # Flujos del bono (cupón con tasa nominal simple, estándar en bonos)
+    flows = bond_cash_flows(
+        face_value, coupon_rate, periods_per_year, years_to_maturity,
+        bond_type, spread, forward_curve, amortizing_periods
+    )
+    coupons, principals = flows['coupon'][0], flows['principal'][0]
+    # Para descuento: TEA a tasa periódica efectiva, o tasa nominal simple
+    rate_kind = 'TEA' if use_tea else 'TNA'
+    discount_rate = periodic_rate(required_yield / 100, periods_per_year, rate_kind)
+    factors = discount_factors(required_yield / 100, periods_per_year, total_periods, rate_kind)
     
-    # Construcción de tabla de flujos con detalle completo
-    periodos = []
-    flujos_cupon = []
-    flujos_principal = []
-    flujos_totales = []
-    factores_descuento = []
-    valores_presentes = []
+    coupon_payment = float(coupons[0])
     
-    for t in range(1, total_periods + 1):
-        # Flujos
-        cupon = coupon_payment
-        principal = face_value if t == total_periods else 0.0
-        flujo_total = cupon + principal
-        
-        # Factor de descuento
-        factor = 1 / ((1 + discount_rate) ** t)
-        
-        # Valor presente
-        vp = flujo_total * factor
-        
-        periodos.append(t)
-        flujos_cupon.append(round(cupon, 2))
-        flujos_principal.append(round(principal, 2))
-        flujos_totales.append(round(flujo_total, 2))
-        factores_descuento.append(round(factor, 6))
-        valores_presentes.append(round(vp, 2))
+    # Tabla de flujos: cada columna se redondea de forma vectorizada (mismo
+    # resultado que round() por elemento) o, en modo exacto, se contabiliza
+    # en centavos enteros para que Cupón + Principal = Flujo Total y la suma
+    # de los VP sea el VP total, al centavo
+    if exact:
+        coupon_cents = to_cents(coupons)
+        if bond_type == 'Amortizable' and principals.sum() > 0:
+            # Las cuotas en centavos suman exactamente el nominal
+            principal_cents = allocate_cents(to_cents(face_value), principals)
+        else:
+            principal_cents = to_cents(principals)
+        flow_cents = coupon_cents + principal_cents
+        pv_cents = apply_rate(flow_cents, factors)
+        cupon, principal, flujo_total, vp = (
+            from_cents(x) for x in (coupon_cents, principal_cents, flow_cents, pv_cents)
+        )
+        pv_total = float(from_cents(pv_cents.sum()))
+        total_cupones = float(from_cents(coupon_cents.sum()))
+    else:
+        cupon = round_decimal(coupons, 2)
+        principal = round_decimal(principals, 2)
+        flujo_total = round_decimal(coupons + principals, 2)
+        vp = round_decimal((coupons + principals) * factors, 2)
+        pv_total = round(float(vp.sum()), 2)
+        total_cupones = round(float(cupon.sum()), 2)
 
     df = pd.DataFrame({
-        'Periodo': periodos,
-        'Cupón': flujos_cupon,
-        'Principal': flujos_principal,
-        'Flujo Total': flujos_totales,
-        'Factor Descuento': factores_descuento,
-        'Valor Presente': valores_presentes
+        'Periodo': np.arange(1, total_periods + 1),
+        'Cupón': cupon,
+        'Principal': principal,
+        'Flujo Total': flujo_total,
+        'Factor Descuento': round_decimal(factors, 6),
+        'Valor Presente': vp
     })
     
-    # Valor presente total (redondeado)
-    pv_total = round(sum(valores_presentes), 2)
-    
-    total_cupones = round(sum(flujos_cupon), 2)
-    vp_cupones = round(df['Valor Presente'].iloc[:-1].sum(), 2) if total_periods > 1 else 0
-    vp_principal = round(df['Valor Presente'].iloc[-1], 2)
+    if bond_type == 'Amortizable':
+        # El principal se reparte en varios periodos: se descuenta flujo por flujo
+        if exact:
+            vp_principal = float(from_cents(apply_rate(principal_cents, factors).sum()))
+        else:
+            vp_principal = round(float((principals * factors).sum()), 2)
+        vp_cupones = round(pv_total - vp_principal, 2)
+    else:
+        vp_cupones = round(df['Valor Presente'].iloc[:-1].sum(), 2) if total_periods > 1 else 0
+        vp_principal = round(df['Valor Presente'].iloc[-1], 2)
     
     summary = {
         'total_periods': total_periods,
@@ -169,4 +538,160 @@ def bond_present_value(
         'premium_discount_pct': round(((pv_total / face_value) - 1) * 100, 2)
     }
     
-    return df, pv_total, summary
\ No newline at end of file
+    return df, pv_total, summary
+
+# 🔹 Versiones vectorizadas (lotes de escenarios)
+
+@timed("engine.portfolio_growth_batch")
+def portfolio_final_balance_batch(
+    initial_amount,
+    periodic_contribution,
+    periods_per_year,
+    years,
+    tea
+):
+    """
+    Capital final de muchos escenarios del Módulo A en una sola pasada.
+
+    Equivale a `calculate_portfolio_growth(...)[1]` para cada fila, usando la
+    fórmula cerrada de la anualidad vencida en lugar del bucle por periodo.
+
+    Args:
+        initial_amount: Montos iniciales (escalar o array)
+        periodic_contribution: Aportes por periodo (los negativos se ignoran)
+        periods_per_year: Periodos por año (12, 4, 2, 1)
+        years: Plazos en años
+        tea: Tasas efectivas anuales (%)
+
+    Returns:
+        Array con el capital final de cada escenario
+    """
+    initial_amount, contribution, m, years, tea = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in
+          (initial_amount, periodic_contribution, periods_per_year, years, tea))
+    )
+    r = periodic_rate(tea / 100, m)
+    n = np.floor(years * m)
+    growth = (1 + r) ** n
+    contribution = np.where(contribution > 0, contribution, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(r != 0, (growth - 1) / r, n)
+    return initial_amount * growth + contribution * annuity
+
+
+@timed("engine.monthly_pension_batch")
+def monthly_pension_batch(
+    capital,
+    retirement_years,
+    tea_retirement
+):
+    """
+    Pensión mensual de muchos escenarios (misma regla que calculate_monthly_pension).
+
+    Devuelve 0 en las filas con años de retiro o TEA no positivos.
+    """
+    capital, retirement_years, tea = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (capital, retirement_years, tea_retirement))
+    )
+    valid = (retirement_years > 0) & (tea > 0)
+    r = periodic_rate(np.where(valid, tea, 0.0) / 100, 12)
+    n = np.floor(retirement_years * 12)
+    return np.where(valid, annuity_payment(capital, r, n), 0.0)
+
+
+@timed("engine.bond_price_batch")
+def bond_price_batch(
+    face_value,
+    coupon_rate,
+    periods_per_year,
+    years_to_maturity,
+    required_yield,
+    use_tea=True
+):
+    """
+    Valor presente de muchos bonos bullet de cupón fijo en una sola pasada.
+
+    Usa la fórmula cerrada cupón × anualidad + principal descontado; a
+    diferencia de bond_present_value no redondea flujo por flujo.
+
+    Returns:
+        Array con el valor presente de cada bono (NaN si el plazo no genera periodos)
+    """
+    face_value, coupon_rate, m, years, yield_, use_tea = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in
+          (face_value, coupon_rate, periods_per_year, years_to_maturity, required_yield, use_tea))
+    )
+    n = np.floor(years * m)
+    coupon = face_value * (coupon_rate / 100) / m
+    discount_rate = np.where(
+        use_tea.astype(bool),
+        periodic_rate(yield_ / 100, m, 'TEA'),
+        periodic_rate(yield_ / 100, m, 'TNA')
+    )
+    v_n = (1 + discount_rate) ** (-n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(discount_rate != 0, (1 - v_n) / discount_rate, n)
+    return np.where(n > 0, coupon * annuity + face_value * v_n, np.nan)
+
+
+@timed("engine.bond_book_value")
+def bond_book_value(
+    face_value,
+    coupon_rate,
+    periods_per_year,
+    years_to_maturity,
+    required_yield,
+    use_tea=True,
+    bond_type='Bullet',
+    spread=0.0,
+    forward_curve=None,
+    amortizing_periods=0,
+    max_cells=2_000_000
+):
+    """
+    Valor presente de una cartera mixta de bonos (bullet, amortizables y
+    flotantes) en una sola pasada sobre la matriz de flujos de bond_cash_flows.
+
+    Los cupones flotantes se proyectan con la curva forward; todos los flujos
+    se descuentan a la tasa requerida de cada bono, como en bond_present_value.
+    Las carteras grandes se recorren por bloques de bonos de a lo más
+    `max_cells` celdas bono × periodo para acotar la memoria.
+
+    Returns:
+        Diccionario con arrays por bono pv, pv_coupons, pv_principal y
+        n_periods (pv es NaN si el plazo no genera periodos)
+    """
+    numeric = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in
+          (face_value, coupon_rate, periods_per_year, years_to_maturity, required_yield,
+           use_tea, spread, amortizing_periods))
+    )
+    n_bonds = numeric[0].size
+    bond_type = np.broadcast_to(np.asarray(bond_type, dtype=object), (n_bonds,))
+    face_value, coupon_rate, m, years, yield_, use_tea, spread, amortizing = (
+        np.broadcast_to(x, (n_bonds,)) for x in numeric
+    )
+    discount_rate = np.where(
+        use_tea.astype(bool),
+        periodic_rate(yield_ / 100, m, 'TEA'),
+        periodic_rate(yield_ / 100, m, 'TNA')
+    )
+    n_periods = np.floor(years * m).astype(int)
+    pv_coupons = np.zeros(n_bonds)
+    pv_principal = np.zeros(n_bonds)
+    block = max(1, max_cells // max(int(n_periods.max(initial=1)), 1))
+    for first in range(0, n_bonds, block):
+        rows = slice(first, first + block)
+        flows = bond_cash_flows(
+            face_value[rows], coupon_rate[rows], m[rows], years[rows],
+            bond_type[rows], spread[rows], forward_curve, amortizing[rows]
+        )
+        factors = (1 + discount_rate[rows, None]) ** -np.arange(1, flows['coupon'].shape[1] + 1)
+        pv_coupons[rows] = np.einsum('bt,bt->b', flows['coupon'], factors)
+        pv_principal[rows] = np.einsum('bt,bt->b', flows['principal'], factors)
+    return {
+        'pv': np.where(n_periods > 0, pv_coupons + pv_principal, np.nan),
+        'pv_coupons': pv_coupons,
+        'pv_principal': pv_principal,
+        'n_periods': n_periods
+    }
@@ -0,0 +1,249 @@
+"""
+Bonos con fechas: calendario de cupones, convenciones de conteo de días e
+interés corrido.
+
+Los cupones se generan hacia atrás desde el vencimiento con aritmética de
+fechas vectorizada (datetime64): para cada par (bono, fecha de liquidación)
+se ubican el cupón anterior y el siguiente sin recorrer el calendario, y el
+precio sucio se obtiene con la fórmula cerrada de la anualidad desde el
+próximo cupón, descontada la fracción de periodo que falta para llegar a él.
+
+    precio_sucio  = v^w · (C · (1 - v^n) / (1 - v) + F · v^(n-1))
+    precio_limpio = precio_sucio - interés_corrido
+
+Convenciones de conteo de días (DAY_COUNTS):
+    30/360   días 30/360 (bond basis) sobre periodos de 360/m días
+    ACT/360  días reales; el interés corrido usa un año de 360 días
+    ACT/365  días reales; el interés corrido usa un año de 365 días
+    ACT/ACT  días reales sobre los días reales del periodo (ICMA)
+
+Todas las entradas admiten broadcasting: bonos (N,) contra fechas de
+liquidación (S, 1) valoran la matriz completa en una sola llamada.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .finance_engine import PAYMENT_FREQUENCIES
+from .profiling import timed
+from .utils import periodic_rate
+
+DAY_COUNTS = ('30/360', 'ACT/360', 'ACT/365', 'ACT/ACT')
+
+
+def _as_dates(values):
+    """Convierte fechas (str, date, datetime64, arrays de ellas) a datetime64[D]."""
+    return np.asarray(values, dtype='datetime64[D]')
+
+
+# Las fechas se manejan como (mes absoluto desde 1970-01, día del mes) y se
+# vuelven a días con una tabla de inicios de mes: la conversión de calendario
+# de numpy (datetime64[D] -> [M]) se hace una sola vez por fecha de entrada y
+# no sobre la grilla bonos × liquidaciones.
+
+def _civil(dates):
+    months = dates.astype('datetime64[M]')
+    return months.astype(np.int64), (dates - months.astype('datetime64[D]')).astype(np.int64) + 1
+
+
+def _month_starts(first, last):
+    """Día (desde 1970-01-01) en que empieza cada mes de first..last+1."""
+    return np.arange(first, last + 2).astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+
+
+def _shift(month, day, eom, n_months, starts, first):
+    """Desplaza (mes, día) n meses; recorta al fin de mes o lo mantiene si `eom`."""
+    target = month + n_months
+    idx = target - first
+    month_days = starts[idx + 1] - starts[idx]
+    return target, np.where(eom, month_days, np.minimum(day, month_days)), starts[idx]
+
+
+def add_months(dates, n_months, end_of_month=True):
+    """
+    Desplaza fechas un número (entero, escalar o array) de meses.
+
+    El día se recorta al último día del mes destino; con `end_of_month`, las
+    fechas que caen en fin de mes se mantienen en fin de mes.
+    """
+    dates = _as_dates(dates)
+    n_months = np.asarray(n_months, dtype=np.int64)
+    month, day = _civil(dates)
+    first = int(np.min(month) + min(np.min(n_months), 0))
+    starts = _month_starts(first, int(np.max(month) + max(np.max(n_months), 0)))
+    eom = end_of_month & (day == starts[month - first + 1] - starts[month - first])
+    _, day, month_start = _shift(month, day, eom, n_months, starts, first)
+    return (month_start + day - 1).astype('datetime64[D]')
+
+
+def _days_30_360(month1, day1, month2, day2):
+    day1 = np.minimum(day1, 30)
+    day2 = np.where(day1 == 30, np.minimum(day2, 30), day2)
+    return 30 * (month2 - month1) + (day2 - day1)
+
+
+def _check_day_count(convention):
+    if convention not in DAY_COUNTS:
+        raise ValueError(f"Convención de conteo de días no válida: {convention}. Opciones: {list(DAY_COUNTS)}")
+
+
+def _coupon_position(settlement, maturity, step):
+    """
+    Cupones pendientes y cupones anterior/siguiente a cada liquidación.
+
+    Los cupones caen en maturity - k·step meses (k = 0, 1, ...). El número
+    de cupones pendientes es el menor k cuyo cupón no es posterior a la
+    liquidación; se obtiene con la diferencia en meses y una sola corrección.
+
+    Returns:
+        remaining, (mes, día, fecha en días) del cupón anterior y del
+        siguiente, y (mes, día) de la liquidación, con la forma broadcast
+    """
+    settle_month, settle_day = _civil(settlement)
+    mat_month, mat_day = _civil(maturity)
+    first = int(np.min(settle_month)) - step
+    starts = _month_starts(first, int(np.max(mat_month)))
+    mat_eom = mat_day == starts[mat_month - first + 1] - starts[mat_month - first]
+    settle_days = settlement.astype(np.int64)
+
+    settle_month, settle_day, settle_days, mat_month, mat_day, mat_eom = np.broadcast_arrays(
+        settle_month, settle_day, settle_days, mat_month, mat_day, mat_eom
+    )
+    k = (mat_month - settle_month) // step
+    _, day, month_start = _shift(mat_month, mat_day, mat_eom, -k * step, starts, first)
+    remaining = np.where(month_start + day - 1 <= settle_days, k, k + 1)
+    previous, following = (
+        _shift(mat_month, mat_day, mat_eom, -n * step, starts, first) for n in (remaining, remaining - 1)
+    )
+    return (
+        remaining,
+        (previous[0], previous[1], previous[2] + previous[1] - 1),
+        (following[0], following[1], following[2] + following[1] - 1),
+        (settle_month, settle_day, settle_days)
+    )
+
+
+def coupon_dates(settlement, maturity, payment_freq='Semestral'):
+    """Fechas de los cupones pendientes de un bono, en orden cronológico."""
+    settlement, maturity = _as_dates(settlement), _as_dates(maturity)
+    step = 12 // PAYMENT_FREQUENCIES[payment_freq]
+    remaining = int(_coupon_position(settlement, maturity, step)[0])
+    return add_months(maturity, -np.arange(remaining - 1, -1, -1) * step)
+
+
+@timed("engine.dated_bond_prices")
+def price_bonds(
+    face_value,
+    coupon_rate,
+    maturity,
+    settlement,
+    required_yield,
+    payment_freq='Semestral',
+    day_count='ACT/ACT',
+    use_tea=True
+):
+    """
+    Precio sucio, precio limpio e interés corrido de muchos bonos y fechas.
+
+    Args:
+        face_value: Valor nominal (escalar o array)
+        coupon_rate: Tasa cupón (% anual)
+        maturity: Fecha(s) de vencimiento
+        settlement: Fecha(s) de liquidación (anteriores al vencimiento)
+        required_yield: Tasa de retorno requerida (% anual)
+        payment_freq: Frecuencia de cupones (PAYMENT_FREQUENCIES), una para todos
+        day_count: Convención de conteo de días (DAY_COUNTS)
+        use_tea: Si True, la tasa requerida es TEA; si False, nominal
+
+    Returns:
+        Diccionario de arrays con la forma broadcast de las entradas:
+        dirty_price, clean_price, accrued_interest, remaining_coupons,
+        previous_coupon, next_coupon, accrual_fraction (fracción del periodo
+        corrido) y periods_to_next (fracción de periodo hasta el próximo cupón)
+    """
+    _check_day_count(day_count)
+    if payment_freq not in PAYMENT_FREQUENCIES:
+        raise ValueError(f"Frecuencia no válida. Opciones: {list(PAYMENT_FREQUENCIES)}")
+    m = PAYMENT_FREQUENCIES[payment_freq]
+    maturity, settlement = _as_dates(maturity), _as_dates(settlement)
+    if np.any(settlement >= maturity):
+        raise ValueError("La fecha de liquidación debe ser anterior al vencimiento.")
+
+    remaining, previous, following, settle = _coupon_position(settlement, maturity, 12 // m)
+    if day_count == '30/360':
+        period_days = _days_30_360(previous[0], previous[1], following[0], following[1])
+        elapsed = _days_30_360(previous[0], previous[1], settle[0], settle[1])
+        to_next = _days_30_360(settle[0], settle[1], following[0], following[1])
+    else:
+        period_days = following[2] - previous[2]
+        elapsed = settle[2] - previous[2]
+        to_next = following[2] - settle[2]
+
+    face_value, coupon_rate, required_yield = (np.asarray(x, dtype=float) for x in (face_value, coupon_rate, required_yield))
+    coupon = face_value * coupon_rate / 100 / m
+    if day_count in ('ACT/360', 'ACT/365'):
+        year_days = 360 if day_count == 'ACT/360' else 365
+        accrued = face_value * coupon_rate / 100 * elapsed / year_days
+    else:
+        accrued = coupon * elapsed / period_days
+
+    i = periodic_rate(required_yield / 100, m, 'TEA' if use_tea else 'TNA')
+    v = 1 / (1 + i)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(i != 0, (1 - v ** remaining) / (1 - v), remaining)
+    to_next = to_next / period_days
+    dirty = v ** to_next * (coupon * annuity + face_value * v ** (remaining - 1))
+    shape = dirty.shape
+    return {
+        'dirty_price': dirty,
+        'clean_price': dirty - accrued,
+        'accrued_interest': np.broadcast_to(accrued, shape),
+        'remaining_coupons': np.broadcast_to(remaining, shape),
+        'previous_coupon': np.broadcast_to(previous[2].astype('datetime64[D]'), shape),
+        'next_coupon': np.broadcast_to(following[2].astype('datetime64[D]'), shape),
+        'accrual_fraction': np.broadcast_to(elapsed / period_days, shape),
+        'periods_to_next': np.broadcast_to(to_next, shape)
+    }
+
+
+@timed("engine.dated_bond_schedule")
+def dated_bond_schedule(
+    face_value,
+    coupon_rate,
+    maturity,
+    settlement,
+    required_yield,
+    payment_freq='Semestral',
+    day_count='ACT/ACT',
+    use_tea=True
+):
+    """
+    Flujos fechados de un bono desde la liquidación.
+
+    Returns:
+        df: DataFrame con Fecha, Periodos (desde la liquidación), Cupón,
+            Principal, Flujo Total, Factor Descuento y Valor Presente
+        prices: Resultado escalar de price_bonds
+    """
+    prices = price_bonds(
+        face_value, coupon_rate, maturity, settlement, required_yield, payment_freq, day_count, use_tea
+    )
+    prices = {key: value[()] for key, value in prices.items()}
+    m = PAYMENT_FREQUENCIES[payment_freq]
+    dates = coupon_dates(settlement, maturity, payment_freq)
+    periods = prices['periods_to_next'] + np.arange(dates.size)
+    i = periodic_rate(required_yield / 100, m, 'TEA' if use_tea else 'TNA')
+    coupons = np.full(dates.size, face_value * coupon_rate / 100 / m)
+    principal = np.zeros(dates.size)
+    principal[-1] = face_value
+    factors = (1 + i) ** -periods
+    df = pd.DataFrame({
+        'Fecha': pd.to_datetime(dates),
+        'Periodos': periods,
+        'Cupón': coupons,
+        'Principal': principal,
+        'Flujo Total': coupons + principal,
+        'Factor Descuento': factors,
+        'Valor Presente': (coupons + principal) * factors
+    })
+    return df, prices
@@ -0,0 +1,183 @@
+"""
+Backends de modelos de lenguaje para el chatbot financiero.
+
+Todos los backends exponen la misma interfaz de streaming (`stream`), de modo
+que la UI puede renderizar la respuesta de forma incremental sin saber si el
+texto viene de Groq o del backend local determinista usado en pruebas.
+"""
+
+import hashlib
+import time
+
+DEFAULT_MODEL = "llama-3.1-8b-instant"
+
+
+def estimate_tokens(text):
+    """Estimación rápida de tokens (~4 caracteres por token en español)."""
+    if not text:
+        return 0
+    return max(1, round(len(text) / 4))
+
+
+class LLMBackend:
+    """Interfaz base: `stream` produce fragmentos de texto de la respuesta."""
+
+    name = "base"
+
+    def stream(self, messages, temperature=0.2, max_tokens=700):
+        raise NotImplementedError
+
+    def complete(self, messages, temperature=0.2, max_tokens=700):
+        """Respuesta completa (no incremental) construida a partir del stream."""
+        return "".join(self.stream(messages, temperature=temperature, max_tokens=max_tokens))
+
+
+class GroqBackend(LLMBackend):
+    """Backend remoto sobre la API de Groq con `stream=True`."""
+
+    name = "groq"
+
+    def __init__(self, api_key=None, model=DEFAULT_MODEL, client=None):
+        if client is None:
+            from groq import Groq
+            client = Groq(api_key=api_key)
+        self.client = client
+        self.model = model
+
+    def stream(self, messages, temperature=0.2, max_tokens=700):
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+
+class LocalBackend(LLMBackend):
+    """
+    Backend local determinista para pruebas y desarrollo sin red.
+
+    La misma conversación produce siempre la misma respuesta, emitida palabra
+    por palabra para ejercitar el mismo camino de streaming que Groq.
+    """
+
+    name = "local"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def stream(self, messages, temperature=0.2, max_tokens=700):
+        question = next(
+            (m["content"] for m in reversed(messages) if m["role"] == "user"), ""
+        )
+        digest = hashlib.sha256(question.encode("utf-8")).hexdigest()[:8]
+        reply = (
+            f"1. Definición técnica: respuesta local [{digest}] a «{question.strip()}».\n"
+            "2. Relación relevante: $VP = \\sum_t F_t / (1 + r)^t$.\n"
+            "3. Interpretación cuantitativa: backend determinista sin conexión.\n"
+            "4. Conclusión: use el backend Groq para respuestas reales."
+        )
+        words = reply.split(" ")
+        budget = max(1, max_tokens)
+        for i, word in enumerate(words):
+            if estimate_tokens(" ".join(words[:i + 1])) > budget:
+                break
+            if self.delay:
+                time.sleep(self.delay)
+            yield word if i == 0 else " " + word
+
+
+class StreamMetrics:
+    """Métricas de una solicitud: tiempo al primer token y tokens/segundo."""
+
+    def __init__(self, backend=""):
+        self.backend = backend
+        self.started_at = None
+        self.first_token_at = None
+        self.finished_at = None
+        self.chunks = 0
+        self.text_length = 0
+        self.completion_tokens = 0
+
+    @property
+    def ttft(self):
+        """Segundos entre el envío de la solicitud y el primer fragmento."""
+        if self.started_at is None or self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+    @property
+    def total_time(self):
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def tokens_per_second(self):
+        """Tokens generados por segundo desde el primer token."""
+        if self.first_token_at is None or self.finished_at is None:
+            return None
+        elapsed = self.finished_at - self.first_token_at
+        if elapsed <= 0:
+            return None
+        return self.completion_tokens / elapsed
+
+    def as_dict(self):
+        return {
+            "backend": self.backend,
+            "ttft_s": self.ttft,
+            "total_s": self.total_time,
+            "completion_tokens": self.completion_tokens,
+            "tokens_per_s": self.tokens_per_second,
+            "chunks": self.chunks
+        }
+
+
+def stream_with_metrics(backend, messages, metrics=None, **kwargs):
+    """
+    Envuelve `backend.stream` registrando TTFT y tokens/segundo en `metrics`.
+
+    Args:
+        backend: Instancia de LLMBackend
+        messages: Lista de mensajes en formato OpenAI/Groq
+        metrics: StreamMetrics a completar (se crea uno si es None)
+        **kwargs: temperature, max_tokens
+
+    Yields:
+        Fragmentos de texto en el orden en que llegan del backend
+    """
+    if metrics is None:
+        metrics = StreamMetrics(backend.name)
+    metrics.backend = backend.name
+    metrics.started_at = time.perf_counter()
+    parts = []
+    try:
+        for piece in backend.stream(messages, **kwargs):
+            if metrics.first_token_at is None:
+                metrics.first_token_at = time.perf_counter()
+            metrics.chunks += 1
+            parts.append(piece)
+            yield piece
+    finally:
+        metrics.finished_at = time.perf_counter()
+        text = "".join(parts)
+        metrics.text_length = len(text)
+        metrics.completion_tokens = estimate_tokens(text)
+
+
+def get_backend(name="groq", api_key=None, **kwargs):
+    """Fábrica de backends por nombre ('groq' o 'local')."""
+    if name == "groq":
+        if not api_key:
+            raise ValueError("Se requiere GROQ_API_KEY para el backend 'groq'.")
+        return GroqBackend(api_key=api_key, **kwargs)
+    if name == "local":
+        return LocalBackend(**kwargs)
+    raise ValueError(f"Backend no válido: {name}. Opciones: ['groq', 'local']")
@@ -0,0 +1,180 @@
+"""
+Gestor de recursos LLM compartido por todo el proceso.
+
+Streamlit vuelve a ejecutar el script en cada interacción; crear un cliente
+Groq por rerun repite la configuración y pierde las conexiones HTTP abiertas.
+Este módulo mantiene un único cliente HTTP con keep-alive, reutiliza los
+backends y limita la concurrencia con una cola acotada (backpressure).
+"""
+
+import hashlib
+import threading
+from contextlib import contextmanager
+
+from .llm_backends import LLMBackend, GroqBackend, LocalBackend, DEFAULT_MODEL
+
+
+class LLMBusyError(RuntimeError):
+    """El servicio LLM está saturado: la cola de espera está llena o expiró."""
+
+
+class PooledBackend(LLMBackend):
+    """Backend que ocupa un cupo del gestor durante todo el streaming."""
+
+    def __init__(self, manager, backend):
+        self.manager = manager
+        self.backend = backend
+        self.name = backend.name
+
+    def stream(self, messages, temperature=0.2, max_tokens=700):
+        with self.manager.slot():
+            yield from self.backend.stream(
+                messages, temperature=temperature, max_tokens=max_tokens
+            )
+
+
+class LLMResourceManager:
+    """
+    Pool de conexiones y control de admisión para las llamadas al LLM.
+
+    Args:
+        max_concurrency: Solicitudes simultáneas permitidas contra el proveedor
+        max_queue: Solicitudes que pueden esperar cupo; por encima se rechazan
+        queue_timeout: Segundos máximos de espera por un cupo
+        max_connections: Conexiones HTTP totales del pool
+        max_keepalive: Conexiones ociosas que se mantienen abiertas
+        keepalive_expiry: Segundos que una conexión ociosa permanece abierta
+    """
+
+    def __init__(
+        self,
+        max_concurrency=4,
+        max_queue=16,
+        queue_timeout=30.0,
+        max_connections=20,
+        max_keepalive=10,
+        keepalive_expiry=30.0
+    ):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency debe ser mayor a cero.")
+        if max_queue < 0:
+            raise ValueError("max_queue no puede ser negativo.")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._http_client = None
+        self._backends = {}
+        self._active = 0
+        self._waiting = 0
+        self._completed = 0
+        self._rejected = 0
+
+    @property
+    def http_client(self):
+        """Cliente httpx compartido con keep-alive (se crea bajo demanda)."""
+        with self._lock:
+            if self._http_client is None:
+                import httpx
+                self._http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive,
+                        keepalive_expiry=self.keepalive_expiry
+                    ),
+                    timeout=httpx.Timeout(60.0, connect=10.0)
+                )
+            return self._http_client
+
+    def get_backend(self, name="groq", api_key=None, model=DEFAULT_MODEL):
+        """
+        Devuelve el backend compartido para (name, api_key, model).
+
+        El backend se construye una sola vez por proceso y se envuelve en un
+        PooledBackend para que cada stream respete el límite de concurrencia.
+        """
+        key_hash = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()
+        cache_key = (name, key_hash, model)
+        with self._lock:
+            backend = self._backends.get(cache_key)
+        if backend is not None:
+            return backend
+
+        if name == "groq":
+            if not api_key:
+                raise ValueError("Se requiere GROQ_API_KEY para el backend 'groq'.")
+            from groq import Groq
+            client = Groq(api_key=api_key, http_client=self.http_client)
+            inner = GroqBackend(client=client, model=model)
+        elif name == "local":
+            inner = LocalBackend()
+        else:
+            raise ValueError(f"Backend no válido: {name}. Opciones: ['groq', 'local']")
+
+        with self._lock:
+            backend = self._backends.setdefault(cache_key, PooledBackend(self, inner))
+        return backend
+
+    @contextmanager
+    def slot(self):
+        """Ocupa un cupo de concurrencia, esperando en la cola acotada si hace falta."""
+        with self._lock:
+            if self._waiting >= self.max_queue and self._active >= self.max_concurrency:
+                self._rejected += 1
+                raise LLMBusyError("Servicio saturado: demasiadas consultas en espera.")
+            self._waiting += 1
+        acquired = self._semaphore.acquire(timeout=self.queue_timeout)
+        with self._lock:
+            self._waiting -= 1
+            if not acquired:
+                self._rejected += 1
+            else:
+                self._active += 1
+        if not acquired:
+            raise LLMBusyError("Tiempo de espera agotado en la cola de consultas.")
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+            self._semaphore.release()
+
+    def stats(self):
+        """Estado actual del gestor (para diagnóstico)."""
+        with self._lock:
+            return {
+                "active": self._active,
+                "waiting": self._waiting,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "backends": len(self._backends),
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue
+            }
+
+    def close(self):
+        """Cierra el cliente HTTP compartido y descarta los backends."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+            self._backends.clear()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_resource_manager(**kwargs):
+    """Gestor único del proceso; los kwargs solo aplican en la primera llamada."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = LLMResourceManager(**kwargs)
+        return _manager
@@ -0,0 +1,204 @@
+"""
+Amortización de préstamos (sistemas francés, alemán y americano).
+
+Los calendarios de muchos préstamos se generan a la vez: el estado es un
+vector de saldos (uno por préstamo) y cada periodo se calcula con
+operaciones vectorizadas, por lo que el único bucle en Python es el del
+tiempo. La cuota francesa usa el mismo núcleo de anualidad que la pensión
+(`annuity_payment`), recalculada sobre el saldo y los periodos restantes;
+sin prepagos coincide con la cuota constante y con prepagos la reduce
+manteniendo el plazo.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .finance_engine import PAYMENT_FREQUENCIES, annuity_payment
+from .money import apply_rate, divide_cents, from_cents, to_cents
+from .profiling import timed
+from .utils import category_codes, periodic_rate
+
+LOAN_METHODS = {'Francés': 0, 'Alemán': 1, 'Americano': 2}
+GRACE_TYPES = {'Parcial': 0, 'Total': 1}
+
+SCHEDULE_COLUMNS = {
+    'balance_start': 'Saldo_Inicial',
+    'interest': 'Interes',
+    'principal': 'Amortizacion',
+    'prepayment': 'Prepago',
+    'payment': 'Cuota',
+    'balance_end': 'Saldo_Final'
+}
+
+
+@timed("engine.loan_schedules")
+def amortization_schedules(
+    principal,
+    tea,
+    years,
+    payment_freq='Mensual',
+    method='Francés',
+    grace_periods=0,
+    grace_type='Parcial',
+    prepayments=None,
+    keep_schedules=True,
+    exact=False
+):
+    """
+    Calendarios de amortización de una cartera de préstamos.
+
+    Args:
+        principal: Monto de cada préstamo (escalar o array)
+        tea: Tasa efectiva anual (%) de cada préstamo
+        years: Plazo en años de cada préstamo
+        payment_freq: Frecuencia de cuotas (PAYMENT_FREQUENCIES), una para todos
+        method: 'Francés', 'Alemán' o 'Americano' (escalar o uno por préstamo)
+        grace_periods: Periodos de gracia al inicio (incluidos en el plazo)
+        grace_type: 'Parcial' (se pagan intereses) o 'Total' (se capitalizan)
+        prepayments: Prepagos de capital: dict {periodo: monto} común a todos
+            o array (préstamos, periodos); el periodo se cuenta desde 1
+        keep_schedules: Si False, solo se devuelven los totales
+        exact: Si True, el saldo y cada asiento se llevan en centavos int64
+            (src.money): el interés y la cuota se redondean a centavos en cada
+            periodo (mitad al par), la última cuota liquida el saldo exacto y
+            los montos del resultado quedan en centavos
+
+    Returns:
+        Diccionario con arrays (préstamos, periodos) balance_start, interest,
+        principal, prepayment, payment, balance_end (si keep_schedules),
+        arrays por préstamo n_periods, total_interest, total_paid y el
+        indicador exact
+    """
+    principal, tea, years, grace = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (principal, tea, years, grace_periods))
+    )
+    n_loans = principal.size
+    m = PAYMENT_FREQUENCIES[payment_freq]
+    n_periods = np.floor(years * m).astype(int)
+    grace = grace.astype(int)
+    if (n_periods <= 0).any():
+        raise ValueError("El plazo de cada préstamo debe generar al menos un periodo de pago.")
+    if (grace < 0).any() or (grace >= n_periods).any():
+        raise ValueError("Los periodos de gracia deben ser menores que el número de cuotas.")
+    methods = category_codes(method, LOAN_METHODS, "Sistema de amortización", n_loans)
+    total_grace = category_codes(grace_type, GRACE_TYPES, "Tipo de gracia", n_loans) == GRACE_TYPES['Total']
+    rate = periodic_rate(tea / 100, m)
+
+    horizon = int(n_periods.max())
+    if prepayments is None:
+        extra = None
+    elif isinstance(prepayments, dict):
+        extra = np.zeros(horizon)
+        for period, amount in prepayments.items():
+            if 1 <= period <= horizon:
+                extra[period - 1] = amount
+    else:
+        extra = np.asarray(prepayments, dtype=float)
+        if extra.shape != (n_loans, horizon):
+            raise ValueError(f"Los prepagos deben tener forma ({n_loans}, {horizon}).")
+
+    dtype = np.int64 if exact else float
+    columns = {}
+    if keep_schedules:
+        columns = {key: np.zeros((n_loans, horizon), dtype=dtype) for key in SCHEDULE_COLUMNS}
+    balance = to_cents(principal) if exact else principal.copy()
+    total_interest = np.zeros(n_loans, dtype=dtype)
+    total_paid = np.zeros(n_loans, dtype=dtype)
+    french, german = methods == LOAN_METHODS['Francés'], methods == LOAN_METHODS['Alemán']
+
+    for t in range(horizon):
+        active = t < n_periods
+        remaining = n_periods - t
+        if exact:
+            # Cada asiento se redondea a centavos una sola vez
+            interest = apply_rate(balance, rate)
+            french_amortization = to_cents(annuity_payment(from_cents(balance), rate, remaining)) - interest
+            german_amortization = divide_cents(balance, np.maximum(remaining, 1))
+        else:
+            interest = balance * rate
+            french_amortization = annuity_payment(balance, rate, remaining) - interest
+            german_amortization = balance / np.maximum(remaining, 1)
+
+        amortization = np.where(
+            french, french_amortization,
+            np.where(german, german_amortization, np.where(remaining == 1, balance, 0))
+        )
+        if exact:
+            # La última cuota liquida el saldo exacto: el calendario cuadra al centavo
+            amortization = np.where(remaining == 1, balance, amortization)
+        in_grace = t < grace
+        # Gracia parcial: solo intereses; total: los intereses se suman al saldo
+        # (amortización negativa)
+        amortization = np.where(in_grace, np.where(total_grace, -interest, 0), amortization)
+        amortization = np.where(active, amortization, 0)
+        interest = np.where(active, interest, 0)
+        payment = interest + amortization
+
+        if extra is None:
+            prepayment = 0
+        else:
+            wanted = extra[t] if extra.ndim == 1 else extra[:, t]
+            if exact:
+                wanted = to_cents(wanted)
+            prepayment = np.where(active & ~in_grace, np.clip(wanted, 0, balance - amortization), 0)
+
+        if keep_schedules:
+            columns['balance_start'][:, t] = balance
+            columns['interest'][:, t] = interest
+            columns['principal'][:, t] = amortization
+            columns['prepayment'][:, t] = prepayment
+            columns['payment'][:, t] = payment + prepayment
+        balance = balance - amortization - prepayment
+        # Evita residuos de redondeo al cierre
+        balance = np.where(active & (remaining == 1), 0, balance)
+        if keep_schedules:
+            columns['balance_end'][:, t] = balance
+        # Con gracia total el interés capitalizado se paga luego vía amortización
+        total_interest += interest
+        total_paid += payment + prepayment
+
+    return {
+        **columns,
+        'n_periods': n_periods,
+        'total_interest': total_interest,
+        'total_paid': total_paid,
+        'exact': exact
+    }
+
+
+def schedule_frame(result, loan=0):
+    """DataFrame del calendario de un préstamo a partir del resultado columnar (en unidades monetarias)."""
+    n = int(result['n_periods'][loan])
+    convert = from_cents if result.get('exact') else np.asarray
+    df = pd.DataFrame({label: convert(result[key][loan, :n]) for key, label in SCHEDULE_COLUMNS.items()})
+    df.insert(0, 'Periodo', np.arange(1, n + 1))
+    return df
+
+
+@timed("engine.loan_schedule")
+def calculate_loan_schedule(
+    principal,
+    tea,
+    years,
+    payment_freq='Mensual',
+    method='Francés',
+    grace_periods=0,
+    grace_type='Parcial',
+    prepayments=None,
+    exact=False
+):
+    """
+    Calendario de un solo préstamo (exact: ver amortization_schedules).
+
+    Returns:
+        df: DataFrame con Periodo, Saldo_Inicial, Interes, Amortizacion, Prepago,
+            Cuota, Saldo_Final
+        total_interest: Intereses totales pagados
+    """
+    if isinstance(prepayments, (list, tuple, np.ndarray)):
+        prepayments = np.asarray(prepayments, dtype=float)[None, :]
+    result = amortization_schedules(
+        principal, tea, years, payment_freq, method, grace_periods, grace_type, prepayments, exact=exact
+    )
+    total_interest = result['total_interest'][0]
+    return schedule_frame(result), float(from_cents(total_interest) if exact else total_interest)
@@ -0,0 +1,154 @@
+"""
+Modo de dinero exacto: montos como arrays int64 de centavos.
+
+Los motores trabajan en float; para conciliar estados de cuenta al centavo se
+contabiliza en centavos enteros y se redondea de forma explícita una sola vez
+en cada paso de contabilización:
+
+    to_cents       monto en float -> centavos
+    apply_rate     centavos × tasa (interés, factor de descuento) -> centavos
+    divide_cents   centavos / entero (cuotas iguales) -> centavos
+    allocate_cents reparto de un total en partes que suman exactamente el total
+
+El redondeo se hace sobre el valor binario exacto del producto x · escala
+(producto sin error de Dekker: p + e con p = fl(x · escala)), no sobre el
+producto ya redondeado en float. Así el resultado es el mismo que daría
+Decimal, pero vectorizado y sin objetos por elemento; con 'half_even',
+round_decimal(x, 2) coincide con round(x, 2) de Python elemento a elemento.
+
+Modos de redondeo (ROUNDING_MODES):
+    'half_even'  mitad al par más cercano (bancario, como round de Python)
+    'half_up'    mitad alejándose de cero (comercial)
+    'down'       truncar hacia cero
+
+Las sumas de centavos son exactas mientras |total| < 2**53 centavos.
+"""
+
+import numpy as np
+
+CENTS = 100
+ROUNDING_MODES = ('half_even', 'half_up', 'down')
+
+_SPLITTER = 134217729.0  # 2**27 + 1
+
+
+def _split(a):
+    c = _SPLITTER * a
+    high = c - (c - a)
+    return high, a - high
+
+
+def _two_product(a, b):
+    """a · b = p + e exactamente (p = fl(a · b)), para |a · b| lejos del desborde."""
+    p = a * b
+    a_high, a_low = _split(a)
+    b_high, b_low = _split(b)
+    e = ((a_high * b_high - p) + a_high * b_low + a_low * b_high) + a_low * b_low
+    return p, e
+
+
+def _check_mode(mode):
+    if mode not in ROUNDING_MODES:
+        raise ValueError(f"Modo de redondeo no válido: {mode}. Opciones: {list(ROUNDING_MODES)}")
+
+
+def _round_exact(p, e, mode):
+    """
+    Redondea a entero el valor exacto p + e (|e| <= ulp(p) / 2).
+
+    Como p y e no se pueden sumar sin perder e, se decide con la parte
+    fraccionaria de p (exacta) y, solo en los empates o enteros exactos de
+    p, con el signo de e.
+    """
+    _check_mode(mode)
+    n = np.floor(p)
+    frac = p - n
+    if mode == 'down':
+        below_integer = (frac == 0) & (e < 0)
+        above_integer = (frac > 0) | (e > 0)
+        return np.where(p >= 0, n - below_integer, n + above_integer)
+    above = (frac > 0.5) | ((frac == 0.5) & (e > 0))
+    tie = (frac == 0.5) & (e == 0)
+    if mode == 'half_even':
+        return n + above + (tie & (np.fmod(n, 2) != 0))
+    return n + above + (tie & (n >= 0))
+
+
+def round_decimal(values, decimals=2, mode='half_even'):
+    """
+    Redondeo decimal vectorizado del valor binario exacto de cada elemento.
+
+    Con mode='half_even' es idéntico a aplicar round(x, decimals) a cada
+    elemento. NaN e infinitos se devuelven sin cambios.
+    """
+    values = np.asarray(values, dtype=float)
+    scale = 10.0 ** decimals
+    with np.errstate(invalid='ignore'):
+        rounded = _round_exact(*_two_product(values, scale), mode) / scale
+    return np.where(np.isfinite(values), rounded, values)
+
+
+def _check_finite(values):
+    if not np.all(np.isfinite(values)):
+        raise ValueError("Los montos y tasas deben ser finitos para contabilizarlos en centavos.")
+    return values
+
+
+def to_cents(amounts, mode='half_even'):
+    """Montos en unidades monetarias (float) -> int64 de centavos."""
+    amounts = _check_finite(np.asarray(amounts, dtype=float))
+    return _round_exact(*_two_product(amounts, float(CENTS)), mode).astype(np.int64)
+
+
+def from_cents(cents):
+    """int64 de centavos -> float (el double más cercano a cada monto decimal)."""
+    return np.asarray(cents) / CENTS
+
+
+def apply_rate(cents, rate, mode='half_even'):
+    """
+    Centavos × tasa redondeado a centavos (p. ej. interés o valor presente).
+
+    El producto se redondea sobre su valor exacto, así que el resultado no
+    depende del error de redondeo del float.
+    """
+    cents = np.asarray(cents, dtype=np.int64).astype(float)
+    rate = _check_finite(np.asarray(rate, dtype=float))
+    return _round_exact(*_two_product(cents, rate), mode).astype(np.int64)
+
+
+def divide_cents(cents, divisor, mode='half_even'):
+    """Centavos / divisor entero positivo, redondeado con aritmética entera exacta."""
+    _check_mode(mode)
+    cents = np.asarray(cents, dtype=np.int64)
+    divisor = np.asarray(divisor, dtype=np.int64)
+    if np.any(divisor <= 0):
+        raise ValueError("El divisor debe ser un entero positivo.")
+    sign = np.where(cents < 0, -1, 1)
+    quotient, remainder = np.divmod(np.abs(cents), divisor)
+    if mode == 'down':
+        return sign * quotient
+    twice = 2 * remainder
+    tie = twice == divisor
+    if mode == 'half_even':
+        tie &= quotient % 2 == 1
+    return sign * (quotient + ((twice > divisor) | tie))
+
+
+def allocate_cents(total, weights):
+    """
+    Reparte `total` centavos en proporción a `weights` (último eje).
+
+    Método del mayor residuo: cada parte recibe el piso de su cuota y los
+    centavos sobrantes van a las partes con mayor residuo (empates a la
+    primera), de modo que las partes suman exactamente el total.
+    """
+    total = np.asarray(total, dtype=np.int64)
+    weights = np.asarray(weights, dtype=float)
+    raw = total[..., None] * (weights / weights.sum(axis=-1, keepdims=True))
+    base = np.floor(raw).astype(np.int64)
+    short = np.clip(total - base.sum(axis=-1), 0, weights.shape[-1])
+    order = np.argsort(base - raw, axis=-1, kind='stable')
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.broadcast_to(np.arange(weights.shape[-1]), order.shape), axis=-1)
+    return base + (rank < short[..., None])
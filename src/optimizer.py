@@ -0,0 +1,203 @@
+"""
+Frontera eficiente media–varianza con pesos no negativos (sin ventas en corto).
+
+Cada punto de la frontera es un problema cuadrático
+    min w'Σw  s.a.  μ'w = objetivo, 1'w = 1, w >= 0
+que se resuelve con un método de conjunto activo. Con el conjunto activo fijo,
+el sistema KKT no depende del objetivo, por lo que entre puntos adyacentes se
+reutiliza la solución anterior como punto de partida (warm start): casi siempre
+basta una sola resolución lineal por punto.
+
+Las entradas están en decimales: retornos esperados anuales (0.07 = 7%) y
+matriz de covarianzas anual.
+"""
+
+import numpy as np
+
+from .profiling import timed
+
+_TOL = 1e-10
+
+
+def _solve_kkt(Q, A, b, free):
+    """Minimiza ½w'Qw s.a. Aw = b con w_i = 0 fuera de `free`; devuelve (w, ν)."""
+    n_free = free.size
+    Qf = Q[np.ix_(free, free)]
+    Af = A[:, free]
+    k = A.shape[0]
+    kkt = np.zeros((n_free + k, n_free + k))
+    kkt[:n_free, :n_free] = Qf
+    kkt[:n_free, n_free:] = -Af.T
+    kkt[n_free:, :n_free] = Af
+    rhs = np.concatenate([np.zeros(n_free), b])
+    try:
+        solution = np.linalg.solve(kkt, rhs)
+    except np.linalg.LinAlgError:
+        # Restricciones redundantes (p. ej. todos los activos libres con igual retorno)
+        solution = np.linalg.lstsq(kkt, rhs, rcond=None)[0]
+    w = np.zeros(Q.shape[0])
+    w[free] = solution[:n_free]
+    return w, solution[n_free:]
+
+
+def _active_set_qp(Q, A, b, w0, max_iter=500):
+    """
+    Método primal de conjunto activo para min ½w'Qw s.a. Aw = b, w >= 0.
+
+    Args:
+        Q: Matriz (n, n) semidefinida positiva
+        A: Restricciones de igualdad (k, n)
+        b: Lado derecho (k,)
+        w0: Punto factible inicial; sus ceros forman el conjunto activo inicial
+
+    Returns:
+        (w, iteraciones)
+    """
+    w = np.array(w0, dtype=float)
+    fixed = w <= _TOL
+    for iteration in range(1, max_iter + 1):
+        free = np.flatnonzero(~fixed)
+        candidate, nu = _solve_kkt(Q, A, b, free)
+        step = candidate - w
+        if np.abs(step).max() <= 1e-12:
+            # Multiplicadores de las cotas activas: gradiente menos la parte de las igualdades
+            multipliers = Q @ w - A.T @ nu
+            bound = np.flatnonzero(fixed)
+            if bound.size == 0 or multipliers[bound].min() >= -1e-12:
+                return w, iteration
+            fixed[bound[np.argmin(multipliers[bound])]] = False
+            continue
+        # Paso más largo que mantiene w >= 0
+        shrinking = np.flatnonzero(~fixed & (step < 0))
+        alpha, blocking = 1.0, None
+        if shrinking.size:
+            ratios = -w[shrinking] / step[shrinking]
+            j = np.argmin(ratios)
+            if ratios[j] < 1.0:
+                alpha, blocking = ratios[j], shrinking[j]
+        w = w + alpha * step
+        if blocking is not None:
+            w[blocking] = 0.0
+            fixed[blocking] = True
+    raise RuntimeError("El optimizador no convergió.")
+
+
+def _check_inputs(expected_returns, covariance):
+    mu = np.asarray(expected_returns, dtype=float)
+    cov = np.asarray(covariance, dtype=float)
+    if mu.ndim != 1 or cov.shape != (mu.size, mu.size):
+        raise ValueError("La covarianza debe ser una matriz n × n para n retornos esperados.")
+    if not np.allclose(cov, cov.T):
+        raise ValueError("La matriz de covarianzas debe ser simétrica.")
+    # Con autovalores negativos habría carteras de varianza negativa
+    if np.linalg.eigvalsh(cov).min() < -_TOL * max(float(np.abs(cov).max()), 1.0):
+        raise ValueError(
+            "La matriz de covarianzas no es semidefinida positiva "
+            "(revisa las correlaciones: con n activos la correlación común debe ser al menos -1/(n-1))."
+        )
+    return mu, cov
+
+
+def covariance_from_volatility(volatilities, correlation):
+    """Σ = D R D a partir de volatilidades (decimal) y matriz o valor de correlación."""
+    vol = np.asarray(volatilities, dtype=float)
+    corr = np.asarray(correlation, dtype=float)
+    if corr.ndim == 0:
+        corr = np.full((vol.size, vol.size), float(corr))
+        np.fill_diagonal(corr, 1.0)
+    return corr * np.outer(vol, vol)
+
+
+def _portfolio(weights, mu, cov, risk_free=0.0):
+    ret = float(weights @ mu)
+    vol = float(np.sqrt(max(weights @ cov @ weights, 0.0)))
+    return {
+        'weights': weights,
+        'return': ret,
+        'volatility': vol,
+        'sharpe': (ret - risk_free) / vol if vol > 0 else np.nan
+    }
+
+
+@timed("optimizer.min_variance")
+def min_variance_portfolio(expected_returns, covariance):
+    """Cartera de mínima varianza (pesos >= 0 que suman 1)."""
+    mu, cov = _check_inputs(expected_returns, covariance)
+    n = mu.size
+    w, _ = _active_set_qp(cov, np.ones((1, n)), np.array([1.0]), np.full(n, 1 / n))
+    return _portfolio(w, mu, cov)
+
+
+@timed("optimizer.max_sharpe")
+def max_sharpe_portfolio(expected_returns, covariance, risk_free=0.0):
+    """
+    Cartera de máximo ratio de Sharpe (pesos >= 0 que suman 1).
+
+    Se resuelve min y'Σy s.a. (μ - rf)'y = 1, y >= 0 y se normaliza w = y / Σy.
+    """
+    mu, cov = _check_inputs(expected_returns, covariance)
+    excess = mu - risk_free
+    best = int(np.argmax(excess))
+    if excess[best] <= 0:
+        raise ValueError("Ningún activo tiene retorno esperado mayor a la tasa libre de riesgo.")
+    y0 = np.zeros(mu.size)
+    y0[best] = 1 / excess[best]
+    y, _ = _active_set_qp(cov, excess[None, :], np.array([1.0]), y0)
+    return _portfolio(y / y.sum(), mu, cov, risk_free)
+
+
+@timed("optimizer.efficient_frontier")
+def efficient_frontier(expected_returns, covariance, n_points=50, risk_free=0.0):
+    """
+    Frontera eficiente de `n_points` carteras, desde la de mínima varianza
+    hasta la de mayor retorno esperado.
+
+    Cada punto parte de la solución anterior desplazada hacia el activo de
+    mayor retorno lo justo para alcanzar el nuevo objetivo, lo que da un punto
+    factible con casi el mismo conjunto activo.
+
+    Returns:
+        Diccionario con returns (N,), volatilities (N,), sharpe (N,),
+        weights (N, activos), iterations (N,), min_variance y max_sharpe
+    """
+    mu, cov = _check_inputs(expected_returns, covariance)
+    n = mu.size
+    A = np.vstack([mu, np.ones(n)])
+
+    min_var = min_variance_portfolio(mu, cov)
+    top = int(np.argmax(mu))
+    targets = np.linspace(min_var['return'], mu[top], n_points)
+
+    weights = np.empty((n_points, n))
+    iterations = np.zeros(n_points, dtype=int)
+    w = min_var['weights']
+    weights[0] = w
+    for k in range(1, n_points):
+        current = w @ mu
+        theta = (targets[k] - current) / (mu[top] - current) if mu[top] > current else 1.0
+        start = (1 - theta) * w
+        start[top] += theta
+        w, iterations[k] = _active_set_qp(cov, A, np.array([targets[k], 1.0]), start)
+        weights[k] = w
+
+    # Varianza de todos los puntos en una sola contracción
+    variances = np.einsum('ki,ij,kj->k', weights, cov, weights)
+    volatilities = np.sqrt(np.maximum(variances, 0.0))
+    returns = weights @ mu
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(volatilities > 0, (returns - risk_free) / volatilities, np.nan)
+    max_sharpe = max_sharpe_portfolio(mu, cov, risk_free) if (mu > risk_free).any() else None
+    return {
+        'returns': returns,
+        'volatilities': volatilities,
+        'sharpe': sharpe,
+        'weights': weights,
+        'iterations': iterations,
+        'min_variance': min_var,
+        'max_sharpe': max_sharpe
+    }
+
+
+def portfolio_tea(weights, expected_returns):
+    """TEA esperada (%) de una cartera, para usarla en el simulador de crecimiento."""
+    return float(np.asarray(weights, dtype=float) @ np.asarray(expected_returns, dtype=float) * 100)
@@ -0,0 +1,182 @@
+"""
+Instrumentación ligera de tiempos por etapa.
+
+Cada rerun de Streamlit puede activar un Profiler; los spans (`span`) y las
+funciones decoradas (`timed`) registran tiempo de pared, número de llamadas y
+variación de memoria en el profiler activo. Sin profiler activo, los spans no
+hacen nada más que una consulta a una variable de contexto.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger("simulador.profiling")
+
+_active = contextvars.ContextVar("simulador_profiler", default=None)
+
+# tracemalloc es global al proceso: los profilers que miden memoria lo
+# comparten y solo el último en terminar lo detiene (si lo inició este módulo)
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+def _acquire_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_owned = True
+        _tracing_users += 1
+
+
+def _release_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+class StageStats:
+    """Acumulado de una etapa dentro de un rerun."""
+
+    __slots__ = ("name", "calls", "total_s", "max_s", "mem_delta_bytes")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.mem_delta_bytes = 0
+
+    def as_dict(self):
+        return {
+            "stage": self.name,
+            "calls": self.calls,
+            "total_ms": round(self.total_s * 1000, 3),
+            "max_ms": round(self.max_s * 1000, 3),
+            "mem_delta_kib": round(self.mem_delta_bytes / 1024, 1)
+        }
+
+
+class Profiler:
+    """
+    Colector de spans de un rerun.
+
+    Args:
+        label: Identificador del rerun (p. ej. página activa)
+        track_memory: Si True, usa tracemalloc para medir variación de memoria
+    """
+
+    def __init__(self, label="", track_memory=False):
+        self.label = label
+        self.track_memory = track_memory
+        self.stages = {}
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+        if track_memory:
+            _acquire_tracing()
+
+    def record(self, name, elapsed, mem_delta=0):
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name)
+        stats.calls += 1
+        stats.total_s += elapsed
+        stats.max_s = max(stats.max_s, elapsed)
+        stats.mem_delta_bytes += mem_delta
+
+    def finish(self):
+        if self.finished_at is None:
+            self.finished_at = time.perf_counter()
+            if self.track_memory:
+                _release_tracing()
+        return self
+
+    @property
+    def wall_s(self):
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    def to_records(self):
+        """Etapas ordenadas por tiempo total descendente."""
+        return [
+            s.as_dict()
+            for s in sorted(self.stages.values(), key=lambda s: s.total_s, reverse=True)
+        ]
+
+    def as_dict(self):
+        return {
+            "label": self.label,
+            "wall_ms": round(self.wall_s * 1000, 3),
+            "stages": self.to_records()
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), ensure_ascii=False)
+
+
+def start_profiler(label="", track_memory=False):
+    """Activa un Profiler nuevo en el contexto actual y lo devuelve."""
+    previous = _active.get()
+    if previous is not None:
+        # Rerun interrumpido (st.rerun, excepción): se cierra el anterior
+        previous.finish()
+    profiler = Profiler(label=label, track_memory=track_memory)
+    _active.set(profiler)
+    return profiler
+
+
+def stop_profiler():
+    """Cierra el profiler activo, emite un log estructurado y lo devuelve."""
+    profiler = _active.get()
+    if profiler is None:
+        return None
+    _active.set(None)
+    profiler.finish()
+    logger.info(profiler.to_json())
+    return profiler
+
+
+def get_profiler():
+    return _active.get()
+
+
+@contextmanager
+def span(name):
+    """Mide el bloque como etapa `name` del profiler activo (si lo hay)."""
+    profiler = _active.get()
+    if profiler is None:
+        yield
+        return
+    mem_before = tracemalloc.get_traced_memory()[0] if profiler.track_memory else 0
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        mem_delta = (tracemalloc.get_traced_memory()[0] - mem_before) if profiler.track_memory else 0
+        profiler.record(name, elapsed, mem_delta)
+
+
+def timed(name=None):
+    """Decorador: registra cada llamada de la función como etapa `name`."""
+    def decorator(func):
+        stage = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active.get() is None:
+                return func(*args, **kwargs)
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,255 @@
+"""
+Evaluación de proyectos de inversión: VAN, TIR, TIRM, payback e índice de rentabilidad.
+
+Los flujos se reciben como matriz proyectos × periodos (columna 0 = inversión
+inicial, en t = 0). El VAN de todos los proyectos es un producto
+matriz-vector con el vector de factores de descuento. La TIR se busca en la
+variable v = 1 / (1 + r), donde el VAN es un polinomio: primero se ubican los
+cambios de signo en una grilla común (un producto de matrices) y luego se
+refinan todos los proyectos a la vez con Newton protegido por bisección.
+Con varios cambios de signo en los flujos puede haber varias TIR; se devuelve
+la más cercana a `guess` y se informa cuántas se encontraron.
+
+Todas las tasas se expresan en % por periodo.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .profiling import timed
+from .utils import discount_factors
+
+# Grilla de búsqueda de la TIR: de -99% a 10 000% por periodo
+_GRID_RATES = np.concatenate([
+    np.linspace(-0.99, -0.5, 50, endpoint=False),
+    np.linspace(-0.5, 1.0, 301, endpoint=False),
+    np.geomspace(1.0, 100.0, 100)
+])
+
+
+def _as_cash_flows(cash_flows):
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    if cash_flows.ndim == 1:
+        cash_flows = cash_flows[None, :]
+    if cash_flows.ndim != 2 or cash_flows.shape[1] < 2:
+        raise ValueError("Los flujos deben ser una matriz proyectos × periodos con al menos dos periodos.")
+    return cash_flows
+
+
+def _per_project(values, n_projects):
+    return np.broadcast_to(np.asarray(values, dtype=float), (n_projects,))
+
+
+def _discount_factors(rate, n_periods):
+    """
+    (1 + r)^-t para t = 0..n-1; `rate` escalar -> vector, array -> (proyectos, n).
+
+    Con tasa común se reutiliza el vector memorizado de src.utils.
+    """
+    rate = np.asarray(rate, dtype=float) / 100
+    if rate.ndim == 0:
+        return np.concatenate([[1.0], discount_factors(float(rate), 1, n_periods - 1)])
+    return (1 + rate[..., None]) ** -np.arange(n_periods)
+
+
+@timed("engine.npv")
+def npv(cash_flows, rate):
+    """VAN de cada proyecto; con tasa común es un único producto matriz-vector."""
+    cash_flows = _as_cash_flows(cash_flows)
+    factors = _discount_factors(rate, cash_flows.shape[1])
+    if factors.ndim == 1:
+        return cash_flows @ factors
+    return np.einsum('pt,pt->p', cash_flows, factors)
+
+
+def _polyval(cash_flows, v):
+    """
+    f(v) = sum_t c_t v^t y f'(v) por proyecto (Horner vectorizado).
+
+    Donde v > 1 se evalúa en w = 1 / v el polinomio invertido y f, f' se
+    devuelven divididos por v^(n-1): mismo signo y mismo cociente f / f',
+    sin que v^t desborde con muchos periodos.
+    """
+    n_periods = cash_flows.shape[1]
+    large = v > 1
+    x = np.where(large, 1 / v, v)
+    f = np.zeros(v.shape)
+    df = np.zeros(v.shape)
+    for j in range(n_periods):
+        column = np.where(large, cash_flows[:, j], cash_flows[:, n_periods - 1 - j])
+        df = df * x + f
+        f = f * x + column
+    # g(w) = f(v) / v^(n-1)  =>  f'(v) / v^(n-1) = ((n-1) g - w g'(w)) · w
+    df = np.where(large, ((n_periods - 1) * f - x * df) * x, df)
+    return f, df
+
+
+def _grid_values(cash_flows, grid_v):
+    """
+    VAN de cada proyecto en la grilla, escalado por v^(n-1) donde v > 1.
+
+    Los exponentes quedan en t - (n-1) <= 0 para v > 1 y en t >= 0 para
+    v <= 1, así que ninguna potencia supera 1; el signo no cambia.
+    """
+    n_periods = cash_flows.shape[1]
+    shift = np.where(grid_v > 1, n_periods - 1, 0)
+    exponents = np.arange(n_periods)[:, None] - shift[None, :]
+    with np.errstate(over='ignore', invalid='ignore'):
+        return cash_flows @ grid_v[None, :] ** exponents
+
+
+@timed("engine.irr")
+def irr(cash_flows, guess=10.0, tol=1e-12, max_iter=100, return_count=False):
+    """
+    TIR (%) de cada proyecto; NaN si los flujos no cambian de signo o son
+    todos cero (el VAN es nulo a cualquier tasa).
+
+    Args:
+        cash_flows: Matriz proyectos × periodos
+        guess: Tasa (%) de referencia para elegir entre varias TIR
+        tol: Tolerancia sobre v = 1 / (1 + r)
+        max_iter: Iteraciones máximas de Newton/bisección
+        return_count: Si True, devuelve también el número de TIR halladas
+
+    Returns:
+        Array de TIR (%) y, opcionalmente, array con el número de raíces
+    """
+    cash_flows = _as_cash_flows(cash_flows)
+    n_projects, n_periods = cash_flows.shape
+
+    # 1) Cambios de signo del VAN en la grilla (un producto de matrices)
+    grid_v = 1 / (1 + _GRID_RATES)
+    values = _grid_values(cash_flows, grid_v)
+    # Un valor no finito no aporta signo: no cuenta como cruce ni como raíz
+    finite = np.isfinite(values)
+    sign = np.where(finite, np.sign(values), 0.0)
+    crossings = ((sign[:, :-1] * sign[:, 1:]) < 0) & finite[:, :-1] & finite[:, 1:]
+    # Flujos todos cero: el VAN se anula en toda la grilla, no hay TIR
+    null = ~cash_flows.any(axis=1)
+    exact = finite & (values == 0) & ~null[:, None]
+    n_roots = crossings.sum(axis=1) + exact.sum(axis=1)
+
+    # 2) Bracket más cercano a `guess` por proyecto
+    midpoints = (_GRID_RATES[:-1] + _GRID_RATES[1:]) / 2
+    distance = np.where(crossings, np.abs(midpoints - guess / 100), np.inf)
+    k = distance.argmin(axis=1)
+    found = np.isfinite(distance[np.arange(n_projects), k])
+    lo, hi = grid_v[k + 1], grid_v[k]          # v decrece con la tasa
+    f_lo = values[np.arange(n_projects), k + 1]
+
+    # 3) Newton protegido por bisección, todos los proyectos a la vez
+    v = (lo + hi) / 2
+    active = found.copy()
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        f, df = _polyval(cash_flows, v)
+        same_as_lo = np.sign(f) == np.sign(f_lo)
+        lo = np.where(active & same_as_lo, v, lo)
+        hi = np.where(active & ~same_as_lo, v, hi)
+        f_lo = np.where(active & same_as_lo, f, f_lo)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = v - f / df
+        inside = np.isfinite(step) & (step > np.minimum(lo, hi)) & (step < np.maximum(lo, hi))
+        new_v = np.where(f == 0, v, np.where(inside, step, (lo + hi) / 2))
+        converged = np.abs(new_v - v) <= tol * np.maximum(1.0, np.abs(v))
+        v = np.where(active, new_v, v)
+        active &= ~converged
+
+    # Raíces exactas sobre la grilla
+    on_grid = exact.any(axis=1) & ~found
+    v = np.where(on_grid, grid_v[exact.argmax(axis=1)], v)
+    result = np.where(found | on_grid, (1 / v - 1) * 100, np.nan)
+    return (result, n_roots) if return_count else result
+
+
+@timed("engine.mirr")
+def mirr(cash_flows, finance_rate, reinvest_rate):
+    """
+    TIR modificada (%): flujos negativos descontados a `finance_rate` y
+    positivos capitalizados a `reinvest_rate` hasta el último periodo.
+    """
+    cash_flows = _as_cash_flows(cash_flows)
+    n = cash_flows.shape[1] - 1
+    t = np.arange(n + 1)
+    finance = _per_project(finance_rate, cash_flows.shape[0])[:, None] / 100
+    reinvest = _per_project(reinvest_rate, cash_flows.shape[0])[:, None] / 100
+    pv_negative = np.where(cash_flows < 0, cash_flows, 0.0) * (1 + finance) ** -t
+    fv_positive = np.where(cash_flows > 0, cash_flows, 0.0) * (1 + reinvest) ** (n - t)
+    pv_negative, fv_positive = pv_negative.sum(axis=1), fv_positive.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = (fv_positive / -pv_negative) ** (1 / n) - 1
+    return np.where((pv_negative < 0) & (fv_positive > 0), result * 100, np.nan)
+
+
+@timed("engine.payback")
+def payback_period(cash_flows, rate=None):
+    """
+    Periodo de recuperación (interpolado dentro del periodo); NaN si no se recupera.
+
+    Args:
+        rate: Si se indica (%), calcula el payback descontado
+    """
+    cash_flows = _as_cash_flows(cash_flows)
+    if rate is not None:
+        factors = _discount_factors(rate, cash_flows.shape[1])
+        cash_flows = cash_flows * factors
+    cumulative = np.cumsum(cash_flows, axis=1)
+    recovered = cumulative >= 0
+    # Primer periodo desde el que el acumulado ya no vuelve a ser negativo
+    still_negative = (~recovered)[:, ::-1].cumsum(axis=1)[:, ::-1] > 0
+    first = np.where(still_negative.any(axis=1), still_negative.sum(axis=1), 0)
+    rows = np.arange(cash_flows.shape[0])
+    ok = recovered[:, -1] & (first > 0)
+    idx = np.clip(first, 1, cash_flows.shape[1] - 1)
+    before = cumulative[rows, idx - 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = -before / cash_flows[rows, idx]
+    return np.where(ok, idx - 1 + fraction, np.where(recovered[:, -1] & (first == 0), 0.0, np.nan))
+
+
+@timed("engine.profitability_index")
+def profitability_index(cash_flows, rate):
+    """VP de los flujos futuros (t >= 1) / inversión inicial."""
+    cash_flows = _as_cash_flows(cash_flows)
+    factors = _discount_factors(rate, cash_flows.shape[1])
+    discounted = cash_flows * factors
+    investment = -discounted[:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(investment > 0, discounted[:, 1:].sum(axis=1) / investment, np.nan)
+
+
+@timed("engine.evaluate_projects")
+def evaluate_projects(cash_flows, rate, finance_rate=None, reinvest_rate=None, names=None):
+    """
+    Indicadores de todos los proyectos, ordenados por VAN descendente.
+
+    Args:
+        cash_flows: Matriz proyectos × periodos (t = 0 en la primera columna)
+        rate: Tasa de descuento (%) por periodo (escalar o por proyecto)
+        finance_rate: Tasa de financiamiento para la TIRM (por defecto `rate`)
+        reinvest_rate: Tasa de reinversión para la TIRM (por defecto `rate`)
+        names: Nombres de los proyectos
+
+    Returns:
+        DataFrame con Proyecto, VAN, TIR, N_TIR, TIRM, Payback,
+        Payback_Descontado, IR y Ranking
+    """
+    cash_flows = _as_cash_flows(cash_flows)
+    if names is None:
+        names = [f"Proyecto {i + 1}" for i in range(cash_flows.shape[0])]
+    finance_rate = rate if finance_rate is None else finance_rate
+    reinvest_rate = rate if reinvest_rate is None else reinvest_rate
+    irr_values, irr_count = irr(cash_flows, return_count=True)
+    df = pd.DataFrame({
+        'Proyecto': names,
+        'VAN': npv(cash_flows, rate),
+        'TIR': irr_values,
+        'N_TIR': irr_count,
+        'TIRM': mirr(cash_flows, finance_rate, reinvest_rate),
+        'Payback': payback_period(cash_flows),
+        'Payback_Descontado': payback_period(cash_flows, rate),
+        'IR': profitability_index(cash_flows, rate)
+    })
+    df['Ranking'] = df['VAN'].rank(ascending=False, method='min').astype(int)
+    return df.sort_values('Ranking', kind='stable').reset_index(drop=True)
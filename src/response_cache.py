@@ -0,0 +1,133 @@
+"""
+Caché de respuestas del chatbot para preguntas repetidas.
+
+La clave combina la pregunta normalizada (minúsculas, sin tildes, sin signos
+de puntuación) con un hash del contexto financiero activo y otro de los
+turnos previos que se envían al modelo, de modo que la misma pregunta sobre
+simulaciones distintas, o dentro de otra conversación ("explícalo con un
+ejemplo"), no comparte respuesta.
+"""
+
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+_PUNCTUATION = re.compile(r"[^\w\s%$]")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_question(text):
+    """Normaliza una pregunta: '¿Qué es la TEA?' -> 'que es la tea'."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _PUNCTUATION.sub(" ", text.lower())
+    return _SPACES.sub(" ", text).strip()
+
+
+def context_hash(context):
+    """Hash estable del resumen de contexto (build_context_summary)."""
+    return hashlib.sha256((context or "").encode("utf-8")).hexdigest()
+
+
+def history_hash(history):
+    """Hash estable de los mensajes previos (rol y contenido) enviados al LLM."""
+    digest = hashlib.sha256()
+    for message in history or ():
+        digest.update(f"{message['role']}\x00{message['content']}\x00".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def make_key(question, context, history=None):
+    return (normalize_question(question), context_hash(context), history_hash(history))
+
+
+class ResponseCache:
+    """
+    Caché LRU con expiración (TTL) y métricas de aciertos.
+
+    Args:
+        max_entries: Número máximo de respuestas guardadas (LRU al superarlo)
+        ttl: Segundos de vida de cada respuesta; None para no expirar
+        clock: Función de tiempo (inyectable para pruebas)
+    """
+
+    def __init__(self, max_entries=512, ttl=3600.0, clock=time.monotonic):
+        if max_entries <= 0:
+            raise ValueError("max_entries debe ser mayor a cero.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, question, context, history=None):
+        """
+        Devuelve la respuesta guardada o None (cuenta acierto/fallo).
+
+        `history` son los mensajes que acompañan a la pregunta en la solicitud
+        (p. ej. build_messages(...)[:-1]); sin historial solo acierta una
+        pregunta hecha también sin historial.
+        """
+        key = make_key(question, context, history)
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and now - entry[1] > self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, question, context, reply, history=None):
+        key = make_key(question, context, history)
+        with self._lock:
+            self._data[key] = (reply, self._clock())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Métricas de uso de la caché."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache(**kwargs):
+    """Caché única del proceso; los kwargs solo aplican en la primera llamada."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(**kwargs)
+        return _cache
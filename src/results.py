@@ -0,0 +1,176 @@
+"""
+Resultados compactos de los motores.
+
+Un resultado guarda solo los arrays contiguos que produce el motor (saldos,
+tasas, aportes, deflactor) y unos pocos escalares, en objetos con
+__slots__; el DataFrame se arma recién cuando se llama a to_frame(). Las
+columnas que ya existen como array (Saldo_Final, Deflactor, ...) se pasan
+a pandas sin copiarlas, y las derivadas (Interes, Saldo_Inicial, columnas
+reales) se calculan en ese momento y no se guardan.
+
+Como el DataFrame comparte memoria con el resultado, modificarlo en el
+lugar (df.loc[...] = ...) modifica también el resultado; reemplazar
+columnas (df['x'] = ...) no lo afecta. Con to_frame(copy=True) se obtiene
+un DataFrame independiente.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _real_columns(columns, deflator, names):
+    """Agrega '<col>_Real' (en moneda del periodo 0) y el deflactor."""
+    columns['Deflactor'] = deflator
+    for name in names:
+        columns[name.replace('_Final', '') + '_Real'] = columns[name] / deflator
+    return columns
+
+
+def _cagr(initial_amount, final_amount, years):
+    if initial_amount <= 0 or years <= 0 or final_amount <= 0:
+        return 0.0
+    return float((final_amount / initial_amount) ** (1 / years) - 1)
+
+
+class EngineResult:
+    """Base de los resultados: arrays del motor y DataFrame bajo demanda."""
+
+    __slots__ = ()
+
+    def _columns(self):
+        raise NotImplementedError
+
+    def _attrs(self):
+        return {}
+
+    def to_frame(self, copy=False):
+        """DataFrame del resultado; sin copia de los arrays salvo que `copy`."""
+        df = pd.DataFrame(self._columns(), copy=copy)
+        df.attrs.update(self._attrs())
+        return df
+
+    @property
+    def nbytes(self):
+        """Bytes ocupados por los arrays del resultado."""
+        return sum(
+            value.nbytes for value in (getattr(self, name) for name in self.__slots__)
+            if isinstance(value, np.ndarray)
+        )
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class GrowthResult(EngineResult):
+    """
+    Crecimiento de cartera (Módulo A).
+
+    Args:
+        initial_amount: Monto inicial
+        years: Plazo en años
+        contributions: Aporte por periodo (n,), tal como se definió
+        rates: Tasa periódica por periodo (n,) en decimal
+        balances: Saldos B_0..B_n (n + 1,)
+        deflator: Índice de precios D_0..D_n (n + 1,) o None sin inflación
+    """
+
+    __slots__ = ('initial_amount', 'years', 'contributions', 'rates', 'balances', 'deflator')
+
+    def __init__(self, initial_amount, years, contributions, rates, balances, deflator=None):
+        self.initial_amount = initial_amount
+        self.years = years
+        self.contributions = contributions
+        self.rates = rates
+        self.balances = balances
+        self.deflator = deflator
+
+    def __len__(self):
+        return len(self.balances)
+
+    @property
+    def final_balance(self):
+        return float(self.balances[-1])
+
+    @property
+    def final_real_balance(self):
+        """Saldo final en moneda del periodo 0 (None sin inflación)."""
+        if self.deflator is None:
+            return None
+        return float(self.balances[-1] / self.deflator[-1])
+
+    @property
+    def cagr(self):
+        return _cagr(self.initial_amount, self.final_balance, self.years)
+
+    @property
+    def cagr_real(self):
+        if self.deflator is None:
+            return None
+        return _cagr(self.initial_amount, self.final_real_balance, self.years)
+
+    def _columns(self):
+        balances = self.balances
+        interest = np.zeros(len(balances))
+        interest[1:] = balances[:-1] * self.rates
+        columns = {
+            'Periodo': np.arange(len(balances)),
+            'Aporte': np.concatenate(([self.initial_amount], self.contributions)),
+            'Saldo_Inicial': np.concatenate(([self.initial_amount], balances[:-1])),
+            'Interes': interest,
+            'Saldo_Final': balances
+        }
+        if self.deflator is not None:
+            _real_columns(columns, self.deflator, ('Aporte', 'Saldo_Final'))
+        return columns
+
+    def _attrs(self):
+        if self.deflator is None:
+            return {}
+        return {'cagr': self.cagr, 'cagr_real': self.cagr_real}
+
+
+class PensionResult(EngineResult):
+    """
+    Calendario mensual de desacumulación (Módulo B).
+
+    Args:
+        pension: Pensión mensual nominal
+        rate: Tasa mensual en decimal
+        balances: Saldos B_0..B_n (n + 1,)
+        deflator: Índice de precios de los meses 1..n (n,) o None sin inflación
+    """
+
+    __slots__ = ('pension', 'rate', 'balances', 'deflator')
+
+    def __init__(self, pension, rate, balances, deflator=None):
+        self.pension = pension
+        self.rate = rate
+        self.balances = balances
+        self.deflator = deflator
+
+    def __len__(self):
+        return len(self.balances) - 1
+
+    @property
+    def final_balance(self):
+        return float(self.balances[-1])
+
+    @property
+    def last_real_pension(self):
+        """Poder de compra de la última pensión (None sin inflación o sin meses)."""
+        if self.deflator is None or not len(self):
+            return None
+        return float(self.pension / self.deflator[-1])
+
+    def _columns(self):
+        n_months = len(self)
+        columns = {
+            'Mes': np.arange(1, n_months + 1),
+            'Saldo_Inicial': self.balances[:-1],
+            'Interes': self.balances[:-1] * self.rate,
+            'Pension': np.full(n_months, self.pension),
+            'Saldo_Final': self.balances[1:]
+        }
+        if self.deflator is not None:
+            _real_columns(columns, self.deflator, ('Pension', 'Saldo_Final'))
+        return columns
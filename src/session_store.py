@@ -0,0 +1,374 @@
+"""
+Estado de sesión con presupuesto de memoria.
+
+Cada sesión guarda sus resultados (Módulos A-D, historial del chat) en un
+SessionStore con un presupuesto de bytes propio; un MemoryRegistry único del
+proceso suma el uso de todas las sesiones y aplica además un presupuesto
+global. Cuando se supera un presupuesto, las entradas grandes menos usadas
+recientemente se vuelcan a una caché en disco y se vuelven a cargar al
+pedirlas; sin directorio de volcado, se descartan.
+
+    store['module_a_result'] = {...}     # mide el valor y aplica presupuestos
+    store.get('module_a_result')         # lo recarga del disco si fue volcado
+    store.put('chat_memory', memory, spill=False)  # siempre residente
+
+Los valores se tratan como inmutables: para cambiar uno se vuelve a asignar
+(las entradas fijadas con spill=False se vuelven a medir en cada control de
+presupuesto, así que pueden modificarse en el lugar).
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .results import EngineResult
+from .utils import discount_cache_info
+
+SESSION_BUDGET = 16 * 1024 * 1024
+GLOBAL_BUDGET = 512 * 1024 * 1024
+SPILL_THRESHOLD = 64 * 1024
+DEFAULT_SPILL_DIR = os.path.join(tempfile.gettempdir(), "simulador_sesiones")
+
+
+def estimate_size(value, _seen=None):
+    """
+    Bytes aproximados que ocupa un valor en memoria.
+
+    Arrays, resultados de los motores y DataFrames se miden por sus datos;
+    contenedores y objetos se recorren (cada objeto se cuenta una sola vez).
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, EngineResult):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in value)
+    elif hasattr(value, '__dict__') and not isinstance(value, type):
+        size += estimate_size(vars(value), _seen)
+    return size
+
+
+class _Entry:
+    __slots__ = ('value', 'size', 'spill', 'path')
+
+    def __init__(self, value, size, spill):
+        self.value = value
+        self.size = size
+        self.spill = spill
+        self.path = None
+
+
+def _remove_files(paths):
+    for path in list(paths):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class SessionStore:
+    """
+    Mapeo clave -> valor de una sesión con presupuesto de bytes y volcado a disco.
+
+    Args:
+        budget: Bytes residentes máximos de la sesión
+        spill_dir: Directorio de la caché en disco; None descarta en lugar de volcar
+        spill_threshold: Tamaño mínimo (bytes) de una entrada para volcarla;
+            las más chicas (escalares, resúmenes) siempre quedan residentes
+        registry: MemoryRegistry que aplica el presupuesto global (opcional)
+        session_id: Identificador de la sesión (se genera si es None)
+    """
+
+    def __init__(
+        self,
+        budget=SESSION_BUDGET,
+        spill_dir=DEFAULT_SPILL_DIR,
+        spill_threshold=SPILL_THRESHOLD,
+        registry=None,
+        session_id=None
+    ):
+        if budget <= 0:
+            raise ValueError("El presupuesto de la sesión debe ser mayor a cero.")
+        self.budget = budget
+        self.spill_dir = spill_dir
+        self.spill_threshold = spill_threshold
+        self.session_id = session_id or uuid.uuid4().hex
+        self.last_access = time.monotonic()
+        self.spills = 0
+        self.loads = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._resident = 0
+        self._lock = threading.RLock()
+        # Al descartarse la sesión se borran sus archivos volcados
+        self._files = set()
+        self._finalizer = weakref.finalize(self, _remove_files, self._files)
+        self._registry = registry
+        if registry is not None:
+            registry.register(self)
+
+    # --- Acceso tipo diccionario ---
+
+    def put(self, key, value, spill=True):
+        """Guarda `value`; con spill=False queda siempre residente."""
+        with self._lock:
+            self._discard(key)
+            entry = _Entry(value, estimate_size(value), spill)
+            self._entries[key] = entry
+            self._resident += entry.size
+            self._touch()
+            self.enforce(self.budget)
+        if self._registry is not None:
+            self._registry.enforce()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            self._touch()
+            if entry.value is None:
+                if not self._load(key, entry):
+                    return default
+                value = entry.value
+                self.enforce(self.budget)
+                return value
+            return entry.value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __getitem__(self, key):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key not in self._entries:
+                raise KeyError(key)
+            self._discard(key)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def keys(self):
+        return list(self._entries)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value = self.get(key, default)
+            self._discard(key)
+            return value
+
+    def clear(self):
+        """Borra todas las entradas y sus archivos en disco."""
+        with self._lock:
+            for key in list(self._entries):
+                self._discard(key)
+
+    # --- Presupuesto ---
+
+    @property
+    def resident_bytes(self):
+        return self._resident
+
+    def enforce(self, budget):
+        """
+        Vuelca (o descarta) entradas grandes, de la menos a la más usada,
+        hasta que los bytes residentes no superen `budget`.
+
+        Returns:
+            Bytes liberados
+        """
+        with self._lock:
+            self._remeasure_pinned()
+            freed = 0
+            for key, entry in list(self._entries.items()):
+                if self._resident <= budget:
+                    break
+                if entry.value is None or not entry.spill or entry.size < self.spill_threshold:
+                    continue
+                if self.spill_dir is None or not self._spill(key, entry):
+                    self._discard(key)
+                    self.evictions += 1
+                else:
+                    entry.value = None
+                    self._resident -= entry.size
+                freed += entry.size
+            return freed
+
+    def stats(self):
+        """Métricas de memoria de la sesión."""
+        with self._lock:
+            self._remeasure_pinned()
+            spilled = [entry for entry in self._entries.values() if entry.value is None]
+            return {
+                "entries": len(self._entries),
+                "resident_bytes": self._resident,
+                "budget_bytes": self.budget,
+                "spilled_entries": len(spilled),
+                "spilled_bytes": sum(entry.size for entry in spilled),
+                "spills": self.spills,
+                "loads": self.loads,
+                "evictions": self.evictions
+            }
+
+    # --- Internos ---
+
+    def _touch(self):
+        self.last_access = time.monotonic()
+
+    def _remeasure_pinned(self):
+        for entry in self._entries.values():
+            if not entry.spill:
+                size = estimate_size(entry.value)
+                self._resident += size - entry.size
+                entry.size = size
+
+    def _path(self, key):
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.spill_dir, f"{self.session_id}_{digest}.pkl")
+
+    def _spill(self, key, entry):
+        """Escribe la entrada en disco (una sola vez: los valores no cambian)."""
+        if entry.path is None:
+            path = self._path(key)
+            try:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                with open(path, "wb") as f:
+                    pickle.dump(entry.value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except (OSError, pickle.PicklingError, TypeError, AttributeError):
+                return False
+            entry.path = path
+            self._files.add(path)
+        self.spills += 1
+        return True
+
+    def _load(self, key, entry):
+        """Recarga una entrada volcada; si el archivo ya no existe, se descarta."""
+        try:
+            with open(entry.path, "rb") as f:
+                entry.value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self._discard(key)
+            self.evictions += 1
+            return False
+        self._resident += entry.size
+        self.loads += 1
+        return True
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        if entry.value is not None:
+            self._resident -= entry.size
+        if entry.path is not None:
+            _remove_files([entry.path])
+            self._files.discard(entry.path)
+
+
+class MemoryRegistry:
+    """
+    Uso de memoria de todas las sesiones del proceso y presupuesto global.
+
+    Las sesiones se guardan con referencias débiles: al cerrarse una sesión de
+    Streamlit su store desaparece del registro sin avisar.
+    """
+
+    def __init__(self, budget=GLOBAL_BUDGET):
+        if budget <= 0:
+            raise ValueError("El presupuesto global debe ser mayor a cero.")
+        self.budget = budget
+        self._sessions = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self.enforcements = 0
+
+    def register(self, store):
+        with self._lock:
+            self._sessions[store.session_id] = store
+
+    def _stores(self):
+        with self._lock:
+            return list(self._sessions.values())
+
+    @property
+    def resident_bytes(self):
+        return sum(store.resident_bytes for store in self._stores())
+
+    def enforce(self):
+        """
+        Si el total supera el presupuesto global, libera memoria empezando por
+        las sesiones inactivas hace más tiempo.
+
+        Returns:
+            Bytes liberados
+        """
+        stores = self._stores()
+        excess = sum(store.resident_bytes for store in stores) - self.budget
+        if excess <= 0:
+            return 0
+        self.enforcements += 1
+        freed = 0
+        for store in sorted(stores, key=lambda s: s.last_access):
+            freed += store.enforce(max(store.resident_bytes - (excess - freed), 0))
+            if freed >= excess:
+                break
+        return freed
+
+    def stats(self):
+        """Métricas globales, incluidas las cachés de factores de descuento."""
+        sessions = [store.stats() for store in self._stores()]
+        return {
+            "sessions": len(sessions),
+            "resident_bytes": sum(s["resident_bytes"] for s in sessions),
+            "budget_bytes": self.budget,
+            "spilled_bytes": sum(s["spilled_bytes"] for s in sessions),
+            "spills": sum(s["spills"] for s in sessions),
+            "evictions": sum(s["evictions"] for s in sessions),
+            "enforcements": self.enforcements,
+            "discount_cache": discount_cache_info()
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_memory_registry(**kwargs):
+    """Registro único del proceso; los kwargs solo aplican en la primera llamada."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MemoryRegistry(**kwargs)
+        return _registry
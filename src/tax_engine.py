@@ -1,10 +1,26 @@
+import numpy as np
+from .profiling import timed
+
+TAX_RATES = {
+    'Fuente extranjera (29.5%)': 0.295,
+    'Bolsa local (5%)': 0.05
+}
+
+@timed("engine.apply_tax")
 def apply_tax(gross_amount, initial_amount, tax_type):
     gain = max(0.0, gross_amount - initial_amount)
-    if tax_type == 'Fuente extranjera (29.5%)':
-        tax = gain * 0.295
-    elif tax_type == 'Bolsa local (5%)':
-        tax = gain * 0.05
-    else:
-        tax = 0.0
+    tax = gain * TAX_RATES.get(tax_type, 0.0)
     net_amount = gross_amount - tax
-    return tax, net_amount
\ No newline at end of file
+    return tax, net_amount
+
+@timed("engine.apply_tax_batch")
+def apply_tax_batch(gross_amount, initial_amount, tax_type):
+    """Versión vectorizada de apply_tax; `tax_type` puede ser escalar o array de textos."""
+    gross_amount = np.asarray(gross_amount, dtype=float)
+    gain = np.maximum(0.0, gross_amount - np.asarray(initial_amount, dtype=float))
+    types = np.asarray(tax_type)
+    rate = np.zeros(types.shape)
+    for name, value in TAX_RATES.items():
+        rate = np.where(types == name, value, rate)
+    tax = gain * rate
+    return tax, gross_amount - tax
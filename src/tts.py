@@ -0,0 +1,130 @@
+"""
+Síntesis de voz (gTTS) asíncrona, en memoria y con caché de audio.
+
+La síntesis corre en un pool de hilos mientras la UI sigue renderizando; el
+MP3 se escribe en un buffer en memoria (sin archivos temporales) y se guarda
+por hash del texto para no volver a sintetizar respuestas repetidas.
+"""
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+def synthesize_speech(text, lang="es"):
+    """Sintetiza `text` con gTTS y devuelve los bytes MP3 (sin tocar disco)."""
+    from gtts import gTTS
+    buffer = io.BytesIO()
+    gTTS(text, lang=lang).write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+def audio_key(text, lang="es"):
+    return hashlib.sha256(f"{lang}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Caché LRU de audios acotada por bytes totales."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            audio = self._data.get(key)
+            if audio is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return audio
+
+    def put(self, key, audio):
+        if len(audio) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._data[key] = audio
+            self._size += len(audio)
+            while self._size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+class TTSService:
+    """
+    Ejecuta la síntesis en segundo plano y comparte resultados entre sesiones.
+
+    Args:
+        max_workers: Hilos dedicados a la síntesis
+        cache: AudioCache a usar (se crea una si es None)
+        synthesize: Función texto -> bytes (inyectable para pruebas)
+    """
+
+    def __init__(self, max_workers=2, cache=None, synthesize=synthesize_speech):
+        self.cache = cache if cache is not None else AudioCache()
+        self._synthesize = synthesize
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts")
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def submit(self, text, lang="es"):
+        """
+        Programa la síntesis de `text` y devuelve un Future con los bytes MP3.
+
+        Si el audio ya está en caché el Future se devuelve resuelto; si otra
+        sesión está sintetizando el mismo texto se reutiliza su Future.
+        """
+        key = audio_key(text, lang)
+        audio = self.cache.get(key)
+        if audio is not None:
+            future = Future()
+            future.set_result(audio)
+            return future
+
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._run, key, text, lang)
+                self._pending[key] = future
+            return future
+
+    def _run(self, key, text, lang):
+        try:
+            audio = self._synthesize(text, lang)
+            self.cache.put(key, audio)
+            return audio
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_tts_service(**kwargs):
+    """Servicio único del proceso; los kwargs solo aplican en la primera llamada."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TTSService(**kwargs)
+        return _service
@@ -1,37 +1,263 @@
+from functools import lru_cache
+
+import numpy as np
+
+# 🔹 Núcleo de descuento compartido (tasas en decimal)
+
+RATE_KINDS = ('TEA', 'TNA', 'continua')
+
+
+def _to_periodic(rate, m, kind):
+    if kind == 'TEA':
+        return (1 + rate) ** (1 / m) - 1
+    if kind == 'TNA':
+        return rate / m
+    if kind == 'continua':
+        return np.expm1(rate / m)
+    raise ValueError(f"Tipo de tasa no válido: {kind}. Opciones: {list(RATE_KINDS)}")
+
+
+@lru_cache(maxsize=1024)
+def _periodic_rate_cached(rate, m, kind):
+    return float(_to_periodic(rate, m, kind))
+
+
+def periodic_rate(rate, m, kind='TEA'):
+    """
+    Tasa periódica equivalente para m periodos por año.
+
+    Args:
+        rate: Tasa anual en decimal (escalar o array)
+        m: Periodos por año (escalar o array)
+        kind: 'TEA' (efectiva), 'TNA' (nominal capitalizable m veces) o
+            'continua' (capitalización continua)
+
+    Los escalares se memorizan; los arrays se convierten de forma vectorizada.
+    """
+    if np.ndim(rate) == 0 and np.ndim(m) == 0:
+        if m <= 0:
+            raise ValueError("El número de períodos por año debe ser mayor a cero.")
+        return _periodic_rate_cached(float(rate), float(m), kind)
+    if np.any(np.asarray(m) <= 0):
+        raise ValueError("El número de períodos por año debe ser mayor a cero.")
+    return _to_periodic(np.asarray(rate, dtype=float), np.asarray(m, dtype=float), kind)
+
+
 def convert_tea_to_periodic(tea, m):
     """Convierte una Tasa Efectiva Anual (tea) a tasa periódica con m períodos al año."""
+    return periodic_rate(tea, m, 'TEA')
+
+
+@lru_cache(maxsize=256)
+def _discount_vector(rate, m, horizon, kind):
+    i = _periodic_rate_cached(rate, m, kind)
+    factors = (1 + i) ** -np.arange(1, horizon + 1, dtype=float)
+    # Se comparte entre llamadas: solo lectura para que nadie lo modifique
+    factors.flags.writeable = False
+    return factors
+
+
+def discount_factors(rate, m, horizon, kind='TEA'):
+    """
+    Vector de factores de descuento 1 / (1 + i)^t para t = 1..horizon.
+
+    El vector se memoriza por (tasa, frecuencia, horizonte, tipo) y es de solo
+    lectura: valoraciones repetidas con las mismas tasas lo reutilizan.
+    """
     if m <= 0:
         raise ValueError("El número de períodos por año debe ser mayor a cero.")
-    return (1 + tea) ** (1 / m) - 1
+    return _discount_vector(float(rate), float(m), int(horizon), kind)
+
+
+def annuity_factor(rate, m, horizon, kind='TEA'):
+    """Valor presente de 1 por periodo durante `horizon` periodos: (1 - v^n) / i."""
+    if horizon <= 0:
+        return 0.0
+    i = periodic_rate(rate, m, kind)
+    if i == 0:
+        return float(horizon)
+    return float((1 - discount_factors(rate, m, horizon, kind)[-1]) / i)
+
+
+def discount_cache_info():
+    """Estadísticas de las cachés de tasas y de vectores de descuento."""
+    vectors = _discount_vector.cache_info()
+    rates = _periodic_rate_cached.cache_info()
+    return {
+        'vector_hits': vectors.hits,
+        'vector_misses': vectors.misses,
+        'vectors_cached': vectors.currsize,
+        'rate_hits': rates.hits,
+        'rate_misses': rates.misses
+    }
+
+
+def category_codes(values, mapping, name, size):
+    """Convierte nombres de categoría (escalar o uno por fila) a códigos enteros."""
+    values = np.broadcast_to(np.asarray(values, dtype=object), (size,))
+    try:
+        return np.array([mapping[v] for v in values], dtype=np.int8)
+    except KeyError as e:
+        raise ValueError(f"{name} no válido: {e.args[0]}. Opciones: {list(mapping)}") from None
+
+
+# Códigos de error de validación (bits combinables por fila en las versiones por lotes)
+INITIAL_NEGATIVE = 1
+CONTRIBUTION_NEGATIVE = 2
+TEA_OUT_OF_RANGE = 4
+YEARS_NOT_POSITIVE = 8
+TEA_RETIREMENT_OUT_OF_RANGE = 16
+RETIREMENT_YEARS_NOT_POSITIVE = 32
+FACE_VALUE_NEGATIVE = 64
+COUPON_NEGATIVE = 128
+YIELD_NEGATIVE = 256
+MATURITY_NOT_POSITIVE = 512
+FREQUENCY_INVALID = 1024
+NO_PAYMENT_PERIODS = 2048
+CAPITAL_NEGATIVE = 4096
+BOND_TYPE_INVALID = 8192
+
+ERROR_MESSAGES = {
+    INITIAL_NEGATIVE: "Monto inicial no puede ser negativo.",
+    CONTRIBUTION_NEGATIVE: "Aporte periódico no puede ser negativo.",
+    TEA_OUT_OF_RANGE: "TEA debe estar entre 0% y 50%.",
+    YEARS_NOT_POSITIVE: "El plazo debe ser mayor a cero.",
+    TEA_RETIREMENT_OUT_OF_RANGE: "Tasa de retorno durante retiro debe estar entre 0% y 50%.",
+    RETIREMENT_YEARS_NOT_POSITIVE: "Los años esperados de retiro deben ser mayores a cero.",
+    FACE_VALUE_NEGATIVE: "Valor nominal no puede ser negativo.",
+    COUPON_NEGATIVE: "Tasa cupón no puede ser negativa.",
+    YIELD_NEGATIVE: "Tasa de retorno esperada no puede ser negativa.",
+    MATURITY_NOT_POSITIVE: "El plazo del bono debe ser mayor a cero.",
+    FREQUENCY_INVALID: "Frecuencia no válida.",
+    NO_PAYMENT_PERIODS: "El plazo debe generar al menos un periodo de pago",
+    CAPITAL_NEGATIVE: "El capital disponible no puede ser negativo.",
+    BOND_TYPE_INVALID: "Tipo de bono no válido.",
+}
 
 def validate_module_a(**kwargs):
     errors = []
     if kwargs.get('initial_amount', 0) < 0:
-        errors.append("Monto inicial no puede ser negativo.")
+        errors.append(ERROR_MESSAGES[INITIAL_NEGATIVE])
     if kwargs.get('periodic_contribution', 0) < 0:
-        errors.append("Aporte periódico no puede ser negativo.")
+        errors.append(ERROR_MESSAGES[CONTRIBUTION_NEGATIVE])
     if kwargs.get('tea', -1) < 0 or kwargs.get('tea', 0) > 50:
-        errors.append("TEA debe estar entre 0% y 50%.")
+        errors.append(ERROR_MESSAGES[TEA_OUT_OF_RANGE])
     if kwargs.get('years', 0) <= 0:
-        errors.append("El plazo debe ser mayor a cero.")
+        errors.append(ERROR_MESSAGES[YEARS_NOT_POSITIVE])
     return errors
 
 def validate_module_b(**kwargs):
     errors = []
     if kwargs.get('tea_retirement', -1) < 0 or kwargs.get('tea_retirement', 0) > 50:
-        errors.append("Tasa de retorno durante retiro debe estar entre 0% y 50%.")
+        errors.append(ERROR_MESSAGES[TEA_RETIREMENT_OUT_OF_RANGE])
     if kwargs.get('retirement_years', 0) <= 0:
-        errors.append("Los años esperados de retiro deben ser mayores a cero.")
+        errors.append(ERROR_MESSAGES[RETIREMENT_YEARS_NOT_POSITIVE])
     return errors
 
 def validate_module_c(**kwargs):
     errors = []
     if kwargs.get('face_value', 0) < 0:
-        errors.append("Valor nominal no puede ser negativo.")
+        errors.append(ERROR_MESSAGES[FACE_VALUE_NEGATIVE])
     if kwargs.get('coupon_rate', -1) < 0:
-        errors.append("Tasa cupón no puede ser negativa.")
+        errors.append(ERROR_MESSAGES[COUPON_NEGATIVE])
     if kwargs.get('required_yield', -1) < 0:
-        errors.append("Tasa de retorno esperada no puede ser negativa.")
+        errors.append(ERROR_MESSAGES[YIELD_NEGATIVE])
     if kwargs.get('years_to_maturity', 0) <= 0:
-        errors.append("El plazo del bono debe ser mayor a cero.")
-    return errors
\ No newline at end of file
+        errors.append(ERROR_MESSAGES[MATURITY_NOT_POSITIVE])
+    return errors
+
+# 🔹 Validaciones vectorizadas (lotes de escenarios)
+
+class BatchValidation:
+    """
+    Resultado de validar un lote: un código de error (bits) por fila.
+
+    `codes[i] == 0` significa fila válida. Los mensajes en español solo se
+    construyen al pedirlos, y solo para las filas que fallan.
+    """
+
+    __slots__ = ("codes",)
+
+    def __init__(self, codes):
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def valid(self):
+        """Máscara booleana: True en las filas sin errores."""
+        return self.codes == 0
+
+    @property
+    def invalid_rows(self):
+        """Índices de las filas con al menos un error."""
+        return np.flatnonzero(self.codes)
+
+    def has(self, code):
+        """Máscara de las filas que fallan la regla `code`."""
+        return (self.codes & code) != 0
+
+    def messages(self, row):
+        """Mensajes de error de una fila (lista vacía si es válida)."""
+        code = int(self.codes[row])
+        return [message for bit, message in ERROR_MESSAGES.items() if code & bit]
+
+    def add(self, code, failed):
+        """Marca con `code` las filas donde `failed` es True (reglas adicionales)."""
+        self.codes |= np.where(failed, code, 0).astype(self.codes.dtype)
+        return self
+
+    def errors(self, limit=None):
+        """Diccionario fila -> mensajes, solo para filas inválidas (hasta `limit`)."""
+        rows = self.invalid_rows if limit is None else self.invalid_rows[:limit]
+        return {int(row): self.messages(row) for row in rows}
+
+
+def _as_float_array(value):
+    return np.asarray(value, dtype=float)
+
+
+def _collect(*rules):
+    """Combina (código, máscara_de_fallo) en un array de códigos por fila."""
+    shape = np.broadcast_shapes(*(failed.shape for _, failed in rules))
+    codes = np.zeros(shape, dtype=np.uint16)
+    for code, failed in rules:
+        codes |= np.where(failed, code, 0).astype(np.uint16)
+    return BatchValidation(codes)
+
+
+def validate_module_a_batch(initial_amount, periodic_contribution, tea, years):
+    """Reglas de validate_module_a sobre arrays; los NaN cuentan como inválidos."""
+    initial_amount, periodic_contribution, tea, years = map(
+        _as_float_array, (initial_amount, periodic_contribution, tea, years)
+    )
+    # Se expresan como "no cumple" para que los NaN también fallen
+    return _collect(
+        (INITIAL_NEGATIVE, ~(initial_amount >= 0)),
+        (CONTRIBUTION_NEGATIVE, ~(periodic_contribution >= 0)),
+        (TEA_OUT_OF_RANGE, ~((tea >= 0) & (tea <= 50))),
+        (YEARS_NOT_POSITIVE, ~(years > 0)),
+    )
+
+
+def validate_module_b_batch(tea_retirement, retirement_years):
+    """Reglas de validate_module_b sobre arrays; los NaN cuentan como inválidos."""
+    tea_retirement, retirement_years = map(_as_float_array, (tea_retirement, retirement_years))
+    return _collect(
+        (TEA_RETIREMENT_OUT_OF_RANGE, ~((tea_retirement >= 0) & (tea_retirement <= 50))),
+        (RETIREMENT_YEARS_NOT_POSITIVE, ~(retirement_years > 0)),
+    )
+
+
+def validate_module_c_batch(face_value, coupon_rate, required_yield, years_to_maturity):
+    """Reglas de validate_module_c sobre arrays; los NaN cuentan como inválidos."""
+    face_value, coupon_rate, required_yield, years_to_maturity = map(
+        _as_float_array, (face_value, coupon_rate, required_yield, years_to_maturity)
+    )
+    return _collect(
+        (FACE_VALUE_NEGATIVE, ~(face_value >= 0)),
+        (COUPON_NEGATIVE, ~(coupon_rate >= 0)),
+        (YIELD_NEGATIVE, ~(required_yield >= 0)),
+        (MATURITY_NOT_POSITIVE, ~(years_to_maturity > 0)),
+    )
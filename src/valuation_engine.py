@@ -0,0 +1,192 @@
+"""
+Valoración de empresas por flujos de caja descontados (DCF).
+
+WACC a partir de la estructura de capital (costo del patrimonio por CAPM),
+proyección de flujos de caja libres y valor terminal por crecimiento
+perpetuo (Gordon) o por múltiplo de salida. Las funciones de valoración
+aceptan arrays de WACC, crecimiento y múltiplos con broadcasting, de modo
+que una tabla de sensibilidad completa es una sola evaluación vectorizada.
+
+Todas las tasas se expresan en % anual.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .finance_engine import build_schedule
+from .profiling import timed
+from .utils import discount_factors
+
+
+def cost_of_equity_capm(risk_free, beta, market_premium):
+    """Costo del patrimonio (%) = rf + β · prima de mercado."""
+    return np.asarray(risk_free, dtype=float) + np.asarray(beta, dtype=float) * np.asarray(market_premium, dtype=float)
+
+
+@timed("engine.wacc")
+def calculate_wacc(
+    equity_value,
+    debt_value,
+    cost_of_equity,
+    cost_of_debt,
+    tax_rate
+):
+    """
+    Costo promedio ponderado de capital (%).
+
+    Args:
+        equity_value: Valor de mercado del patrimonio
+        debt_value: Valor de mercado de la deuda
+        cost_of_equity: Costo del patrimonio (%), p. ej. de cost_of_equity_capm
+        cost_of_debt: Costo de la deuda antes de impuestos (%)
+        tax_rate: Tasa de impuesto a la renta (%)
+
+    Returns:
+        WACC (%) (escalar o array si alguna entrada es array)
+    """
+    equity_value, debt_value = np.asarray(equity_value, dtype=float), np.asarray(debt_value, dtype=float)
+    total = equity_value + debt_value
+    if np.any(total <= 0):
+        raise ValueError("La suma de patrimonio y deuda debe ser mayor a cero.")
+    wacc = (equity_value / total) * cost_of_equity + (debt_value / total) * cost_of_debt * (1 - np.asarray(tax_rate) / 100)
+    return float(wacc) if np.ndim(wacc) == 0 else wacc
+
+
+@timed("engine.fcf_projection")
+def project_free_cash_flows(
+    revenue,
+    years,
+    revenue_growth,
+    ebitda_margin,
+    da_pct,
+    capex_pct,
+    nwc_pct,
+    tax_rate
+):
+    """
+    Proyección anual de flujos de caja libres de la firma.
+
+    FCF = EBIT·(1 - t) + D&A - CapEx - ΔCapital de trabajo
+
+    Args:
+        revenue: Ventas del año base (año 0)
+        years: Años de proyección explícita
+        revenue_growth: Crecimiento de ventas (%): escalar, lista por año o
+            por tramos (ver build_schedule)
+        ebitda_margin: Margen EBITDA (%) sobre ventas
+        da_pct: Depreciación y amortización (% de ventas)
+        capex_pct: Inversión en activo fijo (% de ventas)
+        nwc_pct: Capital de trabajo (% de ventas); se invierte su variación
+        tax_rate: Tasa de impuesto (%)
+
+    Returns:
+        DataFrame con Año, Ventas, EBITDA, DyA, EBIT, NOPAT, CapEx, Var_CT, FCF
+    """
+    years = int(years)
+    growth = build_schedule(revenue_growth, years, 1) / 100
+    sales = revenue * np.cumprod(1 + growth)
+    ebitda = sales * ebitda_margin / 100
+    da = sales * da_pct / 100
+    ebit = ebitda - da
+    nopat = ebit * (1 - tax_rate / 100)
+    capex = sales * capex_pct / 100
+    working_capital = np.concatenate([[revenue], sales]) * nwc_pct / 100
+    delta_nwc = np.diff(working_capital)
+    return pd.DataFrame({
+        'Año': np.arange(1, years + 1),
+        'Ventas': sales,
+        'EBITDA': ebitda,
+        'DyA': da,
+        'EBIT': ebit,
+        'NOPAT': nopat,
+        'CapEx': capex,
+        'Var_CT': delta_nwc,
+        'FCF': nopat + da - capex - delta_nwc
+    })
+
+
+def _explicit_pv(fcf, wacc):
+    """VP de los flujos explícitos para un array de WACC (%): (...,) -> (...)."""
+    fcf = np.asarray(fcf, dtype=float)
+    w = np.asarray(wacc, dtype=float)
+    if w.ndim == 0:
+        return discount_factors(float(w) / 100, 1, fcf.size) @ fcf
+    factors = (1 + w.reshape(w.shape + (1,)) / 100) ** -np.arange(1, fcf.size + 1)
+    return (factors @ fcf).reshape(w.shape)
+
+
+@timed("engine.dcf_gordon")
+def enterprise_value_gordon(fcf, wacc, growth):
+    """
+    Valor de la firma con valor terminal de Gordon: FCF_N (1 + g) / (WACC - g).
+
+    `wacc` y `growth` (%) se combinan con broadcasting; donde WACC <= g el
+    resultado es NaN.
+
+    Returns:
+        (valor_firma, vp_valor_terminal) con la forma broadcast de wacc y growth
+    """
+    fcf = np.asarray(fcf, dtype=float)
+    w, g = np.asarray(wacc, dtype=float) / 100, np.asarray(growth, dtype=float) / 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terminal = np.where(w > g, fcf[-1] * (1 + g) / (w - g), np.nan)
+    pv_terminal = terminal * (1 + w) ** -fcf.size
+    # El VP explícito solo depende del WACC: se calcula sin expandir a la grilla
+    return _explicit_pv(fcf, wacc) + pv_terminal, pv_terminal
+
+
+@timed("engine.dcf_exit_multiple")
+def enterprise_value_exit_multiple(fcf, wacc, multiple, terminal_metric):
+    """
+    Valor de la firma con valor terminal por múltiplo de salida (p. ej. EV/EBITDA).
+
+    Args:
+        fcf: Flujos explícitos (años 1..N)
+        wacc: WACC (%), escalar o array
+        multiple: Múltiplo de salida, escalar o array (broadcast con wacc)
+        terminal_metric: Métrica del año N a la que se aplica el múltiplo
+
+    Returns:
+        (valor_firma, vp_valor_terminal)
+    """
+    fcf = np.asarray(fcf, dtype=float)
+    w = np.asarray(wacc, dtype=float) / 100
+    pv_terminal = np.asarray(multiple, dtype=float) * terminal_metric * (1 + w) ** -fcf.size
+    return _explicit_pv(fcf, wacc) + pv_terminal, pv_terminal
+
+
+def equity_value(enterprise_value, net_debt, shares=None):
+    """Valor del patrimonio (y por acción si se indica el número de acciones)."""
+    equity = np.asarray(enterprise_value) - net_debt
+    if shares:
+        return equity, equity / shares
+    return equity, None
+
+
+@timed("engine.sensitivity")
+def sensitivity_table(fcf, waccs, second_axis, method='gordon', terminal_metric=None, net_debt=0.0):
+    """
+    Tabla de sensibilidad del valor del patrimonio.
+
+    Args:
+        fcf: Flujos explícitos
+        waccs: Valores de WACC (%) para las filas
+        second_axis: Crecimientos g (%) o múltiplos para las columnas
+        method: 'gordon' o 'multiple'
+        terminal_metric: Métrica del año N (requerida con 'multiple')
+        net_debt: Deuda neta que se resta al valor de la firma
+
+    Returns:
+        DataFrame (WACC × g o WACC × múltiplo), evaluado en un solo broadcast
+    """
+    waccs = np.asarray(waccs, dtype=float)
+    second_axis = np.asarray(second_axis, dtype=float)
+    if method == 'gordon':
+        ev, _ = enterprise_value_gordon(fcf, waccs[:, None], second_axis[None, :])
+    elif method == 'multiple':
+        if terminal_metric is None:
+            raise ValueError("Se requiere la métrica terminal para el método de múltiplo.")
+        ev, _ = enterprise_value_exit_multiple(fcf, waccs[:, None], second_axis[None, :], terminal_metric)
+    else:
+        raise ValueError(f"Método no válido: {method}. Opciones: ['gordon', 'multiple']")
+    return pd.DataFrame(ev - net_debt, index=pd.Index(waccs, name='WACC'), columns=second_axis)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from src.backtest import load_return_history, rolling_backtest, save_return_history
+
+def _loop(returns, start, n, initial, contribution, step):
+    balance = initial
+    for k in range(1, n + 1):
+        balance = balance * (1 + returns[start + k - 1]) + (contribution if k % step == 0 else 0)
+    return balance
+
+def test_rolling_windows_match_loop(tmp_path):
+    returns = np.random.default_rng(3).normal(0.006, 0.04, 400)
+    path = tmp_path / "retornos.npy"
+    save_return_history(path, returns)
+    history = load_return_history(path)
+    assert isinstance(history, np.memmap)
+
+    report = rolling_backtest(history, 1000, 100, 10, 'Trimestral', block_size=50)
+    assert report['final_balance'].size == 400 - 120 + 1
+    for start in (0, 49, 50, 137, 280):
+        assert report['final_balance'][start] == pytest.approx(_loop(returns, start, 120, 1000, 100, 3), rel=1e-10)
+        assert report['worst_period'][start] == returns[start:start + 120].min()
+    assert report['total_contributed'] == 1000 + 100 * 40
+
+def test_long_history_does_not_overflow():
+    returns = np.full(20_000, 0.01)
+    report = rolling_backtest(returns, 1000, 0, 1)
+    assert np.isfinite(report['final_balance']).all()
+    assert report['final_balance'] == pytest.approx(np.full(report['final_balance'].size, 1000 * 1.01 ** 12))
+    assert report['shortfall_probability'] == 0
+
+def test_window_longer_than_history():
+    with pytest.raises(ValueError):
+        rolling_backtest(np.zeros(100), 1000, 100, 10)
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+from src.batch_runner import run_batch
+from src.finance_engine import calculate_portfolio_growth
+
+def test_run_batch_module_a_in_chunks(tmp_path):
+    source = tmp_path / "escenarios.csv"
+    pd.DataFrame({
+        "client_id": [1, 2, 3, 4, 5],
+        "initial_amount": [1000, 500, -1, 2000, 0],
+        "periodic_contribution": [100, 0, 10, 50, 25],
+        "contribution_freq": ["Mensual", "Anual", "Mensual", "Semanal", "Trimestral"],
+        "years": [10, 5, 5, 3, 20],
+        "tea": [7, 5, 5, 5, 60],
+    }).to_csv(source, index=False)
+    target = tmp_path / "resultados.csv"
+
+    report = run_batch(str(source), str(target), "a", chunk_size=2)
+
+    out = pd.read_csv(target)
+    assert report["rows"] == 5 and report["chunks"] == 3
+    assert report["invalid_rows"] == 3
+    assert out["valid"].tolist() == [True, True, False, False, False]
+    _, expected = calculate_portfolio_growth(1000, 100, 'Mensual', 10, 7)
+    assert out.loc[0, "final_balance"] == pytest.approx(expected)
+    assert out["client_id"].tolist() == [1, 2, 3, 4, 5]
+    assert (out["error_codes"] == 0).tolist() == out["valid"].tolist()
+
+def test_run_batch_module_c_mixed_book(tmp_path):
+    from src.finance_engine import bond_price_batch
+    source = tmp_path / "bonos.csv"
+    pd.DataFrame({
+        "face_value": [1000, 1000, 1000, 1000],
+        "coupon_rate": [5, 0, 10, 5],
+        "payment_freq": ["Semestral", "Semestral", "Anual", "Anual"],
+        "years_to_maturity": [10, 10, 4, 3],
+        "required_yield": [6, 5, 10, 5],
+        "bond_type": ["Bullet", "Flotante", "Amortizable", "Perpetuo"],
+        "spread": [0, 1, 0, 0],
+        "forward_rate": [0, 3, 0, 0],
+    }).to_csv(source, index=False)
+    target = tmp_path / "bonos_vp.csv"
+
+    run_batch(str(source), str(target), "c")
+
+    out = pd.read_csv(target)
+    assert out["valid"].tolist() == [True, True, True, False]
+    assert out["pv_total"][:3].tolist() == pytest.approx([
+        float(bond_price_batch(1000, 5, 2, 10, 6)), float(bond_price_batch(1000, 4, 2, 10, 5)), 1000
+    ])
@@ -0,0 +1,27 @@
+import pytest
+from benchmarks.run_benchmarks import baseline_from_history, find_regressions, measure
+
+def test_find_regressions_flags_throughput_and_memory():
+    baseline = {"f/small": {"ops_per_s": 100.0, "peak_bytes": 10_000}}
+    ok = {"f/small": {"ops_per_s": 90.0, "peak_bytes": 11_000}}
+    slow = {"f/small": {"ops_per_s": 70.0, "peak_bytes": 20_000}}
+    assert find_regressions(ok, baseline, threshold=0.2) == []
+    assert len(find_regressions(slow, baseline, threshold=0.2)) == 2
+
+def test_memory_gate_requires_absolute_delta():
+    baseline = {"f/small": {"ops_per_s": 100.0, "peak_bytes": 10_000}}
+    noisy = {"f/small": {"ops_per_s": 100.0, "peak_bytes": 20_000}}
+    grown = {"f/small": {"ops_per_s": 100.0, "peak_bytes": 100_000}}
+    assert find_regressions(noisy, baseline, min_memory_delta=64 * 1024) == []
+    assert len(find_regressions(grown, baseline, min_memory_delta=64 * 1024)) == 1
+
+def test_baseline_uses_median_of_recent_runs():
+    history = [
+        {"results": {"f/small": {"ops_per_s": v, "peak_bytes": 1000}}}
+        for v in (10.0, 100.0, 110.0, 90.0)
+    ]
+    assert baseline_from_history(history, window=3)["f/small"]["ops_per_s"] == 100.0
+
+def test_measure_reports_metrics():
+    result = measure(lambda: sum(range(100)), min_time=0.01)
+    assert result["ops_per_s"] > 0 and result["repeats"] >= 3
@@ -0,0 +1,22 @@
+import pytest
+from src.chat_context import ChatContextManager
+
+def test_history_is_capped_and_summarized():
+    memory = ChatContextManager(window_messages=4, max_stored=6)
+    for i in range(20):
+        memory.add("user" if i % 2 == 0 else "assistant", f"Mensaje {i}. Detalle extra.")
+    assert len(memory.history) == 6
+    assert memory.total_messages == 20
+    assert "Mensaje 0." in memory.summary
+    assert "Mensaje 19" not in memory.summary
+
+def test_build_messages_respects_token_budget():
+    memory = ChatContextManager(token_budget=120, window_messages=8, max_stored=20)
+    for i in range(8):
+        memory.add("user" if i % 2 == 0 else "assistant", "x" * 160)
+    memory.add("user", "¿Qué es la TEA?")
+    messages = memory.build_messages("sistema", "¿Qué es la TEA?")
+    assert messages[0]["role"] == "system"
+    assert messages[-1] == {"role": "user", "content": "¿Qué es la TEA?"}
+    assert sum(len(m["content"]) for m in messages) / 4 <= 120
+    assert [m["content"] for m in messages].count("¿Qué es la TEA?") == 1
@@ -12,6 +12,86 @@ def test_calculate_monthly_pension():
     assert pension > 0
 
 def test_bond_present_value():
-    df, pv = bond_present_value(1000, 5, 'Anual', 5, 6)
+    df, pv, summary = bond_present_value(1000, 5, 'Anual', 5, 6)
     assert pv > 0
-    assert len(df) == 5
\ No newline at end of file
+    assert len(df) == 5
+
+def _loop_growth(initial, contributions, rates):
+    balance = initial
+    for c, r in zip(contributions, rates):
+        balance = balance * (1 + r) + c
+    return balance
+
+def test_portfolio_growth_with_piecewise_schedules():
+    from src.finance_engine import build_schedule
+    contributions = {0: 100, 2: 0, 3: 150}   # pausa en el año 2, aumento desde el año 3
+    teas = [(0, 6), (4, 9)]                  # cambio de fondo en el año 4
+    df, final = calculate_portfolio_growth(1000, contributions, 'Mensual', 5, teas)
+    c = build_schedule(contributions, 60, 12)
+    r = (1 + build_schedule(teas, 60, 12) / 100) ** (1 / 12) - 1
+    assert c[24:36].sum() == 0 and c[36] == 150
+    assert final == pytest.approx(_loop_growth(1000, c, r), rel=1e-12)
+    assert df['Saldo_Final'].iloc[-1] == pytest.approx(final)
+
+def test_portfolio_growth_rejects_wrong_schedule_length():
+    with pytest.raises(ValueError):
+        calculate_portfolio_growth(1000, [100] * 5, 'Anual', 3, 5)
+
+def test_incremental_growth_recomputes_only_suffix():
+    from src.finance_engine import IncrementalGrowth
+    plan = IncrementalGrowth(1000, 100, 'Mensual', 40, 7)
+    prefix = plan.balances[:241].copy()
+
+    edited = {0: 100, 20: 250}   # el aporte sube desde el año 20
+    first = plan.update(periodic_contribution=edited)
+
+    assert first == 240
+    assert plan.last_recomputed == 480 - 240
+    assert (plan.balances[:241] == prefix).all()
+    df, expected = calculate_portfolio_growth(1000, edited, 'Mensual', 40, 7)
+    assert plan.final_balance == pytest.approx(expected, rel=1e-12)
+    assert plan.to_frame()['Saldo_Final'].to_numpy() == pytest.approx(df['Saldo_Final'].to_numpy())
+    assert plan.update(periodic_contribution=edited) is None
+
+def test_portfolio_growth_real_values():
+    df, final = calculate_portfolio_growth(1000, 100, 'Anual', 10, 8, inflation=3)
+    assert df['Saldo_Real'].iloc[0] == pytest.approx(1000)
+    assert df['Saldo_Real'].iloc[-1] == pytest.approx(final / 1.03 ** 10)
+    assert df.attrs['cagr_real'] == pytest.approx((final / 1.03 ** 10 / 1000) ** 0.1 - 1)
+    assert 'Saldo_Real' not in calculate_portfolio_growth(1000, 100, 'Anual', 10, 8)[0]
+
+def test_pension_schedule_depletes_capital():
+    from src.finance_engine import calculate_pension_schedule
+    df, pension = calculate_pension_schedule(100000, 20, 4, inflation=[(0, 2), (10, 4)])
+    assert pension == pytest.approx(calculate_monthly_pension(100000, 20, 4))
+    assert len(df) == 240
+    assert df['Saldo_Final'].iloc[-1] == pytest.approx(0, abs=1e-6)
+    assert df['Pension_Real'].iloc[-1] == pytest.approx(pension / (1.02 ** 10 * 1.04 ** 10))
+
+def test_mixed_bond_book_matches_per_type_formulas():
+    from src.finance_engine import bond_book_value, bond_cash_flows, bond_price_batch
+    book = bond_book_value(
+        1000, [5, 0, 10], [2, 2, 1], [10, 10, 4], [6, 5, 10],
+        bond_type=['Bullet', 'Flotante', 'Amortizable'], spread=[0, 1, 0], forward_curve=3,
+        amortizing_periods=[0, 0, 2], max_cells=10
+    )
+    assert book['pv'][0] == pytest.approx(bond_price_batch(1000, 5, 2, 10, 6))
+    # Curva plana: el flotante equivale a un bullet con cupón forward + spread
+    assert book['pv'][1] == pytest.approx(bond_price_batch(1000, 4, 2, 10, 5))
+    # Cupón igual a la tasa requerida: el amortizable vale la par
+    assert book['pv'][2] == pytest.approx(1000)
+    flows = bond_cash_flows(1000, 10, 1, 4, 'Amortizable', amortizing_periods=2)
+    assert flows['principal'][0].tolist() == [0, 0, 500, 500]
+    assert flows['coupon'][0].tolist() == pytest.approx([100, 100, 100, 50])
+    df, pv, summary = bond_present_value(1000, 0, 'Semestral', 2, 5, bond_type='Flotante', spread=0.5, forward_curve=[3, 4])
+    assert df['Cupón'].tolist() == [17.5, 17.5, 22.5, 22.5]
+    with pytest.raises(ValueError):
+        bond_cash_flows(1000, 5, 2, 10, 'Perpetuo')
+
+def test_bond_exact_mode_reconciles_statement():
+    from decimal import Decimal
+    df, pv, summary = bond_present_value(1000, 7, 'Mensual', 3, 6.3, bond_type='Amortizable', exact=True)
+    cents = lambda column: sum(Decimal(str(v)) for v in df[column])
+    assert cents('Valor Presente') == Decimal(str(pv))
+    assert cents('Principal') == 1000
+    assert cents('Cupón') + cents('Principal') == cents('Flujo Total')
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from src.finance_engine import bond_price_batch
+from src.fixed_income import DAY_COUNTS, add_months, coupon_dates, dated_bond_schedule, price_bonds
+
+def test_add_months_keeps_end_of_month():
+    shifted = add_months(['2024-01-31', '2024-02-29', '2024-03-15'], 1)
+    assert shifted.astype(str).tolist() == ['2024-02-29', '2024-03-31', '2024-04-15']
+    assert coupon_dates('2024-03-10', '2025-08-31').astype(str).tolist() == ['2024-08-31', '2025-02-28', '2025-08-31']
+
+def test_settlement_on_coupon_date_matches_bullet_formula():
+    r = price_bonds(1000, 5, '2034-06-15', '2024-06-15', 6, 'Semestral', 'ACT/ACT')
+    assert r['accrued_interest'] == 0
+    assert r['remaining_coupons'] == 20
+    assert r['dirty_price'] == pytest.approx(bond_price_batch(1000, 5, 2, 10, 6))
+
+def test_accrued_interest_by_day_count():
+    # 2024-06-15 -> 2024-09-01: 78 días reales, 76 días 30/360; periodo real de 183 días
+    accrued = {dc: float(price_bonds(1000, 5, '2034-06-15', '2024-09-01', 6, 'Semestral', dc)['accrued_interest'])
+               for dc in DAY_COUNTS}
+    assert accrued['30/360'] == pytest.approx(25 * 76 / 180)
+    assert accrued['ACT/360'] == pytest.approx(50 * 78 / 360)
+    assert accrued['ACT/365'] == pytest.approx(50 * 78 / 365)
+    assert accrued['ACT/ACT'] == pytest.approx(25 * 78 / 183)
+
+def test_bonds_by_settlement_grid_and_schedule():
+    maturities = np.array(['2030-03-31', '2034-06-15', '2027-11-30'], dtype='datetime64[D]')
+    settlements = np.array(['2024-01-02', '2024-05-20'], dtype='datetime64[D]')[:, None]
+    r = price_bonds(1000, [3, 5, 7], maturities, settlements, 6, 'Trimestral', '30/360')
+    assert r['clean_price'].shape == (2, 3)
+    for s in range(2):
+        for b in range(3):
+            df, single = dated_bond_schedule(1000, [3, 5, 7][b], maturities[b], settlements[s, 0], 6, 'Trimestral', '30/360')
+            assert df['Valor Presente'].sum() == pytest.approx(r['dirty_price'][s, b])
+            assert single['clean_price'] == pytest.approx(r['clean_price'][s, b])
+    with pytest.raises(ValueError):
+        price_bonds(1000, 5, '2024-01-01', '2024-01-01', 6)
+    with pytest.raises(ValueError):
+        price_bonds(1000, 5, '2030-01-01', '2024-01-01', 6, day_count='ACT/366')
@@ -0,0 +1,20 @@
+import pytest
+from src.llm_backends import LocalBackend, StreamMetrics, stream_with_metrics, get_backend
+
+def test_local_backend_is_deterministic():
+    messages = [{"role": "user", "content": "¿Qué es la TEA?"}]
+    backend = LocalBackend()
+    assert backend.complete(messages) == backend.complete(messages)
+    assert "TEA" in backend.complete(messages)
+
+def test_stream_with_metrics_records_ttft():
+    messages = [{"role": "user", "content": "valor presente de un bono"}]
+    metrics = StreamMetrics()
+    chunks = list(stream_with_metrics(LocalBackend(), messages, metrics=metrics))
+    assert len(chunks) == metrics.chunks > 1
+    assert metrics.ttft is not None and metrics.ttft >= 0
+    assert metrics.completion_tokens > 0
+
+def test_get_backend_groq_requires_key():
+    with pytest.raises(ValueError):
+        get_backend("groq", api_key=None)
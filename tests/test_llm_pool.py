@@ -0,0 +1,34 @@
+import threading
+import pytest
+from src.llm_pool import LLMResourceManager, LLMBusyError
+
+def test_backend_is_reused_across_calls():
+    manager = LLMResourceManager()
+    assert manager.get_backend("local") is manager.get_backend("local")
+
+def test_queue_full_rejects_with_backpressure():
+    manager = LLMResourceManager(max_concurrency=1, max_queue=0, queue_timeout=0.1)
+    with manager.slot():
+        with pytest.raises(LLMBusyError):
+            with manager.slot():
+                pass
+    assert manager.stats()["rejected"] == 1
+
+def test_concurrency_is_bounded():
+    manager = LLMResourceManager(max_concurrency=2, max_queue=8)
+    peak = []
+    lock = threading.Lock()
+    messages = [{"role": "user", "content": "TEA"}]
+
+    def worker():
+        for _ in manager.get_backend("local").stream(messages):
+            with lock:
+                peak.append(manager.stats()["active"])
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(peak) <= 2
+    assert manager.stats()["completed"] == 6
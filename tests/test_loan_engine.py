@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from src.finance_engine import annuity_payment
+from src.loan_engine import amortization_schedules, calculate_loan_schedule
+
+def test_french_schedule_has_constant_installment():
+    df, total_interest = calculate_loan_schedule(10000, 12, 2, 'Mensual', 'Francés')
+    r = 1.12 ** (1 / 12) - 1
+    assert df['Cuota'].to_numpy() == pytest.approx(np.full(24, float(annuity_payment(10000, r, 24))))
+    assert df['Saldo_Final'].iloc[-1] == 0
+    assert total_interest == pytest.approx(df['Cuota'].sum() - 10000)
+
+def test_german_and_american_schedules():
+    german, _ = calculate_loan_schedule(12000, 10, 1, 'Mensual', 'Alemán')
+    assert german['Amortizacion'].to_numpy() == pytest.approx(np.full(12, 1000.0))
+    american, interest = calculate_loan_schedule(12000, 10, 1, 'Trimestral', 'Americano')
+    assert american['Amortizacion'].tolist() == [0, 0, 0, 12000]
+    assert interest == pytest.approx(4 * 12000 * (1.1 ** 0.25 - 1))
+
+def test_grace_and_prepayment():
+    partial, _ = calculate_loan_schedule(10000, 12, 1, 'Mensual', 'Francés', grace_periods=3)
+    assert partial['Amortizacion'].iloc[:3].tolist() == [0, 0, 0]
+    total, _ = calculate_loan_schedule(10000, 12, 1, 'Mensual', 'Francés', grace_periods=3, grace_type='Total')
+    assert total['Cuota'].iloc[:3].tolist() == [0, 0, 0]
+    assert total['Saldo_Final'].iloc[2] == pytest.approx(10000 * 1.12 ** 0.25)
+
+    base, base_interest = calculate_loan_schedule(10000, 12, 1)
+    prepaid, prepaid_interest = calculate_loan_schedule(10000, 12, 1, prepayments={6: 3000})
+    assert prepaid['Prepago'].iloc[5] == 3000
+    assert prepaid['Cuota'].iloc[6] < base['Cuota'].iloc[6]
+    assert prepaid_interest < base_interest
+    assert prepaid['Saldo_Final'].iloc[-1] == 0
+
+def test_loan_book_mixed_methods():
+    principal = np.array([10000, 12000, 12000])
+    result = amortization_schedules(principal, 10, [2, 1, 1], 'Mensual', ['Francés', 'Alemán', 'Americano'])
+    assert result['principal'].shape == (3, 24)
+    assert result['principal'].sum(axis=1) == pytest.approx(principal)
+    assert result['payment'][1:, 12:].sum() == 0
+    assert result['total_paid'] == pytest.approx(principal + result['total_interest'])
+
+def test_invalid_method():
+    with pytest.raises(ValueError):
+        amortization_schedules(1000, 10, 1, method='Inglés')
+
+def test_exact_mode_reconciles_to_the_cent():
+    result = amortization_schedules(
+        123456.78, [9.5, 12.3], [7, 15], method=['Francés', 'Alemán'],
+        grace_periods=6, grace_type='Total', prepayments={10: 5000.555}, exact=True
+    )
+    assert result['principal'].dtype == np.int64
+    assert (result['principal'].sum(axis=1) + result['prepayment'].sum(axis=1) == 12345678).all()
+    assert (result['payment'] == result['interest'] + result['principal'] + result['prepayment']).all()
+    df, total_interest = calculate_loan_schedule(10000, 10, 1, exact=True)
+    assert df['Saldo_Final'].iloc[-1] == 0
+    assert total_interest == pytest.approx(df['Interes'].sum(), abs=1e-9)
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from decimal import Decimal, ROUND_HALF_UP
+from src.money import allocate_cents, apply_rate, divide_cents, from_cents, round_decimal, to_cents
+
+def test_round_decimal_matches_python_round():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.uniform(-1e4, 1e4, 2000), np.arange(-2000, 2000) / 1000, [2.675, 1.115, 0.125]])
+    assert round_decimal(values, 2).tolist() == [round(v, 2) for v in values.tolist()]
+    assert round_decimal(values, 6).tolist() == [round(v, 6) for v in values.tolist()]
+    assert np.isnan(round_decimal([np.nan])[0])
+
+def test_cents_round_on_exact_binary_value():
+    values = np.array([0.125, 0.135, -0.125, 1.005, 2.5])
+    assert to_cents(values).tolist() == [12, 14, -12, 100, 250]
+    expected = [int((Decimal(v) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP)) for v in values]
+    assert to_cents(values, 'half_up').tolist() == expected
+    assert to_cents([0.129, -0.129], 'down').tolist() == [12, -12]
+    # 0.00125 es algo mayor en binario; 12 345 × 0.5 es un empate exacto (al par)
+    assert apply_rate([10_000, 12_345], [0.00125, 0.5]).tolist() == [13, 6172]
+    assert from_cents(np.array([199, -5])).tolist() == [1.99, -0.05]
+    with pytest.raises(ValueError):
+        to_cents([np.inf])
+
+def test_division_and_allocation_reconcile():
+    assert divide_cents([5, 7, -5, 10], [2, 2, 2, 4]).tolist() == [2, 4, -2, 2]
+    assert divide_cents(5, 2, 'half_up') == 3
+    parts = allocate_cents([100_000, 7], [[1, 1, 1], [1, 1, 1]])
+    assert parts.sum(axis=1).tolist() == [100_000, 7]
+    assert parts.tolist() == [[33334, 33333, 33333], [3, 2, 2]]
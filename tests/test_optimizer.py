@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from src.optimizer import (
+    covariance_from_volatility,
+    efficient_frontier,
+    max_sharpe_portfolio,
+    min_variance_portfolio,
+    portfolio_tea
+)
+
+MU = np.array([0.08, 0.10, 0.05, 0.035])
+COV = covariance_from_volatility([0.16, 0.22, 0.07, 0.04], 0.3)
+
+def _grid_weights(step=0.02):
+    ticks = np.arange(0, 1 + 1e-9, step)
+    a, b, c = np.meshgrid(ticks, ticks, ticks, indexing='ij')
+    w = np.stack([a.ravel(), b.ravel(), c.ravel()], axis=1)
+    w = w[w.sum(axis=1) <= 1 + 1e-9]
+    return np.column_stack([w, 1 - w.sum(axis=1)])
+
+def test_min_variance_beats_grid():
+    result = min_variance_portfolio(MU, COV)
+    grid = _grid_weights()
+    assert result['weights'].min() >= 0
+    assert result['weights'].sum() == pytest.approx(1)
+    assert result['volatility'] ** 2 <= np.einsum('ki,ij,kj->k', grid, COV, grid).min() + 1e-12
+
+def test_max_sharpe_beats_grid():
+    result = max_sharpe_portfolio(MU, COV, risk_free=0.02)
+    grid = _grid_weights()
+    sharpe = (grid @ MU - 0.02) / np.sqrt(np.einsum('ki,ij,kj->k', grid, COV, grid))
+    assert result['sharpe'] >= sharpe.max() - 1e-9
+
+def test_frontier_is_monotone_and_hits_targets():
+    frontier = efficient_frontier(MU, COV, n_points=40, risk_free=0.02)
+    assert frontier['weights'].shape == (40, 4)
+    assert (frontier['weights'] >= 0).all()
+    assert frontier['weights'].sum(axis=1) == pytest.approx(np.ones(40))
+    assert frontier['returns'][-1] == pytest.approx(MU.max())
+    assert (np.diff(frontier['volatilities']) >= -1e-12).all()
+    assert np.nanmax(frontier['sharpe']) <= frontier['max_sharpe']['sharpe'] + 1e-9
+
+def test_portfolio_tea_in_percent():
+    assert portfolio_tea([0.5, 0.5, 0, 0], MU) == pytest.approx(9.0)
+
+def test_rejects_covariance_that_is_not_psd():
+    cov = covariance_from_volatility(np.full(7, 0.2), -0.2)
+    with pytest.raises(ValueError, match="semidefinida positiva"):
+        efficient_frontier(np.full(7, 0.05), cov)
+    # En el límite -1/(n-1) la matriz es singular pero válida
+    frontier = efficient_frontier(np.linspace(0.03, 0.08, 6), covariance_from_volatility(np.full(6, 0.2), -0.2))
+    assert frontier["min_variance"]["volatility"] >= 0
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from src.finance_engine import calculate_portfolio_growth
+from src.portfolio_engine import (
+    calculate_multi_asset_growth,
+    lognormal_returns,
+    rebalance_interval,
+    simulate_rebalanced_portfolio
+)
+
+def test_single_asset_matches_growth_engine():
+    df, final = calculate_multi_asset_growth(1000, 100, 'Mensual', 10, [1], [7])
+    _, expected = calculate_portfolio_growth(1000, 100, 'Mensual', 10, 7)
+    assert final == pytest.approx(expected, rel=1e-12)
+    assert len(df) == 121
+
+def test_calendar_rebalance_restores_weights():
+    df, final = calculate_multi_asset_growth(1000, 100, 'Mensual', 3, [0.6, 0.4], [10, 2], rebalance_freq='Anual')
+    assert df['Rebalanceo'].sum() == 3
+    row = df[df['Periodo'] == 12].iloc[0]
+    assert row['Activo_1'] / row['Saldo_Final'] == pytest.approx(0.6)
+    assert df['Saldo_Final'].iloc[-1] == pytest.approx(final)
+
+def test_threshold_rebalance_only_drifting_scenarios():
+    returns = np.zeros((1, 2, 2))
+    returns[0, 0] = [0.5, 0.0]     # el escenario 0 se desvía; el 1 no
+    result = simulate_rebalanced_portfolio(100, 0, [0.5, 0.5], returns, 1, n_scenarios=2, threshold=0.05)
+    assert result['rebalances'].tolist() == [1, 0]
+    assert result['final_holdings'][0] == pytest.approx([62.5, 62.5])
+    assert result['turnover'][0] == pytest.approx(12.5)
+
+def test_random_scenarios_shapes():
+    returns = lognormal_returns([6, 3], [15, 5], 50, 24, 12, seed=1)
+    result = simulate_rebalanced_portfolio(1000, 50, [0.7, 0.3], returns, 24, n_scenarios=50,
+                                           rebalance_every=rebalance_interval('Trimestral', 12))
+    assert result['totals'].shape == (50, 25)
+    assert (result['rebalances'] == 8).all()
+    assert result['final_balance'] == pytest.approx(result['totals'][:, -1])
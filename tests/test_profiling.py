@@ -0,0 +1,33 @@
+import tracemalloc
+import pytest
+from src.profiling import Profiler, span, timed, start_profiler, stop_profiler
+
+@timed("test.double")
+def double(x):
+    return 2 * x
+
+def test_spans_are_recorded_per_rerun():
+    profiler = start_profiler("test", track_memory=True)
+    with span("stage.a"):
+        data = list(range(10_000))
+    assert double(2) == 4
+    assert double(3) == 6
+    assert stop_profiler() is profiler
+    stages = {r["stage"]: r for r in profiler.to_records()}
+    assert stages["test.double"]["calls"] == 2
+    assert stages["stage.a"]["mem_delta_kib"] > 0
+
+def test_spans_are_noop_without_profiler():
+    with span("ignored"):
+        pass
+    assert double(5) == 10
+    assert stop_profiler() is None
+
+def test_overlapping_profilers_share_tracemalloc():
+    assert not tracemalloc.is_tracing()
+    first = Profiler(track_memory=True)
+    second = Profiler(track_memory=True)
+    first.finish()
+    assert tracemalloc.is_tracing()
+    second.finish()
+    assert not tracemalloc.is_tracing()
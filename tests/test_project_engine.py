@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from src.project_engine import (
+    evaluate_projects,
+    irr,
+    mirr,
+    npv,
+    payback_period,
+    profitability_index
+)
+
+CASH_FLOWS = np.array([
+    [-1000, 300, 400, 500, 200],
+    [-500, 200, 200, 200, 0],
+    [-1000, 100, 100, 100, 100]
+], dtype=float)
+
+def test_npv_matches_explicit_discounting():
+    expected = [sum(c / 1.1 ** t for t, c in enumerate(row)) for row in CASH_FLOWS]
+    assert npv(CASH_FLOWS, 10) == pytest.approx(expected)
+    assert npv(CASH_FLOWS, [10, 10, 10]) == pytest.approx(expected)
+
+def test_irr_zeroes_npv():
+    rates = irr(CASH_FLOWS)
+    assert npv(CASH_FLOWS, rates) == pytest.approx(np.zeros(3), abs=1e-8)
+    assert np.isnan(irr([[100, 50, 20]]))[0]
+
+def test_irr_all_zero_flows_has_no_root():
+    rates, count = irr([[0, 0, 0], [-100, 110, 0]], return_count=True)
+    assert np.isnan(rates[0]) and count[0] == 0
+    assert rates[1] == pytest.approx(10) and count[1] == 1
+
+def test_irr_with_multiple_sign_changes():
+    flows = [[-100, 230, -132]]     # TIR de 10% y 20%
+    rates, count = irr(flows, return_count=True)
+    assert rates[0] == pytest.approx(10)
+    assert count[0] == 2
+    assert irr(flows, guess=25)[0] == pytest.approx(20)
+
+@pytest.mark.filterwarnings("error")
+def test_irr_long_horizon_without_overflow():
+    # 30 años mensuales: TIR positiva y negativa (v > 1) sin desbordar v^t
+    flows = np.array([
+        np.r_[-100000, np.full(360, 900.0)],
+        np.r_[-100000, np.full(360, 200.0)]
+    ])
+    rates, count = irr(flows, return_count=True)
+    assert count.tolist() == [1, 1]
+    assert rates[1] < 0
+    assert npv(flows, rates) == pytest.approx(np.zeros(2), abs=1e-4)
+
+def test_mirr_payback_and_index():
+    assert mirr([[-1000, 500, 500, 500]], 10, 10)[0] == pytest.approx(((500 * (1.21 + 1.1 + 1)) / 1000) ** (1 / 3) * 100 - 100)
+    assert payback_period(CASH_FLOWS)[:2] == pytest.approx([2.6, 2.5])
+    assert np.isnan(payback_period(CASH_FLOWS)[2])
+    assert profitability_index(CASH_FLOWS, 10) == pytest.approx(npv(CASH_FLOWS, 10) / -CASH_FLOWS[:, 0] + 1)
+
+def test_evaluate_projects_ranks_by_npv():
+    df = evaluate_projects(CASH_FLOWS, 10, names=['A', 'B', 'C'])
+    assert df['Proyecto'].tolist() == ['A', 'B', 'C']
+    assert df['Ranking'].tolist() == [1, 2, 3]
+    assert set(df.columns) >= {'VAN', 'TIR', 'TIRM', 'Payback', 'Payback_Descontado', 'IR'}
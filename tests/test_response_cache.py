@@ -0,0 +1,36 @@
+import pytest
+from src.response_cache import ResponseCache, normalize_question
+
+def test_normalize_question():
+    assert normalize_question("¿Qué es la  TEA?") == "que es la tea"
+    assert normalize_question("  valor presente de un BONO ") == "valor presente de un bono"
+
+def test_hit_requires_same_context():
+    cache = ResponseCache()
+    cache.put("¿Qué es la TEA?", "ctx-1", "respuesta")
+    assert cache.get("que es la tea", "ctx-1") == "respuesta"
+    assert cache.get("que es la tea", "ctx-2") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+def test_ttl_and_lru_eviction():
+    now = [0.0]
+    cache = ResponseCache(max_entries=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", "", "1")
+    cache.put("b", "", "2")
+    cache.get("a", "")
+    cache.put("c", "", "3")
+    assert cache.get("b", "") is None
+    now[0] = 11.0
+    assert cache.get("a", "") is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["expirations"] == 1
+
+def test_follow_up_depends_on_conversation_history():
+    cache = ResponseCache()
+    earlier = [{"role": "user", "content": "¿Qué es la TEA?"}, {"role": "assistant", "content": "..."}]
+    cache.put("Explícalo con un ejemplo", "ctx", "ejemplo de TEA", history=earlier)
+    assert cache.get("explicalo con un ejemplo", "ctx", history=earlier) == "ejemplo de TEA"
+    assert cache.get("explicalo con un ejemplo", "ctx") is None
+    other = [{"role": "user", "content": "¿Qué es un bono?"}, {"role": "assistant", "content": "..."}]
+    assert cache.get("explicalo con un ejemplo", "ctx", history=other) is None
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from src.finance_engine import (
+    IncrementalGrowth,
+    calculate_portfolio_growth,
+    simulate_pension,
+    simulate_portfolio_growth,
+)
+
+
+def test_growth_result_frame_shares_engine_arrays():
+    result = simulate_portfolio_growth(1000, 100, 'Mensual', 10, 6, inflation=3)
+    df = result.to_frame()
+    assert not hasattr(result, '__dict__')
+    assert np.shares_memory(df['Saldo_Final'].to_numpy(), result.balances)
+    assert np.shares_memory(df['Deflactor'].to_numpy(), result.deflator)
+    assert df.attrs['cagr_real'] == result.cagr_real
+    assert result.final_real_balance == df['Saldo_Real'].iloc[-1]
+    copied = result.to_frame(copy=True)
+    assert not np.shares_memory(copied['Saldo_Final'].to_numpy(), result.balances)
+    assert result.nbytes < df.memory_usage(deep=True).sum()
+
+
+def test_growth_result_matches_calculate_portfolio_growth():
+    df, balance = calculate_portfolio_growth(500, {0: 50, 3: 80}, 'Trimestral', 8, [(0, 4), (5, 7)])
+    result = simulate_portfolio_growth(500, {0: 50, 3: 80}, 'Trimestral', 8, [(0, 4), (5, 7)])
+    pd.testing.assert_frame_equal(result.to_frame(), df)
+    assert result.final_balance == balance
+    assert result.cagr_real is None and df.attrs == {}
+
+
+def test_incremental_result_is_a_snapshot():
+    growth = IncrementalGrowth(1000, 100, 'Mensual', 5, 5)
+    snapshot = growth.result()
+    before = snapshot.final_balance
+    growth.update(tea=8)
+    assert snapshot.final_balance == before < growth.final_balance
+
+
+def test_pension_result_real_values():
+    result = simulate_pension(100000, 20, 6, inflation=3)
+    df = result.to_frame()
+    assert len(df) == len(result) == 240
+    assert result.last_real_pension == df['Pension_Real'].iloc[-1]
+    assert abs(result.final_balance) < 1e-6
+    assert simulate_pension(0, 10, 5).to_frame().empty
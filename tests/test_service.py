@@ -0,0 +1,58 @@
+import asyncio
+import json
+import pytest
+from src.finance_engine import calculate_portfolio_growth, bond_present_value
+from service.handlers import parse_bond, parse_portfolio, run_portfolio
+from service.server import SimulationService
+
+def test_batched_portfolio_matches_engine():
+    params, errors = parse_portfolio({
+        "initial_amount": 1000, "periodic_contribution": 100,
+        "contribution_freq": "Mensual", "years": 10, "tea": 7
+    })
+    assert errors == []
+    _, expected = calculate_portfolio_growth(1000, 100, 'Mensual', 10, 7)
+    assert run_portfolio([params])[0]["final_balance"] == pytest.approx(expected)
+
+def test_bond_use_tea_parses_text_flags():
+    item = {"face_value": 1000, "coupon_rate": 5, "years_to_maturity": 3, "required_yield": 6}
+    assert parse_bond({**item, "use_tea": "false"})[0]["use_tea"] is False
+    assert parse_bond({**item, "use_tea": "0"})[0]["use_tea"] is False
+    assert parse_bond(item)[0]["use_tea"] is True
+    params, errors = parse_bond({**item, "use_tea": 1})
+    assert params is None and errors == ["El campo 'use_tea' debe ser booleano."]
+
+async def _post(port, path, payload):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+def test_service_batches_concurrent_requests():
+    async def scenario():
+        service = SimulationService(workers=1, use_threads=True, max_wait_ms=20)
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            bond = {"face_value": 1000, "coupon_rate": 5, "payment_freq": "Anual",
+                    "years_to_maturity": 5, "required_yield": 6}
+            responses = await asyncio.gather(*(_post(port, "/bond", bond) for _ in range(10)))
+            invalid = await _post(port, "/pension", {"capital": 1000, "retirement_years": 0,
+                                                     "tea_retirement": 3})
+            return responses, invalid, service.metrics()
+        finally:
+            await service.stop()
+
+    responses, invalid, metrics = asyncio.run(scenario())
+    _, pv, _ = bond_present_value(1000, 5, 'Anual', 5, 6)
+    assert all(status == 200 for status, _ in responses)
+    assert responses[0][1]["pv_total"] == pytest.approx(pv, abs=0.01)
+    assert metrics["operations"]["/bond"]["batches"] < 10
+    assert invalid[0] == 422
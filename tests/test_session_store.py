@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.finance_engine import simulate_portfolio_growth
+from src.session_store import MemoryRegistry, SessionStore, estimate_size
+
+KB = 1024
+
+
+def test_estimate_size_measures_arrays_and_results():
+    result = simulate_portfolio_growth(1000, 100, 'Mensual', 30, 5)
+    assert estimate_size(result) == result.nbytes
+    assert estimate_size({'x': np.zeros(1000)}) > 8000
+    df = pd.DataFrame({'a': np.zeros(500)})
+    assert estimate_size(df) >= 4000
+
+
+def test_over_budget_spills_lru_and_reloads(tmp_path):
+    store = SessionStore(budget=100 * KB, spill_dir=str(tmp_path), spill_threshold=10 * KB)
+    store['a'] = {'df': pd.DataFrame({'x': np.arange(8000.0)})}
+    store['b'] = {'df': pd.DataFrame({'x': np.arange(8000.0)})}
+    stats = store.stats()
+    assert stats['spilled_entries'] == 1 and store.resident_bytes <= 100 * KB
+    assert len(os.listdir(tmp_path)) == 1
+    # 'a' era la menos usada: se recarga del disco y ahora se vuelca 'b'
+    assert store['a']['df']['x'].iloc[-1] == 7999.0
+    assert store.stats()['loads'] == 1
+    store.clear()
+    assert os.listdir(tmp_path) == [] and len(store) == 0
+
+
+def test_without_spill_dir_entries_are_evicted():
+    store = SessionStore(budget=100 * KB, spill_dir=None, spill_threshold=10 * KB)
+    store.put('chat', ['mensaje'] * 10, spill=False)
+    store['a'] = np.zeros(10000)
+    store['b'] = np.zeros(10000)
+    assert 'a' not in store and 'chat' in store
+    assert store.stats()['evictions'] == 1
+    with pytest.raises(KeyError):
+        store['a']
+
+
+def test_global_budget_frees_idle_sessions_first(tmp_path):
+    registry = MemoryRegistry(budget=150 * KB)
+    idle = SessionStore(budget=1024 * KB, spill_dir=str(tmp_path), registry=registry)
+    active = SessionStore(budget=1024 * KB, spill_dir=str(tmp_path), registry=registry)
+    idle['schedule'] = np.zeros(12000)
+    active['schedule'] = np.zeros(12000)
+    assert registry.resident_bytes <= 150 * KB
+    assert idle.stats()['spilled_entries'] == 1 and active.stats()['spilled_entries'] == 0
+    stats = registry.stats()
+    assert stats['sessions'] == 2 and stats['enforcements'] == 1
+    assert 'vector_hits' in stats['discount_cache']
@@ -1,7 +1,12 @@
 import pytest
-from src.tax_engine import apply_tax
+from src.tax_engine import TAX_RATES, apply_tax, apply_tax_batch
 
 def test_apply_tax_foreign():
     tax, net = apply_tax(1000, 800, 'Fuente extranjera (29.5%)')
     assert tax == 200 * 0.295
-    assert net == 1000 - tax
\ No newline at end of file
+    assert net == 1000 - tax
+
+def test_scalar_and_batch_share_rates():
+    types = [*TAX_RATES, 'Ninguno']
+    tax, net = apply_tax_batch([1500.0] * len(types), 1000.0, types)
+    assert [apply_tax(1500.0, 1000.0, t) for t in types] == list(zip(tax.tolist(), net.tolist()))
@@ -0,0 +1,39 @@
+import threading
+import pytest
+from src.tts import AudioCache, TTSService
+
+def test_tts_service_caches_by_text():
+    calls = []
+
+    def fake_synthesize(text, lang):
+        calls.append(text)
+        return f"mp3:{text}".encode("utf-8")
+
+    service = TTSService(synthesize=fake_synthesize)
+    assert service.submit("hola").result(timeout=5) == b"mp3:hola"
+    assert service.submit("hola").result(timeout=5) == b"mp3:hola"
+    assert calls == ["hola"]
+    assert service.cache.stats()["hits"] == 1
+
+def test_concurrent_requests_share_one_synthesis():
+    release = threading.Event()
+    calls = []
+
+    def slow_synthesize(text, lang):
+        calls.append(text)
+        release.wait(5)
+        return b"audio"
+
+    service = TTSService(synthesize=slow_synthesize)
+    first = service.submit("bono")
+    second = service.submit("bono")
+    release.set()
+    assert first.result(timeout=5) == second.result(timeout=5) == b"audio"
+    assert calls == ["bono"]
+
+def test_audio_cache_is_bounded_by_bytes():
+    cache = AudioCache(max_bytes=10)
+    cache.put("a", b"123456")
+    cache.put("b", b"123456")
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 6
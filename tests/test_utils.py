@@ -1,10 +1,33 @@
 import pytest
-from src.utils import convert_tea_to_periodic, validate_inputs
+from src.utils import convert_tea_to_periodic, validate_module_a
 
 def test_convert_tea_to_monthly():
     r = convert_tea_to_periodic(0.12, 12)
     assert abs((1 + r)**12 - 1.12) < 1e-10
 
 def test_validate_negative_amount():
-    errors = validate_inputs(initial_amount=-100)
-    assert len(errors) == 1
\ No newline at end of file
+    errors = validate_module_a(initial_amount=-100, periodic_contribution=100, tea=5, years=10)
+    assert len(errors) == 1
+
+def test_validate_module_a_batch_matches_scalar():
+    from src.utils import validate_module_a_batch, INITIAL_NEGATIVE, TEA_OUT_OF_RANGE
+    result = validate_module_a_batch([100, -1, float('nan')], [10, 10, 10], [5, 5, 51], [10, 10, 10])
+    assert result.valid.tolist() == [True, False, False]
+    assert result.codes.tolist() == [0, INITIAL_NEGATIVE, INITIAL_NEGATIVE | TEA_OUT_OF_RANGE]
+    assert result.messages(1) == validate_module_a(initial_amount=-1, periodic_contribution=10, tea=5, years=10)
+    assert list(result.errors()) == [1, 2]
+
+def test_periodic_rate_kinds_and_shared_discount_vector():
+    from src.utils import annuity_factor, discount_factors, periodic_rate
+    import numpy as np
+    assert abs(periodic_rate(0.12, 12, 'TNA') - 0.01) < 1e-15
+    assert abs(periodic_rate(0.12, 12, 'continua') - np.expm1(0.01)) < 1e-15
+    assert np.allclose(periodic_rate(np.array([0.12, 0.06]), 12), [(1.12) ** (1 / 12) - 1, (1.06) ** (1 / 12) - 1])
+    v = discount_factors(0.12, 12, 24)
+    assert v is discount_factors(0.12, 12, 24)
+    assert not v.flags.writeable
+    i = periodic_rate(0.12, 12)
+    assert abs(annuity_factor(0.12, 12, 24) - v.sum()) < 1e-9
+    assert abs(v[-1] - (1 + i) ** -24) < 1e-15
+    with pytest.raises(ValueError):
+        periodic_rate(0.12, 12, 'simple')
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from src.valuation_engine import (
+    calculate_wacc,
+    cost_of_equity_capm,
+    enterprise_value_exit_multiple,
+    enterprise_value_gordon,
+    project_free_cash_flows,
+    sensitivity_table
+)
+
+def test_wacc_from_capital_structure():
+    ke = cost_of_equity_capm(4, 1.2, 5.5)
+    assert ke == pytest.approx(10.6)
+    assert calculate_wacc(600, 400, ke, 7, 30) == pytest.approx(0.6 * 10.6 + 0.4 * 7 * 0.7)
+    with pytest.raises(ValueError):
+        calculate_wacc(0, 0, ke, 7, 30)
+
+def test_free_cash_flow_projection():
+    df = project_free_cash_flows(1000, 3, 10, 20, 5, 6, 10, 30)
+    assert df['Ventas'].to_numpy() == pytest.approx([1100, 1210, 1331])
+    first = df.iloc[0]
+    assert first['FCF'] == pytest.approx((220 - 55) * 0.7 + 55 - 66 - 10)
+
+def test_gordon_and_multiple_valuation():
+    fcf = np.array([100.0, 110.0, 120.0])
+    ev, pv_terminal = enterprise_value_gordon(fcf, 10, 2)
+    explicit = sum(f / 1.1 ** t for t, f in enumerate(fcf, start=1))
+    assert pv_terminal == pytest.approx(120 * 1.02 / 0.08 / 1.1 ** 3)
+    assert ev == pytest.approx(explicit + pv_terminal)
+    ev_m, _ = enterprise_value_exit_multiple(fcf, 10, 8, 200)
+    assert ev_m == pytest.approx(explicit + 8 * 200 / 1.1 ** 3)
+
+def test_sensitivity_table_matches_pointwise():
+    fcf = np.array([100.0, 110.0, 120.0])
+    table = sensitivity_table(fcf, [8, 9, 10], [1, 2, 9], net_debt=50)
+    assert table.shape == (3, 3)
+    assert table.loc[9, 2] == pytest.approx(enterprise_value_gordon(fcf, 9, 2)[0] - 50)
+    assert np.isnan(table.loc[8, 9])
+    multiples = sensitivity_table(fcf, [8, 9], [6, 8], 'multiple', terminal_metric=200)
+    assert multiples.loc[8, 6] == pytest.approx(enterprise_value_exit_multiple(fcf, 8, 6, 200)[0])
@@ -0,0 +1,103 @@
+import math
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from src.optimizer import covariance_from_volatility, efficient_frontier, portfolio_tea
+from src.profiling import span
+
+TEA_KEY = "module_a_tea"
+
+DEFAULT_ASSETS = pd.DataFrame({
+    "Activo": ["Acciones globales", "Acciones emergentes", "Bonos corporativos", "Bonos del tesoro", "Oro"],
+    "Retorno esperado (%)": [8.0, 10.0, 5.0, 3.5, 4.0],
+    "Volatilidad (%)": [16.0, 22.0, 7.0, 4.0, 15.0]
+})
+
+
+def _use_tea(tea):
+    # Callback: se ejecuta antes del siguiente rerun, cuando el slider aún no existe
+    st.session_state[TEA_KEY] = float(min(max(round(tea, 1), 0.1), 50.0))
+
+
+def _min_correlation(n_assets, step=0.05):
+    """Correlación común mínima válida (-1/(n-1)), redondeada al paso del slider."""
+    if n_assets < 2:
+        return -0.2
+    bound = max(-0.2, -1 / (n_assets - 1))
+    return round(math.ceil(bound / step - 1e-9) * step, 2)
+
+
+def render_allocation_advisor():
+    """Asesor de asignación: frontera eficiente y envío de la TEA al Módulo A."""
+    with st.expander("🧭 Asesor de asignación (frontera eficiente)"):
+        st.caption(
+            "Define los activos con su retorno esperado y volatilidad anual. Se calcula la "
+            "frontera eficiente sin ventas en corto y puedes usar la TEA esperada de una "
+            "cartera en el simulador."
+        )
+        assets = st.data_editor(DEFAULT_ASSETS, num_rows="dynamic", key="allocation_assets")
+        col1, col2, col3 = st.columns(3)
+        correlation = col1.slider(
+            "Correlación entre activos", _min_correlation(len(assets.dropna())), 1.0, 0.3, 0.05,
+            help="Con n activos, una correlación común menor a -1/(n-1) no es una matriz válida."
+        )
+        risk_free = col2.number_input("Tasa libre de riesgo (%)", 0.0, 20.0, 2.0, 0.1)
+        n_points = col3.slider("Puntos de la frontera", 10, 200, 50, 10)
+
+        assets = assets.dropna()
+        if len(assets) < 2:
+            st.info("Agrega al menos dos activos.")
+            return
+        mu = assets["Retorno esperado (%)"].to_numpy(dtype=float) / 100
+        vol = assets["Volatilidad (%)"].to_numpy(dtype=float) / 100
+        if (vol <= 0).any():
+            st.error("La volatilidad de cada activo debe ser mayor a cero.")
+            return
+        try:
+            frontier = efficient_frontier(
+                mu, covariance_from_volatility(vol, correlation), n_points, risk_free / 100
+            )
+        except (ValueError, np.linalg.LinAlgError) as e:
+            st.error(f"No se pudo calcular la frontera: {e}")
+            return
+
+        with span("plotly.figure"):
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=frontier["volatilities"] * 100, y=frontier["returns"] * 100,
+                mode="lines", name="Frontera eficiente", line=dict(color="#0074C2", width=3)
+            ))
+            fig.add_trace(go.Scatter(
+                x=vol * 100, y=mu * 100, mode="markers+text", text=assets["Activo"],
+                textposition="top center", name="Activos", marker=dict(color="#FFB703", size=9)
+            ))
+            specials = [("Mínima varianza", frontier["min_variance"], "#0B7F72")]
+            if frontier["max_sharpe"] is not None:
+                specials.append(("Máximo Sharpe", frontier["max_sharpe"], "#D63F80"))
+            for label, portfolio, color in specials:
+                fig.add_trace(go.Scatter(
+                    x=[portfolio["volatility"] * 100], y=[portfolio["return"] * 100],
+                    mode="markers", name=label, marker=dict(color=color, size=13, symbol="star")
+                ))
+            fig.update_layout(
+                xaxis_title="Volatilidad anual (%)", yaxis_title="Retorno esperado (%)",
+                template="plotly_white", margin=dict(t=30, b=40, l=60, r=20)
+            )
+        with span("render.plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True, key="allocation_frontier")
+
+        weights = pd.DataFrame(
+            {label: portfolio["weights"] * 100 for label, portfolio, _ in specials},
+            index=assets["Activo"]
+        ).round(2)
+        st.dataframe(weights)
+
+        for label, portfolio, _ in specials:
+            tea = portfolio_tea(portfolio["weights"], mu)
+            st.button(
+                f"Usar TEA de la cartera «{label}» ({tea:.2f}%)",
+                on_click=_use_tea, args=(tea,), key=f"use_tea_{label}"
+            )
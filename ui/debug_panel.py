@@ -0,0 +1,53 @@
+import json
+import streamlit as st
+import pandas as pd
+from src.session_store import get_memory_registry
+from ui.session import MB, get_session_store
+
+# Reruns que se conservan por sesión para exportar métricas
+MAX_RUNS = 20
+
+
+def is_debug_enabled():
+    """El panel es opcional: se activa con ?debug=1 o DEBUG_PROFILING en secrets."""
+    if st.query_params.get("debug") == "1":
+        return True
+    try:
+        return bool(st.secrets.get("DEBUG_PROFILING", False))
+    except Exception:
+        return False
+
+
+def render_debug_panel(profiler):
+    """Muestra en la barra lateral los tiempos por etapa del rerun actual."""
+    if profiler is None:
+        return
+    session_memory = get_session_store().stats()
+    global_memory = get_memory_registry().stats()
+    runs = st.session_state.setdefault("profiling_runs", [])
+    runs.append({**profiler.as_dict(), "memory": session_memory})
+    del runs[:-MAX_RUNS]
+
+    with st.sidebar.expander("🛠️ Diagnóstico de rendimiento", expanded=False):
+        st.caption(f"Rerun `{profiler.label}` — {profiler.wall_s * 1000:,.1f} ms en total")
+        records = profiler.to_records()
+        if records:
+            st.dataframe(pd.DataFrame(records), hide_index=True, use_container_width=True)
+        else:
+            st.caption("Sin etapas instrumentadas en este rerun.")
+        st.caption(
+            f"Memoria de la sesión: {session_memory['resident_bytes'] / MB:,.2f} MB de "
+            f"{session_memory['budget_bytes'] / MB:,.0f} MB · {session_memory['spilled_entries']} entradas en disco"
+        )
+        st.caption(
+            f"Proceso: {global_memory['sessions']} sesiones, {global_memory['resident_bytes'] / MB:,.2f} MB de "
+            f"{global_memory['budget_bytes'] / MB:,.0f} MB · caché de descuento "
+            f"{global_memory['discount_cache']['vectors_cached']} vectores"
+        )
+        st.download_button(
+            label="⬇️ Exportar métricas (JSON Lines)",
+            data="\n".join(json.dumps(r, ensure_ascii=False) for r in runs),
+            file_name="metricas_rendimiento.jsonl",
+            mime="application/json",
+            key="export_profiling"
+        )
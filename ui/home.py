@@ -25,6 +25,7 @@ def render_home():
     - 📈 **Proyectar** el crecimiento de tus inversiones
     - 💰 **Calcular** tu pensión de jubilación esperada
     - 📊 **Valorar** bonos e instrumentos de renta fija
+    - 🏢 **Valorar** empresas por flujos de caja descontados (DCF)
     - 📄 **Exportar** reportes profesionales en PDF
     """)
     
@@ -109,7 +110,7 @@ def render_home():
         
         1. Comienza con el **Módulo A** para calcular tu capital acumulado
         2. Usa ese resultado en el **Módulo B** para ver tu pensión
-        3. Opcionalmente, calcula bonos en el **Módulo C**
+        3. Opcionalmente, calcula bonos en el **Módulo C** o valora una empresa en el **Módulo D**
         4. Exporta todo a un **PDF profesional**
         
         ### Tips útiles:
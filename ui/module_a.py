@@ -2,15 +2,21 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from io import BytesIO
-from src.finance_engine import calculate_portfolio_growth
+from src.finance_engine import simulate_portfolio_growth
 from src.utils import validate_module_a
+from src.profiling import span
+from ui.session import get_session_store
+from ui.allocation import TEA_KEY, render_allocation_advisor
 import json
 
 def render_module_a(help_texts):
     st.header("💰 Módulo A — Simulador de Crecimiento de Cartera")
     st.caption("Simula cómo crecería tu inversión con diferentes tasas, plazos y aportes periódicos.")
 
+    render_allocation_advisor()
+
     # --- ENTRADAS ---
+    st.session_state.setdefault(TEA_KEY, 5.0)
     col1, col2 = st.columns(2)
     with col1:
         initial_amount = st.number_input(
@@ -36,9 +42,14 @@ def render_module_a(help_texts):
         )
         tea = st.slider(
             "Tasa Efectiva Anual (TEA %)",
-            min_value=0.1, max_value=50.0, value=5.0, step=0.1,
+            min_value=0.1, max_value=50.0, step=0.1, key=TEA_KEY,
             help=help_texts.get("tea", "")
         )
+        inflation = st.slider(
+            "Inflación anual esperada (%)",
+            min_value=0.0, max_value=20.0, value=0.0, step=0.1,
+            help=help_texts.get("inflacion", "Si es mayor a 0, se muestran también los valores reales (en USD de hoy).")
+        )
         st.markdown("**Comparar con varias TEA (opcional):**")
         tea_options = [f"{x:.1f}%" for x in [i * 0.5 for i in range(1, 101)]]
         default_str = f"{tea:.1f}%"
@@ -62,6 +73,7 @@ def render_module_a(help_texts):
             - 🔁 **Frecuencia:** {contribution_freq}  
             - ⏳ **Plazo:** {years} años  
             - 📈 **TEA principal:** {tea:.2f}%  
+            - 🏷️ **Inflación:** {inflation:.2f}%  
             - 📊 **TEAs comparadas:** {', '.join([f'{t:.1f}%' for t in selected_teas])}
             """
         )
@@ -83,25 +95,23 @@ def render_module_a(help_texts):
                 return
 
             # --- CÁLCULOS ---
+            # La serie principal incluye columnas reales si hay inflación
+            main_inflation = inflation if inflation > 0 else None
             series_results = {}
-            for r in selected_teas:
-                df_r, final_r = calculate_portfolio_growth(
-                    initial_amount, periodic_contribution, contribution_freq, years, r
+            for r in sorted(set(selected_teas) | {tea}):
+                growth_r = simulate_portfolio_growth(
+                    initial_amount, periodic_contribution, contribution_freq, years, r,
+                    inflation=main_inflation if r == tea else None
                 )
+                if r == tea:
+                    main_result = growth_r
+                df_r, final_r = growth_r.to_frame(), growth_r.final_balance
                 # Convertir columnas a numéricas
-                df_r['Aporte'] = pd.to_numeric(df_r['Aporte'], errors='coerce').fillna(0)
-                df_r['Saldo_Final'] = pd.to_numeric(df_r['Saldo_Final'], errors='coerce').fillna(0)
+                with span("pandas.to_numeric"):
+                    df_r['Aporte'] = pd.to_numeric(df_r['Aporte'], errors='coerce').fillna(0)
+                    df_r['Saldo_Final'] = pd.to_numeric(df_r['Saldo_Final'], errors='coerce').fillna(0)
                 series_results[r] = (df_r, final_r)
-
-            if tea not in series_results:
-                df_main, final_balance = calculate_portfolio_growth(
-                    initial_amount, periodic_contribution, contribution_freq, years, tea
-                )
-                df_main['Aporte'] = pd.to_numeric(df_main['Aporte'], errors='coerce').fillna(0)
-                df_main['Saldo_Final'] = pd.to_numeric(df_main['Saldo_Final'], errors='coerce').fillna(0)
-                series_results[tea] = (df_main, final_balance)
-            else:
-                df_main, final_balance = series_results[tea]
+            df_main, final_balance = series_results[tea]
 
             # --- CÁLCULO TOTAL DE APORTES ---
             freq_map = {"Mensual": 12, "Trimestral": 4, "Semestral": 2, "Anual": 1}
@@ -122,40 +132,56 @@ def render_module_a(help_texts):
             colm4.metric("ROI (%)", f"{roi_percent:.2f}%")
             colm5.metric("CAGR aprox. (%)", f"{cagr * 100:.2f}%")
 
+            if main_inflation is not None:
+                final_real = float(df_main['Saldo_Real'].iloc[-1])
+                colr1, colr2 = st.columns(2)
+                colr1.metric("🏷️ Capital real (USD de hoy)", f"${final_real:,.2f}")
+                colr2.metric("CAGR real (%)", f"{df_main.attrs['cagr_real'] * 100:.2f}%")
+
             # --- GRÁFICO INTERACTIVO ---
             st.subheader("📈 Evolución del fondo (interactivo)")
-            colors = ["#0074C2", '#FFB703', "#0B7F72", "#740B0B", "#3A008B", "#D63F80", '#06D6A0', '#118AB2']
-            fig = go.Figure()
-            for i, r in enumerate(sorted(series_results.keys())):
-                df_r, final_r = series_results[r]
-                color = colors[i % len(colors)]
-                fig.add_trace(go.Scatter(
-                    x=df_r['Periodo'],
-                    y=df_r['Saldo_Final'],
-                    mode='lines+markers',
-                    name=f"Saldo Total ({r:.1f}%)",
-                    line=dict(color=color, width=3),
-                    marker=dict(size=4)
-                ))
-                if r == tea:
+            with span("plotly.figure"):
+                colors = ["#0074C2", '#FFB703', "#0B7F72", "#740B0B", "#3A008B", "#D63F80", '#06D6A0', '#118AB2']
+                fig = go.Figure()
+                for i, r in enumerate(sorted(series_results.keys())):
+                    df_r, final_r = series_results[r]
+                    color = colors[i % len(colors)]
                     fig.add_trace(go.Scatter(
                         x=df_r['Periodo'],
-                        y=df_r['Aporte'].cumsum() + initial_amount,
-                        mode='lines',
-                        name='Aportes acumulados',
-                        line=dict(color="#29E914", width=2, dash='dash')
+                        y=df_r['Saldo_Final'],
+                        mode='lines+markers',
+                        name=f"Saldo Total ({r:.1f}%)",
+                        line=dict(color=color, width=3),
+                        marker=dict(size=4)
                     ))
-
-            fig.update_layout(
-                title=dict(text='Crecimiento del capital a lo largo del tiempo', x=0.5),
-                xaxis_title='Periodo',
-                yaxis_title='Saldo (USD)',
-                template='plotly_white',
-                hovermode='x unified',
-                legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=0.5),
-                margin=dict(t=60, b=60, l=60, r=40)
-            )
-            st.plotly_chart(fig, use_container_width=True, key=f"chart_{round(tea,1)}")
+                    if r == tea:
+                        fig.add_trace(go.Scatter(
+                            x=df_r['Periodo'],
+                            y=df_r['Aporte'].cumsum() + initial_amount,
+                            mode='lines',
+                            name='Aportes acumulados',
+                            line=dict(color="#29E914", width=2, dash='dash')
+                        ))
+                        if 'Saldo_Real' in df_r:
+                            fig.add_trace(go.Scatter(
+                                x=df_r['Periodo'],
+                                y=df_r['Saldo_Real'],
+                                mode='lines',
+                                name=f"Saldo real (inflación {inflation:.1f}%)",
+                                line=dict(color=color, width=2, dash='dot')
+                            ))
+
+                fig.update_layout(
+                    title=dict(text='Crecimiento del capital a lo largo del tiempo', x=0.5),
+                    xaxis_title='Periodo',
+                    yaxis_title='Saldo (USD)',
+                    template='plotly_white',
+                    hovermode='x unified',
+                    legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=0.5),
+                    margin=dict(t=60, b=60, l=60, r=40)
+                )
+            with span("render.plotly_chart"):
+                st.plotly_chart(fig, use_container_width=True, key=f"chart_{round(tea,1)}")
 
             # --- INTERPRETACIÓN ---
             st.subheader("💬 Interpretación rápida")
@@ -179,11 +205,13 @@ def render_module_a(help_texts):
 
             # --- TABLA DETALLE ---
             with st.expander("🔍 Ver detalles por periodo"):
-                st.dataframe(df_main.round(2))
+                with span("render.dataframe"):
+                    st.dataframe(df_main.round(2))
 
             # --- EXPORTAR ---
             st.subheader("📥 Exportar resultados")
-            csv = df_main.to_csv(index=False).encode('utf-8')
+            with span("export.csv"):
+                csv = df_main.to_csv(index=False).encode('utf-8')
             st.download_button(
                 label="⬇️ Descargar CSV",
                 data=csv,
@@ -192,10 +220,11 @@ def render_module_a(help_texts):
             )
 
             try:
-                buffer = BytesIO()
-                with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                    df_main.to_excel(writer, index=False, sheet_name='Periodos')
-                buffer.seek(0)
+                with span("export.excel"):
+                    buffer = BytesIO()
+                    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+                        df_main.to_excel(writer, index=False, sheet_name='Periodos')
+                    buffer.seek(0)
                 st.download_button(
                     label="⬇️ Descargar Excel",
                     data=buffer,
@@ -206,15 +235,18 @@ def render_module_a(help_texts):
                 st.info("La exportación a Excel no está disponible en este entorno.")
 
             # --- GUARDAR SESIÓN ---
-            st.session_state['module_a_result'] = {
-                'df': df_main,
+            # Solo los arrays del motor: el DataFrame se rearma al exportar
+            get_session_store()['module_a_result'] = {
+                'result': main_result,
                 'final_balance': final_balance,
                 'initial_amount': initial_amount,
                 'years': years,
                 'tea': tea,
                 'total_contrib': total_contrib,
                 'roi_percent': roi_percent,
-                'cagr': cagr
+                'cagr': cagr,
+                'inflation': inflation,
+                'cagr_real': main_result.cagr_real
             }
             st.success("✅ Resultados del Módulo A guardados correctamente para el chatbot.")
 
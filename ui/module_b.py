@@ -1,16 +1,18 @@
 import streamlit as st
-from src.finance_engine import calculate_monthly_pension
+from src.finance_engine import calculate_monthly_pension, simulate_pension
 from src.tax_engine import apply_tax
 from src.utils import validate_module_b
+from ui.session import get_session_store
 
 def render_module_b(help_texts):
     st.header("Módulo B — Proyección de retiro o pensión mensual")
     
-    if 'module_a_result' not in st.session_state:
+    store = get_session_store()
+    if 'module_a_result' not in store:
         st.warning("Complete primero el Módulo A para usar sus resultados.")
         return
     
-    result_a = st.session_state['module_a_result']
+    result_a = store['module_a_result']
     capital = result_a['final_balance']
     initial_amount = result_a['initial_amount']
     
@@ -32,7 +34,7 @@ def render_module_b(help_texts):
         st.metric("Monto neto tras impuestos", f"${net_amount:,.2f}")
         if tax > 0:
             st.metric("Impuesto aplicado", f"-${tax:,.2f}")
-        st.session_state['module_b_result'] = {
+        store['module_b_result'] = {
             'tipo': 'cobro_total',
             'bruto': capital,
             'impuesto': tax,
@@ -53,6 +55,11 @@ def render_module_b(help_texts):
                 "Tasa de retorno durante retiro (TEA %)",
                 min_value=0.0, max_value=20.0, value=3.0, step=0.1
             )
+        inflation = st.slider(
+            "Inflación anual durante el retiro (%)",
+            min_value=0.0, max_value=20.0,
+            value=float(result_a.get('inflation', 0.0) or 0.0), step=0.1
+        )
         
         errors = validate_module_b(
             tea_retirement=tea_retirement,
@@ -65,19 +72,32 @@ def render_module_b(help_texts):
             monthly_pension_gross = calculate_monthly_pension(capital, life_expectancy, tea_retirement)
             # Impuestos se aplican al capital inicial, no a cada pago mensual (según enunciado)
             tax, net_capital = apply_tax(capital, initial_amount, tax_type)
-            monthly_pension_net = calculate_monthly_pension(net_capital, life_expectancy, tea_retirement)
+            schedule_net = simulate_pension(
+                net_capital, life_expectancy, tea_retirement,
+                inflation=inflation if inflation > 0 else None
+            )
+            monthly_pension_net = schedule_net.pension
             
             st.metric("Pensión mensual estimada (bruto)", f"${monthly_pension_gross:,.2f}")
             st.metric("Pensión mensual estimada (neto)", f"${monthly_pension_net:,.2f}")
             if tax > 0:
                 st.metric("Impuesto aplicado al capital", f"-${tax:,.2f}")
+            last_real = None
+            if inflation > 0 and len(schedule_net):
+                last_real = schedule_net.last_real_pension
+                st.metric(
+                    "Poder de compra de la última pensión (USD de hoy)", f"${last_real:,.2f}",
+                    delta=f"{(last_real / monthly_pension_net - 1) * 100:.1f}%" if monthly_pension_net else None
+                )
             
-            st.session_state['module_b_result'] = {
+            store['module_b_result'] = {
                 'tipo': 'pension_mensual',
                 'bruto_mensual': monthly_pension_gross,
                 'neto_mensual': monthly_pension_net,
                 'impuesto': tax,
                 'capital_bruto': capital,
-                'capital_neto': net_capital
+                'capital_neto': net_capital,
+                'inflacion': inflation,
+                'neto_mensual_real_final': last_real
             }
             st.success("✅ Resultados del Módulo B (Pensión mensual) guardados correctamente para el chatbot.")
@@ -1,9 +1,14 @@
+from datetime import date
+import numpy as np
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from src.finance_engine import bond_present_value
+from src.finance_engine import BOND_TYPES, bond_present_value
+from src.fixed_income import DAY_COUNTS, add_months, dated_bond_schedule, price_bonds
 from src.utils import validate_module_c
+from src.profiling import span
+from ui.session import get_session_store
 
 def render_module_c(help_texts):
     st.header("📊 Módulo C — Valoración de Bonos")
@@ -63,7 +68,45 @@ def render_module_c(help_texts):
             value=True,
             help="Si está desmarcado, se usará tasa nominal simple"
         )
+        exact_money = st.checkbox(
+            "Modo exacto (centavos)",
+            value=False,
+            help="Contabiliza cada flujo en centavos enteros: la tabla cuadra al centavo con el total"
+        )
     
+    # Tipo de bono: bullet, amortizable (sinking fund) o de tasa flotante
+    col_t1, col_t2, col_t3 = st.columns(3)
+    with col_t1:
+        bond_kind = st.selectbox(
+            "🏷️ Tipo de Bono",
+            list(BOND_TYPES),
+            help="Bullet: principal al vencimiento · Amortizable: principal en cuotas iguales · "
+                 "Flotante: cupón = tasa forward + spread"
+        )
+    spread, forward_curve, amortizing_periods = 0.0, None, 0
+    if bond_kind == 'Flotante':
+        with col_t2:
+            spread = st.number_input("Spread sobre la forward (% anual)", min_value=-5.0, max_value=20.0,
+                                     value=1.0, step=0.05)
+        with col_t3:
+            forward_text = st.text_input(
+                "Curva forward (% anual, una tasa por año)", value="4.0, 4.25, 4.5",
+                help="La última tasa se mantiene hasta el vencimiento; la tasa cupón fija se ignora"
+            )
+        try:
+            forward_curve = [float(x) for x in forward_text.replace(';', ',').split(',') if x.strip()]
+        except ValueError:
+            forward_curve = None
+        if not forward_curve:
+            st.warning("⚠️ Ingresa la curva forward como números separados por comas (p. ej. 4, 4.5, 5).")
+            forward_curve = 0.0
+    elif bond_kind == 'Amortizable':
+        with col_t2:
+            amortizing_periods = st.number_input(
+                "Cuotas de amortización (0 = todo el plazo)", min_value=0, max_value=600, value=0, step=1,
+                help="El principal se devuelve en cuotas iguales durante los últimos periodos del plazo"
+            )
+
     # Botón de cálculo
     col_btn1, col_btn2, col_btn3 = st.columns([1, 1, 1])
     with col_btn2:
@@ -89,7 +132,12 @@ def render_module_c(help_texts):
                     payment_freq=payment_freq,
                     years_to_maturity=years_to_maturity,
                     required_yield=required_yield,
-                    use_tea=use_tea
+                    use_tea=use_tea,
+                    bond_type=bond_kind,
+                    spread=spread,
+                    forward_curve=forward_curve,
+                    amortizing_periods=int(amortizing_periods),
+                    exact=exact_money
                 )
                 
                 # ═══════════════════════════════════════════════════════
@@ -178,28 +226,30 @@ def render_module_c(help_texts):
                 
                 df_display = df_flows.copy()
         
-                st.dataframe(
-                    df_display.style.format({
-                        'Cupón': '${:,.2f}',
-                        'Principal': '${:,.2f}',
-                        'Flujo Total': '${:,.2f}',
-                        'Factor Descuento': '{:.6f}',
-                        'Valor Presente': '${:,.2f}'
-                    }).background_gradient(
-                        subset=['Valor Presente'],
-                        cmap='Blues',
-                        vmin=df_display['Valor Presente'].min(),
-                        vmax=df_display['Valor Presente'].max()
-                    ).set_properties(**{
-                        'text-align': 'right'
-                    }).set_table_styles([
-                        {'selector': 'th', 'props': [('text-align', 'center'), ('font-weight', 'bold')]}
-                    ]),
-                    use_container_width=True,
-                    height=400
-                )
+                with span("render.dataframe"):
+                    st.dataframe(
+                        df_display.style.format({
+                            'Cupón': '${:,.2f}',
+                            'Principal': '${:,.2f}',
+                            'Flujo Total': '${:,.2f}',
+                            'Factor Descuento': '{:.6f}',
+                            'Valor Presente': '${:,.2f}'
+                        }).background_gradient(
+                            subset=['Valor Presente'],
+                            cmap='Blues',
+                            vmin=df_display['Valor Presente'].min(),
+                            vmax=df_display['Valor Presente'].max()
+                        ).set_properties(**{
+                            'text-align': 'right'
+                        }).set_table_styles([
+                            {'selector': 'th', 'props': [('text-align', 'center'), ('font-weight', 'bold')]}
+                        ]),
+                        use_container_width=True,
+                        height=400
+                    )
            
-                csv = df_display.to_csv(index=False)
+                with span("export.csv"):
+                    csv = df_display.to_csv(index=False)
                 st.download_button(
                     label="📥 Descargar tabla como CSV",
                     data=csv,
@@ -218,58 +268,60 @@ def render_module_c(help_texts):
                 df_flows['VP Principal'] = df_flows['Principal'] * df_flows['Factor Descuento']
                 
            
-                fig = go.Figure()
-                
-          
-                fig.add_trace(go.Bar(
-                    x=df_flows['Periodo'],
-                    y=df_flows['VP Cupón'].round(2),
-                    name='VP Cupones',
-                    marker_color='#4A90E2',
-                    text=df_flows['VP Cupón'].apply(lambda x: f'${x:,.0f}' if x > 0 else ''),
-                    textposition='inside',
-                    hovertemplate='<b>Periodo %{x}</b><br>' +
-                                  'VP Cupón: $%{y:,.2f}<br>' +
-                                  '<extra></extra>'
-                ))
-                
-            
-                fig.add_trace(go.Bar(
-                    x=df_flows['Periodo'],
-                    y=df_flows['VP Principal'].round(2),
-                    name='VP Principal',
-                    marker_color='#7B68EE',
-                    text=df_flows['VP Principal'].apply(lambda x: f'${x:,.0f}' if x > 0 else ''),
-                    textposition='inside',
-                    hovertemplate='<b>Periodo %{x}</b><br>' +
-                                  'VP Principal: $%{y:,.2f}<br>' +
-                                  '<extra></extra>'
-                ))
-                
-  
-                fig.update_layout(
-                    barmode='stack',
-                    title={
-                        'text': 'Valor Presente Descontado por Periodo (Cupones + Principal)',
-                        'x': 0.5,
-                        'xanchor': 'center'
-                    },
-                    xaxis_title='Periodo',
-                    yaxis_title='Valor Presente (USD)',
-                    hovermode='x unified',
-                    template='plotly_white',
-                    height=500,
-                    showlegend=True,
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=1.02,
-                        xanchor="right",
-                        x=1
+                with span("plotly.figure"):
+                    fig = go.Figure()
+
+
+                    fig.add_trace(go.Bar(
+                        x=df_flows['Periodo'],
+                        y=df_flows['VP Cupón'].round(2),
+                        name='VP Cupones',
+                        marker_color='#4A90E2',
+                        text=df_flows['VP Cupón'].apply(lambda x: f'${x:,.0f}' if x > 0 else ''),
+                        textposition='inside',
+                        hovertemplate='<b>Periodo %{x}</b><br>' +
+                                      'VP Cupón: $%{y:,.2f}<br>' +
+                                      '<extra></extra>'
+                    ))
+
+
+                    fig.add_trace(go.Bar(
+                        x=df_flows['Periodo'],
+                        y=df_flows['VP Principal'].round(2),
+                        name='VP Principal',
+                        marker_color='#7B68EE',
+                        text=df_flows['VP Principal'].apply(lambda x: f'${x:,.0f}' if x > 0 else ''),
+                        textposition='inside',
+                        hovertemplate='<b>Periodo %{x}</b><br>' +
+                                      'VP Principal: $%{y:,.2f}<br>' +
+                                      '<extra></extra>'
+                    ))
+
+
+                    fig.update_layout(
+                        barmode='stack',
+                        title={
+                            'text': 'Valor Presente Descontado por Periodo (Cupones + Principal)',
+                            'x': 0.5,
+                            'xanchor': 'center'
+                        },
+                        xaxis_title='Periodo',
+                        yaxis_title='Valor Presente (USD)',
+                        hovermode='x unified',
+                        template='plotly_white',
+                        height=500,
+                        showlegend=True,
+                        legend=dict(
+                            orientation="h",
+                            yanchor="bottom",
+                            y=1.02,
+                            xanchor="right",
+                            x=1
+                        )
                     )
-                )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                with span("render.plotly_chart"):
+                    st.plotly_chart(fig, use_container_width=True)
                 
          
                 st.info("""
@@ -284,38 +336,40 @@ def render_module_c(help_texts):
                 st.markdown("---")
                 st.subheader("📉 Evolución del Valor Presente de Cupones")
                 
-                fig2 = go.Figure()
-                
-                # Línea de VP de cupones
-                fig2.add_trace(go.Scatter(
-                    x=df_flows['Periodo'],
-                    y=df_flows['VP Cupón'].round(2),
-                    mode='lines+markers',
-                    name='VP Cupón',
-                    line=dict(color='#4A90E2', width=3),
-                    marker=dict(size=8, color='#4A90E2'),
-                    fill='tozeroy',
-                    fillcolor='rgba(74, 144, 226, 0.2)',
-                    hovertemplate='<b>Periodo %{x}</b><br>' +
-                                  'VP Cupón: $%{y:,.2f}<br>' +
-                                  '<extra></extra>'
-                ))
-                
-                fig2.update_layout(
-                    title={
-                        'text': 'Disminución del Valor Presente de Cupones por Efecto del Descuento',
-                        'x': 0.5,
-                        'xanchor': 'center'
-                    },
-                    xaxis_title='Periodo',
-                    yaxis_title='Valor Presente del Cupón (USD)',
-                    hovermode='x unified',
-                    template='plotly_white',
-                    height=400,
-                    showlegend=False
-                )
+                with span("plotly.figure"):
+                    fig2 = go.Figure()
+
+                    # Línea de VP de cupones
+                    fig2.add_trace(go.Scatter(
+                        x=df_flows['Periodo'],
+                        y=df_flows['VP Cupón'].round(2),
+                        mode='lines+markers',
+                        name='VP Cupón',
+                        line=dict(color='#4A90E2', width=3),
+                        marker=dict(size=8, color='#4A90E2'),
+                        fill='tozeroy',
+                        fillcolor='rgba(74, 144, 226, 0.2)',
+                        hovertemplate='<b>Periodo %{x}</b><br>' +
+                                      'VP Cupón: $%{y:,.2f}<br>' +
+                                      '<extra></extra>'
+                    ))
+
+                    fig2.update_layout(
+                        title={
+                            'text': 'Disminución del Valor Presente de Cupones por Efecto del Descuento',
+                            'x': 0.5,
+                            'xanchor': 'center'
+                        },
+                        xaxis_title='Periodo',
+                        yaxis_title='Valor Presente del Cupón (USD)',
+                        hovermode='x unified',
+                        template='plotly_white',
+                        height=400,
+                        showlegend=False
+                    )
                 
-                st.plotly_chart(fig2, use_container_width=True)
+                with span("render.plotly_chart"):
+                    st.plotly_chart(fig2, use_container_width=True)
                 
                 st.caption("Este gráfico muestra cómo el mismo cupón vale menos en términos presentes cuanto más alejado esté en el tiempo.")
                 
@@ -323,33 +377,35 @@ def render_module_c(help_texts):
                 st.markdown("---")
                 st.subheader("🥧 Composición del Valor Presente")
                 
-                fig_pie = go.Figure(data=[go.Pie(
-                    labels=['Cupones', 'Principal'],
-                    values=[summary['vp_coupons'], summary['vp_principal']],
-                    hole=0.4,
-                    marker_colors=['#4A90E2', '#7B68EE'],
-                    textinfo='label+percent+value',
-                    texttemplate='<b>%{label}</b><br>$%{value:,.0f}<br>(%{percent})',
-                    hovertemplate='<b>%{label}</b><br>' +
-                                  'Valor: $%{value:,.2f}<br>' +
-                                  'Porcentaje: %{percent}<br>' +
-                                  '<extra></extra>'
-                )])
-                
-                fig_pie.update_layout(
-                    title={
-                        'text': f'Distribución del VP Total: ${pv_total:,.2f}',
-                        'x': 0.5,
-                        'xanchor': 'center'
-                    },
-                    height=400,
-                    showlegend=True
-                )
+                with span("plotly.figure"):
+                    fig_pie = go.Figure(data=[go.Pie(
+                        labels=['Cupones', 'Principal'],
+                        values=[summary['vp_coupons'], summary['vp_principal']],
+                        hole=0.4,
+                        marker_colors=['#4A90E2', '#7B68EE'],
+                        textinfo='label+percent+value',
+                        texttemplate='<b>%{label}</b><br>$%{value:,.0f}<br>(%{percent})',
+                        hovertemplate='<b>%{label}</b><br>' +
+                                      'Valor: $%{value:,.2f}<br>' +
+                                      'Porcentaje: %{percent}<br>' +
+                                      '<extra></extra>'
+                    )])
+
+                    fig_pie.update_layout(
+                        title={
+                            'text': f'Distribución del VP Total: ${pv_total:,.2f}',
+                            'x': 0.5,
+                            'xanchor': 'center'
+                        },
+                        height=400,
+                        showlegend=True
+                    )
                 
-                st.plotly_chart(fig_pie, use_container_width=True)
+                with span("render.plotly_chart"):
+                    st.plotly_chart(fig_pie, use_container_width=True)
                 
         
-                st.session_state['module_c_result'] = {
+                get_session_store()['module_c_result'] = {
                     'df_flows': df_flows,
                     'pv_total': pv_total,
                     'summary': summary,
@@ -358,11 +414,99 @@ def render_module_c(help_texts):
                     'years': years_to_maturity,
                     'yield': required_yield,
                     'payment_freq': payment_freq,
-                    'use_tea': use_tea
+                    'use_tea': use_tea,
+                    'bond_type': bond_kind
                 }
                 
                 st.success("✅ Cálculo completado exitosamente")
                 
             except Exception as e:
                 st.error(f"❌ Error en el cálculo: {str(e)}")
-                st.exception(e)
\ No newline at end of file
+                st.exception(e)
+    # ═══════════════════════════════════════════════════════
+    # VALORACIÓN CON FECHAS: PRECIO LIMPIO, SUCIO E INTERÉS CORRIDO
+    # ═══════════════════════════════════════════════════════
+    st.markdown("---")
+    with st.expander("📆 Valoración con fechas (precio limpio, sucio e interés corrido)", expanded=False):
+        if bond_kind != 'Bullet':
+            st.info(f"ℹ️ La valoración con fechas solo admite bonos Bullet (cupón fijo y principal al "
+                    f"vencimiento); el bono {bond_kind} se valora con la calculadora de arriba.")
+            return
+        st.caption("Usa el valor nominal, la tasa cupón, la frecuencia y la tasa requerida de arriba, "
+                   "con un calendario de cupones real desde la fecha de liquidación.")
+        today = date.today()
+        col_f1, col_f2, col_f3 = st.columns(3)
+        with col_f1:
+            settlement = st.date_input("Fecha de liquidación", value=today)
+        with col_f2:
+            maturity = st.date_input(
+                "Fecha de vencimiento",
+                value=add_months(today, int(round(years_to_maturity * 12))).item()
+            )
+        with col_f3:
+            day_count = st.selectbox("Conteo de días", list(DAY_COUNTS), index=DAY_COUNTS.index('ACT/ACT'))
+
+        if st.button("📆 Valorar con fechas", use_container_width=True):
+            try:
+                df_dated, prices = dated_bond_schedule(
+                    face_value, coupon_rate, maturity, settlement, required_yield, payment_freq, day_count, use_tea
+                )
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                return
+
+            col_p1, col_p2, col_p3 = st.columns(3)
+            col_p1.metric("Precio sucio", f"${prices['dirty_price']:,.2f}")
+            col_p2.metric("Precio limpio", f"${prices['clean_price']:,.2f}",
+                          delta=f"{prices['clean_price'] / face_value * 100:.3f}% del nominal" if face_value else None,
+                          delta_color="off")
+            col_p3.metric("Interés corrido", f"${prices['accrued_interest']:,.2f}")
+            st.caption(
+                f"Cupón anterior: {prices['previous_coupon']} · próximo cupón: {prices['next_coupon']} · "
+                f"cupones pendientes: {int(prices['remaining_coupons'])}"
+            )
+
+            # Precios para cada día del próximo año en una sola llamada vectorizada
+            horizon = min(366, int((np.datetime64(maturity) - np.datetime64(settlement)).astype(int)))
+            days = np.datetime64(settlement) + np.arange(horizon).astype('timedelta64[D]')
+            path = price_bonds(face_value, coupon_rate, maturity, days, required_yield, payment_freq, day_count, use_tea)
+            with span("plotly.figure"):
+                fig_dates = go.Figure()
+                fig_dates.add_trace(go.Scatter(x=days, y=path['dirty_price'], name='Precio sucio',
+                                               line=dict(color='#7B68EE', width=2)))
+                fig_dates.add_trace(go.Scatter(x=days, y=path['clean_price'], name='Precio limpio',
+                                               line=dict(color='#4A90E2', width=2, dash='dot')))
+                fig_dates.update_layout(
+                    title={'text': 'Precio según la fecha de liquidación (tasa constante)', 'x': 0.5, 'xanchor': 'center'},
+                    xaxis_title='Fecha de liquidación',
+                    yaxis_title='Precio (USD)',
+                    hovermode='x unified',
+                    template='plotly_white',
+                    height=400
+                )
+            with span("render.plotly_chart"):
+                st.plotly_chart(fig_dates, use_container_width=True)
+            st.caption("El precio sucio cae en cada pago de cupón; el limpio no incluye el interés corrido.")
+
+            with span("render.dataframe"):
+                st.dataframe(
+                    df_dated.style.format({
+                        'Fecha': '{:%Y-%m-%d}',
+                        'Periodos': '{:.4f}',
+                        'Cupón': '${:,.2f}',
+                        'Principal': '${:,.2f}',
+                        'Flujo Total': '${:,.2f}',
+                        'Factor Descuento': '{:.6f}',
+                        'Valor Presente': '${:,.2f}'
+                    }),
+                    use_container_width=True,
+                    height=300
+                )
+            get_session_store()['module_c_dated_result'] = {
+                'settlement': settlement,
+                'maturity': maturity,
+                'day_count': day_count,
+                'dirty_price': float(prices['dirty_price']),
+                'clean_price': float(prices['clean_price']),
+                'accrued_interest': float(prices['accrued_interest'])
+            }
@@ -4,39 +4,45 @@ Versión profesional — modo absoluto, estructural, analítico y contextual.
 """
 
 import streamlit as st
-from groq import Groq
-from datetime import datetime
-from gtts import gTTS
-import base64
-import tempfile
-import os
+from src.chat_context import ChatContextManager
+from src.llm_backends import stream_with_metrics, StreamMetrics
+from src.llm_pool import get_resource_manager, LLMBusyError
+from src.response_cache import get_response_cache
+from src.tts import get_tts_service
+from src.profiling import span
+from ui.session import get_session_store
 
 # 🔹 Inicialización y gestión del estado del chat
 
+# Mensajes que se vuelven a pintar en cada rerun (el resto queda resumido)
+RENDER_LIMIT = 20
+
+
 def init_chat_session():
     """Inicializa la sesión del chatbot con mensaje base."""
-    if "chat_history" not in st.session_state:
-        st.session_state.chat_history = [{
-            "role": "assistant",
-            "content": (
-                "Asistente Financiero IA — modo absoluto activado.\n"
-                "Preguntas válidas: tasas, riesgos, valor presente, TEA, rentabilidad, bonos, acciones.\n"
-                "Respondo con precisión técnica y estructura analítica."
-            ),
-            "timestamp": datetime.now().isoformat()
-        }]
+    store = get_session_store()
+    if "chat_memory" not in store:
+        memory = ChatContextManager(
+            token_budget=int(st.secrets.get("CHAT_TOKEN_BUDGET", 3000)),
+            window_messages=int(st.secrets.get("CHAT_WINDOW_MESSAGES", 8)),
+            max_stored=int(st.secrets.get("CHAT_MAX_STORED", 40))
+        )
+        memory.add(
+            "assistant",
+            "Asistente Financiero IA — modo absoluto activado.\n"
+            "Preguntas válidas: tasas, riesgos, valor presente, TEA, rentabilidad, bonos, acciones.\n"
+            "Respondo con precisión técnica y estructura analítica."
+        )
+        # El historial se lee en cada rerun: residente, pero medido en el presupuesto
+        store.put("chat_memory", memory, spill=False)
 
     if "chat_context" not in st.session_state:
         st.session_state.chat_context = {}
 
 
-def add_message(role, content):
-    """Agrega un mensaje al historial."""
-    st.session_state.chat_history.append({
-        "role": role,
-        "content": content.strip(),
-        "timestamp": datetime.now().isoformat()
-    })
+def add_message(role, content, **extra):
+    """Agrega un mensaje al historial acotado de la sesión."""
+    return get_session_store()["chat_memory"].add(role, content, **extra)
 
 
 # 🔹 Generador del contexto financiero (si hay simulaciones)
@@ -44,10 +50,11 @@ def add_message(role, content):
 def build_context_summary():
     """Construye un resumen contextual de los cálculos financieros previos."""
     lines = []
+    store = get_session_store()
 
     # --- MÓDULO A: Inversión inicial ---
-    if "module_a_result" in st.session_state:
-        a = st.session_state["module_a_result"]
+    if "module_a_result" in store:
+        a = store["module_a_result"]
         lines.append(f"""
 **Simulación — Inversión inicial (Módulo A):**
 • Monto inicial: ${a.get('initial_amount', 0):,.2f}
@@ -57,8 +64,8 @@ def build_context_summary():
 """)
 
     # --- MÓDULO B: Retiro o pensión ---
-    if "module_b_result" in st.session_state:
-        b = st.session_state["module_b_result"]
+    if "module_b_result" in store:
+        b = store["module_b_result"]
         if b.get('tipo') == 'cobro_total':
             lines.append(f"""
 **Simulación — Retiro total (Módulo B):**
@@ -76,8 +83,8 @@ def build_context_summary():
 """)
 
     # --- MÓDULO C: Bono ---
-    if "module_c_result" in st.session_state:
-        c = st.session_state["module_c_result"]
+    if "module_c_result" in store:
+        c = store["module_c_result"]
         lines.append(f"""
 **Simulación — Valoración de bono (Módulo C):**
 • Valor nominal: ${c.get('face_value', 0):,.2f}
@@ -85,11 +92,35 @@ def build_context_summary():
 • TEA esperada: {c.get('yield', 0)}%
 • Plazo: {c.get('years', 0)} años
 • Valor presente: ${c.get('pv_total', 0):,.2f}
+""")
+
+    # --- MÓDULO D: Valoración DCF ---
+    if "module_d_result" in store:
+        d = store["module_d_result"]
+        lines.append(f"""
+**Simulación — Valoración DCF (Módulo D):**
+• WACC: {d.get('wacc', 0):.2f}%
+• Valor de la empresa: ${d.get('enterprise_value', 0):,.2f}
+• Valor del patrimonio: ${d.get('equity_value', 0):,.2f}
+• Valor terminal: {'Gordon' if d.get('terminal_method') == 'gordon' else 'Múltiplo de salida'}
 """)
 
     return "\n".join(lines) if lines else "Sin simulaciones activas."
 
 
+def format_metrics(metrics):
+    """Texto corto con TTFT y velocidad de generación de una respuesta."""
+    ttft = metrics.ttft
+    tps = metrics.tokens_per_second
+    parts = [f"Backend: {metrics.backend}"]
+    if ttft is not None:
+        parts.append(f"TTFT: {ttft:.2f} s")
+    if tps is not None:
+        parts.append(f"{tps:.0f} tokens/s")
+    parts.append(f"{metrics.completion_tokens} tokens")
+    return " · ".join(parts)
+
+
 # 🔹 Render principal del módulo del chatbot
 
 def render_module_chat():
@@ -97,13 +128,23 @@ def render_module_chat():
     st.title("💼 Chatbot Financiero IA — Llama 3.1 (Groq)")
     st.caption("Analista técnico estructural para decisiones de inversión y análisis financiero profundo.")
 
+    backend_name = st.secrets.get("LLM_BACKEND", "groq")
     api_key = st.secrets.get("GROQ_API_KEY", None)
-    if not api_key:
+    if backend_name == "groq" and not api_key:
         st.error("No se encontró la clave API de Groq. Agrega `GROQ_API_KEY='tu_clave'` en `.streamlit/secrets.toml`.")
         return
 
     init_chat_session()
-    client = Groq(api_key=api_key)
+    # Cliente y conexiones compartidos por todas las sesiones del proceso
+    manager = get_resource_manager(
+        max_concurrency=int(st.secrets.get("LLM_MAX_CONCURRENCY", 4)),
+        max_queue=int(st.secrets.get("LLM_MAX_QUEUE", 16))
+    )
+    backend = manager.get_backend(backend_name, api_key=api_key)
+    response_cache = get_response_cache(
+        max_entries=int(st.secrets.get("CHAT_CACHE_MAX_ENTRIES", 512)),
+        ttl=float(st.secrets.get("CHAT_CACHE_TTL", 3600))
+    )
 
     # 🔊 Opción para activar voz
     use_voice = st.toggle("🔊 Activar voz del asistente", value=True)
@@ -112,8 +153,13 @@ def render_module_chat():
     with st.expander("📊 Contexto financiero activo", expanded=False):
         st.markdown(build_context_summary())
 
-    # Mostrar historial del chat
-    for msg in st.session_state.chat_history:
+    # Mostrar historial del chat (solo los mensajes más recientes)
+    memory = get_session_store()["chat_memory"]
+    hidden = memory.total_messages - min(len(memory.history), RENDER_LIMIT)
+    if hidden > 0:
+        with st.expander(f"🗂️ {hidden} mensajes anteriores resumidos", expanded=False):
+            st.markdown(memory.summary or "_Sin resumen disponible._")
+    for msg in memory.history[-RENDER_LIMIT:]:
         if msg["role"] == "user":
             with st.chat_message("user", avatar="👤"):
                 st.markdown(msg["content"])
@@ -122,6 +168,8 @@ def render_module_chat():
                 st.markdown(msg["content"])
 
     # Entrada del usuario
+    audio_future = None
+    audio_slot = None
     user_input = st.chat_input("Escribe tu consulta analítica...")
     if user_input:
         add_message("user", user_input)
@@ -129,57 +177,65 @@ def render_module_chat():
             st.markdown(user_input)
 
         with st.chat_message("assistant", avatar="💼"):
-            with st.spinner("Analizando estructura financiera..."):
-                try:
-                    # Configuración del sistema
-                    system_prompt = f"""
+            try:
+                context_summary = build_context_summary()
+                # Configuración del sistema
+                system_prompt = f"""
 Modo absoluto y analítico.
 Eliminar: adornos, empatía, suavidad, transiciones, preguntas.
 Responder con: estructura técnica, deducción, fórmulas y conclusiones verificables.
 Contexto activo:
-{build_context_summary()}
+{context_summary}
 Formato:
 1. Definición técnica
 2. Relación o fórmula relevante (usar $...$ o $$...$$)
 3. Interpretación cuantitativa
 4. Conclusión directa sin juicios.
 """
+                # Los turnos previos forman parte de la solicitud: también de la clave
+                messages = memory.build_messages(system_prompt, user_input)
+                cached_reply = response_cache.get(user_input, context_summary, history=messages[:-1])
 
-                    response = client.chat.completions.create(
-                        model="llama-3.1-8b-instant",
-                        messages=[
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_input},
-                        ],
-                        temperature=0.2,
-                        max_tokens=700
-                    )
-
-                    reply = response.choices[0].message.content.strip()
-                    st.markdown(reply)
-                    add_message("assistant", reply)
-
-                    # === 🗣️ Conversión a voz (si está activado) ===
+                if cached_reply is not None:
+                    # Pregunta repetida sobre el mismo contexto y conversación: sin llamada al LLM
+                    reply = cached_reply
                     if use_voice and reply:
-                        try:
-                            tts = gTTS(reply, lang="es")
-                            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp:
-                                tts.save(tmp.name)
-                                tmp_path = tmp.name
-
-                            # Reproducir el audio directamente
-                            with open(tmp_path, "rb") as audio_file:
-                                audio_bytes = audio_file.read()
-                                st.audio(audio_bytes, format="audio/mp3")
-
-                            os.remove(tmp_path)
-                        except Exception as e:
-                            st.warning(f"⚠️ Error al generar voz: {str(e)}")
-
-                except Exception as e:
-                    error_text = f"❌ Error al conectar con Groq: {str(e)}"
-                    st.error(error_text)
-                    add_message("assistant", error_text)
+                        # La síntesis arranca antes de pintar la respuesta
+                        audio_future = get_tts_service().submit(reply)
+                    st.markdown(reply)
+                    add_message("assistant", reply, cached=True)
+                    st.caption("⚡ Respuesta desde caché")
+                else:
+                    # Respuesta en streaming: se pinta a medida que llegan los tokens
+                    metrics = StreamMetrics(backend.name)
+                    with span("llm.stream"):
+                        reply = st.write_stream(stream_with_metrics(
+                            backend,
+                            messages,
+                            metrics=metrics,
+                            temperature=0.2,
+                            max_tokens=700
+                        ))
+                    reply = (reply or "").strip()
+                    add_message("assistant", reply, metrics=metrics.as_dict())
+                    st.caption(format_metrics(metrics))
+                    if reply:
+                        response_cache.put(user_input, context_summary, reply, history=messages[:-1])
+
+                # === 🗣️ Conversión a voz en segundo plano (si está activado) ===
+                audio_slot = st.empty()
+                if use_voice and reply and audio_future is None:
+                    audio_future = get_tts_service().submit(reply)
+
+            except LLMBusyError as e:
+                error_text = f"⏳ {str(e)} Intenta nuevamente en unos segundos."
+                st.warning(error_text)
+                add_message("assistant", error_text)
+
+            except Exception as e:
+                error_text = f"❌ Error al conectar con el backend '{backend.name}': {str(e)}"
+                st.error(error_text)
+                add_message("assistant", error_text)
 
     # Opciones de control-
     st.markdown("---")
@@ -187,13 +243,29 @@ Formato:
 
     with col1:
         if st.button("🧹 Limpiar conversación", use_container_width=True):
-            st.session_state.chat_history = []
+            memory.clear()
             st.rerun()
 
     with col2:
         if st.button("♻️ Reiniciar sesión completa", use_container_width=True):
+            get_session_store().clear()
             st.session_state.clear()
             st.rerun()
 
+    # El audio se sintetizó mientras se renderizaba el resto de la página
+    if audio_future is not None:
+        try:
+            with span("tts.wait"):
+                audio_bytes = audio_future.result(timeout=60)
+            audio_slot.audio(audio_bytes, format="audio/mp3")
+        except Exception as e:
+            audio_slot.warning(f"⚠️ Error al generar voz: {str(e)}")
+
     # Contador y estado
-    st.caption(f"Historial actual: {len(st.session_state.chat_history)} mensajes.")
+    cache_stats = response_cache.stats()
+    st.caption(
+        f"Historial actual: {len(memory.history)} mensajes en memoria "
+        f"({memory.total_messages} en total). "
+        f"Caché: {cache_stats['hits']} aciertos / {cache_stats['misses']} fallos "
+        f"({cache_stats['hit_rate']:.0%})."
+    )
@@ -0,0 +1,157 @@
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+from src.valuation_engine import (
+    calculate_wacc,
+    cost_of_equity_capm,
+    enterprise_value_exit_multiple,
+    enterprise_value_gordon,
+    equity_value,
+    project_free_cash_flows,
+    sensitivity_table
+)
+from src.profiling import span
+from ui.session import get_session_store
+
+
+def _heatmap(table, x_title, title, x_format):
+    fig = go.Figure(go.Heatmap(
+        z=table.to_numpy(),
+        x=[x_format.format(v) for v in table.columns],
+        y=[f"{w:.2f}%" for w in table.index],
+        colorscale="Blues",
+        hovertemplate="WACC %{y}<br>" + x_title + " %{x}<br>Patrimonio: $%{z:,.0f}<extra></extra>"
+    ))
+    fig.update_layout(
+        title=dict(text=title, x=0.5),
+        xaxis_title=x_title,
+        yaxis_title="WACC",
+        template="plotly_white",
+        height=450,
+        margin=dict(t=60, b=60, l=60, r=40)
+    )
+    return fig
+
+
+def render_module_d(help_texts):
+    st.header("🏢 Módulo D — Valoración de Empresas (DCF)")
+    st.caption("Valora una empresa descontando sus flujos de caja libres al WACC, con valor terminal y tablas de sensibilidad.")
+
+    # --- ESTRUCTURA DE CAPITAL ---
+    st.subheader("🏦 Estructura de capital y WACC")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        equity_mv = st.number_input("Valor de mercado del patrimonio (USD)", min_value=0.0, value=600000.0, step=10000.0)
+        debt_mv = st.number_input("Valor de mercado de la deuda (USD)", min_value=0.0, value=400000.0, step=10000.0)
+    with col2:
+        risk_free = st.number_input("Tasa libre de riesgo (%)", min_value=0.0, max_value=20.0, value=4.0, step=0.1)
+        beta = st.number_input("Beta (β)", min_value=0.0, max_value=5.0, value=1.2, step=0.05)
+        market_premium = st.number_input("Prima de riesgo de mercado (%)", min_value=0.0, max_value=20.0, value=5.5, step=0.1)
+    with col3:
+        cost_of_debt = st.number_input("Costo de la deuda (%)", min_value=0.0, max_value=50.0, value=7.0, step=0.1)
+        tax_rate = st.number_input("Tasa de impuesto (%)", min_value=0.0, max_value=60.0, value=29.5, step=0.5,
+                                   help=help_texts.get("impuesto_renta", ""))
+
+    # --- PROYECCIÓN ---
+    st.subheader("📈 Proyección de flujos de caja libres")
+    col4, col5, col6 = st.columns(3)
+    with col4:
+        revenue = st.number_input("Ventas del año base (USD)", min_value=0.0, value=1000000.0, step=10000.0)
+        years = st.slider("Años de proyección", min_value=3, max_value=15, value=5)
+    with col5:
+        revenue_growth = st.number_input("Crecimiento anual de ventas (%)", min_value=-50.0, max_value=100.0, value=6.0, step=0.5)
+        ebitda_margin = st.number_input("Margen EBITDA (%)", min_value=-100.0, max_value=100.0, value=20.0, step=0.5)
+    with col6:
+        da_pct = st.number_input("Depreciación y amortización (% ventas)", min_value=0.0, max_value=50.0, value=4.0, step=0.5)
+        capex_pct = st.number_input("CapEx (% ventas)", min_value=0.0, max_value=50.0, value=5.0, step=0.5)
+        nwc_pct = st.number_input("Capital de trabajo (% ventas)", min_value=0.0, max_value=100.0, value=10.0, step=0.5)
+
+    # --- VALOR TERMINAL ---
+    st.subheader("🔚 Valor terminal")
+    col7, col8, col9 = st.columns(3)
+    with col7:
+        terminal_method = st.radio("Método", ["Crecimiento perpetuo (Gordon)", "Múltiplo de salida (EV/EBITDA)"])
+    with col8:
+        terminal_growth = st.number_input("Crecimiento perpetuo g (%)", min_value=-5.0, max_value=10.0, value=2.5, step=0.1)
+        exit_multiple = st.number_input("Múltiplo EV/EBITDA de salida", min_value=0.0, max_value=50.0, value=8.0, step=0.5)
+    with col9:
+        net_debt = st.number_input("Deuda neta (USD)", value=float(debt_mv), step=10000.0)
+        shares = st.number_input("Acciones en circulación", min_value=0.0, value=100000.0, step=1000.0)
+        grid_size = st.slider("Tamaño de las tablas de sensibilidad", min_value=5, max_value=101, value=21, step=2)
+
+    if st.button("🧮 Valorar empresa", use_container_width=True, type="primary"):
+        try:
+            cost_of_equity = float(cost_of_equity_capm(risk_free, beta, market_premium))
+            wacc = calculate_wacc(equity_mv, debt_mv, cost_of_equity, cost_of_debt, tax_rate)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+        df_fcf = project_free_cash_flows(
+            revenue, years, revenue_growth, ebitda_margin, da_pct, capex_pct, nwc_pct, tax_rate
+        )
+        fcf = df_fcf['FCF'].to_numpy()
+        terminal_ebitda = float(df_fcf['EBITDA'].iloc[-1])
+
+        use_gordon = terminal_method.startswith("Crecimiento")
+        if use_gordon:
+            if wacc <= terminal_growth:
+                st.error("❌ El WACC debe ser mayor que el crecimiento perpetuo para usar el modelo de Gordon.")
+                return
+            ev, pv_terminal = enterprise_value_gordon(fcf, wacc, terminal_growth)
+        else:
+            ev, pv_terminal = enterprise_value_exit_multiple(fcf, wacc, exit_multiple, terminal_ebitda)
+        ev, pv_terminal = float(ev), float(pv_terminal)
+        equity, per_share = equity_value(ev, net_debt, shares)
+
+        # --- MÉTRICAS ---
+        st.markdown("---")
+        st.subheader("💰 Resultado de la valoración")
+        colm1, colm2, colm3, colm4 = st.columns(4)
+        colm1.metric("Costo del patrimonio (CAPM)", f"{cost_of_equity:.2f}%")
+        colm2.metric("WACC", f"{wacc:.2f}%")
+        colm3.metric("Valor de la empresa (EV)", f"${ev:,.0f}")
+        colm4.metric("Valor del patrimonio", f"${float(equity):,.0f}",
+                     delta=f"${float(per_share):,.2f} por acción" if per_share is not None else None,
+                     delta_color="off")
+        if ev:
+            st.caption(f"El valor terminal representa el {pv_terminal / ev * 100:.1f}% del valor de la empresa.")
+
+        with span("render.dataframe"):
+            st.dataframe(df_fcf.set_index('Año').style.format('${:,.0f}'), use_container_width=True)
+
+        # --- SENSIBILIDADES (una evaluación vectorizada por tabla) ---
+        st.markdown("---")
+        st.subheader("🌡️ Tablas de sensibilidad del valor del patrimonio")
+        waccs = np.linspace(max(wacc - 3, 0.5), wacc + 3, grid_size)
+        growths = np.linspace(terminal_growth - 1.5, terminal_growth + 1.5, grid_size)
+        multiples = np.linspace(max(exit_multiple - 4, 0.5), exit_multiple + 4, grid_size)
+        table_g = sensitivity_table(fcf, waccs, growths, 'gordon', net_debt=net_debt)
+        table_m = sensitivity_table(fcf, waccs, multiples, 'multiple', terminal_ebitda, net_debt)
+
+        tab1, tab2 = st.tabs(["WACC × crecimiento perpetuo", "WACC × múltiplo de salida"])
+        with tab1:
+            with span("render.plotly_chart"):
+                st.plotly_chart(_heatmap(table_g, "g", "Patrimonio según WACC y g", "{:.2f}%"),
+                                use_container_width=True, key="dcf_heatmap_g")
+            st.caption("Las celdas vacías corresponden a WACC ≤ g, donde el modelo de Gordon no aplica.")
+        with tab2:
+            with span("render.plotly_chart"):
+                st.plotly_chart(_heatmap(table_m, "Múltiplo", "Patrimonio según WACC y múltiplo", "{:.1f}x"),
+                                use_container_width=True, key="dcf_heatmap_m")
+
+        with span("export.csv"):
+            csv = df_fcf.to_csv(index=False).encode('utf-8')
+        st.download_button("📥 Descargar proyección (CSV)", data=csv, file_name="proyeccion_fcf.csv", mime="text/csv")
+
+        get_session_store()['module_d_result'] = {
+            'df_fcf': df_fcf,
+            'wacc': wacc,
+            'cost_of_equity': cost_of_equity,
+            'enterprise_value': ev,
+            'equity_value': float(equity),
+            'per_share': float(per_share) if per_share is not None else None,
+            'terminal_method': 'gordon' if use_gordon else 'multiple',
+            'terminal_growth': terminal_growth,
+            'exit_multiple': exit_multiple
+        }
+        st.success("✅ Resultados del Módulo D guardados correctamente para el chatbot.")
@@ -0,0 +1,39 @@
+import streamlit as st
+from src.session_store import (
+    DEFAULT_SPILL_DIR,
+    GLOBAL_BUDGET,
+    SESSION_BUDGET,
+    SessionStore,
+    get_memory_registry,
+)
+
+STORE_KEY = "session_store"
+MB = 1024 * 1024
+
+
+def _setting(name, default):
+    try:
+        return st.secrets.get(name, default)
+    except Exception:
+        return default
+
+
+def get_session_store():
+    """
+    Store de resultados de la sesión actual (se crea en el primer acceso).
+
+    Presupuestos en MB vía secrets: SESSION_BUDGET_MB y GLOBAL_BUDGET_MB;
+    SESSION_SPILL_DIR = "" desactiva el volcado a disco (se descarta).
+    """
+    store = st.session_state.get(STORE_KEY)
+    if store is None:
+        registry = get_memory_registry(
+            budget=int(float(_setting("GLOBAL_BUDGET_MB", GLOBAL_BUDGET / MB)) * MB)
+        )
+        store = SessionStore(
+            budget=int(float(_setting("SESSION_BUDGET_MB", SESSION_BUDGET / MB)) * MB),
+            spill_dir=_setting("SESSION_SPILL_DIR", DEFAULT_SPILL_DIR) or None,
+            registry=registry
+        )
+        st.session_state[STORE_KEY] = store
+    return store
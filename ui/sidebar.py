@@ -1,4 +1,5 @@
 import streamlit as st
+from ui.session import get_session_store
 
 def render_sidebar():
     """Renderiza la barra lateral con navegación y opciones"""
@@ -28,15 +29,16 @@ def render_sidebar():
     st.sidebar.markdown("---")
     
     # Información de estado
-    if 'module_a_result' in st.session_state:
+    store = get_session_store()
+    if 'module_a_result' in store:
         st.sidebar.success("✅ Módulo A completado")
-        capital = st.session_state['module_a_result']['final_balance']
+        capital = store['module_a_result']['final_balance']
         st.sidebar.info(f"💵 Capital: ${capital:,.2f}")
     
-    if 'module_b_result' in st.session_state:
+    if 'module_b_result' in store:
         st.sidebar.success("✅ Módulo B completado")
     
-    if 'module_c_result' in st.session_state:
+    if 'module_c_result' in store:
         st.sidebar.success("✅ Módulo C completado")
     
     st.sidebar.markdown("---")
@@ -48,8 +50,7 @@ def render_sidebar():
         # Limpiar session state
         keys_to_clear = ['module_a_result', 'module_b_result', 'module_c_result']
         for key in keys_to_clear:
-            if key in st.session_state:
-                del st.session_state[key]
+            store.pop(key)
         st.sidebar.success("✅ Datos limpiados")
         st.rerun()
     